@@ -1,34 +1,59 @@
 import json
+import random
+import time
+import uuid
 
 from PyQt6.QtCore import QObject, pyqtSignal, QUrl, QTimer, QEventLoop
 from PyQt6.QtNetwork import QNetworkAccessManager, QNetworkRequest, QNetworkReply
 
+from app.client.command_outbox import CommandOutbox
+
 
 class BaseNetworkClient(QObject):
+    """
+    QNetworkAccessManager wrapper with JSON payloads and retries
+
+    Requests may name a channel, a channel has latest-wins semantics: a new request on it aborts the channel's
+    in-flight reply and cancels its scheduled retry, so at most one request per channel is outstanding and a
+    stale command can never land after a newer one. With an outbox, channel requests are also durable: the
+    latest command per channel is persisted until the device acknowledges it, retried with exponential backoff
+    and jitter for as long as it stays the latest, and replayed by replay_outbox() after a restart. Durable commands
+    expire (command_ttl seconds, or earlier per _command_expires_at), an expired one is dropped instead of retried
+    """
     response_received = pyqtSignal(str, dict)  # operation_type, response_data
     request_error = pyqtSignal(str, str)  # operation_type, error_message
 
-    def __init__(self, base_url, timeout=10000, max_retries=3, retry_delay=2000):
+    def __init__(self, base_url, timeout=10000, max_retries=3, retry_delay=2000, max_retry_delay=60000, outbox: CommandOutbox = None, command_ttl=3600):
         super().__init__()
         self.base_url = base_url.rstrip('/')  # Remove trailing slash
         self.timeout = timeout
         self.max_retries = max_retries
         self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.outbox = outbox
+        self.command_ttl = command_ttl
+        self.expired_commands = 0
         self.manager = QNetworkAccessManager(self)
         self.manager.setTransferTimeout(timeout)
         self.pending_replies = []
+        self.superseded_requests = 0
+        self.last_latency_ms = 0.0  # of the reply being handled
+
+        self._channel_generations: dict[str, int] = {}
+        self._channel_replies: dict[str, QNetworkReply] = {}
+        self._channel_retries: dict[str, QTimer] = {}
 
-    def get(self, endpoint, operation_type=None):
-        return self._make_request('GET', endpoint, operation_type=operation_type)
+    def get(self, endpoint, operation_type=None, channel=None):
+        return self._make_request('GET', endpoint, operation_type=operation_type, channel=channel)
 
-    def post(self, endpoint, payload=None, operation_type=None):
-        return self._make_request('POST', endpoint, payload=payload, operation_type=operation_type)
+    def post(self, endpoint, payload=None, operation_type=None, channel=None):
+        return self._make_request('POST', endpoint, payload=payload, operation_type=operation_type, channel=channel)
 
-    def put(self, endpoint, payload=None, operation_type=None):
-        return self._make_request('PUT', endpoint, payload=payload, operation_type=operation_type)
+    def put(self, endpoint, payload=None, operation_type=None, channel=None):
+        return self._make_request('PUT', endpoint, payload=payload, operation_type=operation_type, channel=channel)
 
-    def delete(self, endpoint, operation_type=None):
-        return self._make_request('DELETE', endpoint, operation_type=operation_type)
+    def delete(self, endpoint, operation_type=None, channel=None):
+        return self._make_request('DELETE', endpoint, operation_type=operation_type, channel=channel)
 
     def wait_for_completion(self, timeout_ms=3000):
         """Wait for all pending requests to finish, called on application exit to ensure clients are in sync"""
@@ -48,7 +73,34 @@ class BaseNetworkClient(QObject):
 
         loop.exec()
 
-    def _make_request(self, method, endpoint, payload=None, operation_type=None, attempt=1):
+    def has_outstanding(self, channel) -> bool:
+        """Whether the channel still has a request in flight or a retry scheduled"""
+        return channel in self._channel_replies or channel in self._channel_retries
+
+    def replay_outbox(self):
+        """Re-sends the commands a previous run couldn't deliver, one per channel"""
+        if not self.outbox:
+            return
+
+        now = time.time()
+        for channel, command in self.outbox.pending(self.base_url).items():
+            if command.get('expires_at', 0) <= now:
+                # e.g. a timer that would have run out by now, the device is better off without it
+                self.expired_commands += 1
+                self.outbox.remove(self.base_url, channel, command['id'])
+                continue
+
+            self._make_request(
+                command['method'],
+                command['endpoint'],
+                command['payload'],
+                command['operation_type'],
+                channel=channel,
+                command_id=command['id'],
+                expires_at=command['expires_at']
+            )
+
+    def _make_request(self, method, endpoint, payload=None, operation_type=None, attempt=1, channel=None, generation=None, command_id=None, expires_at=None):
         """
         Generic method to make HTTP requests
 
@@ -57,10 +109,32 @@ class BaseNetworkClient(QObject):
             endpoint: API endpoint (will be appended to base_url)
             payload: Dictionary to be JSON-encoded as request body
             operation_type: String identifier for this operation (for signals)
+            channel: Latest-wins channel, supersedes whatever is outstanding on it
+            generation: Channel generation a retry belongs to (internal)
+            command_id: Outbox id of the command being sent (internal)
+            expires_at: Wall clock time the outbox command expires at (internal)
 
         Returns:
-            QNetworkReply object
+            QNetworkReply object, None for a retry that has been superseded
         """
+        if channel is not None:
+            if generation is None:
+                generation = self._supersede(channel)
+            elif generation != self._channel_generations.get(channel):
+                return None
+
+            if self.outbox and command_id is None:
+                command_id = str(uuid.uuid4())
+                expires_at = self._command_expires_at(endpoint, payload)
+                self.outbox.put(self.base_url, channel, {
+                    'id': command_id,
+                    'method': method,
+                    'endpoint': endpoint,
+                    'payload': payload,
+                    'operation_type': operation_type,
+                    'expires_at': expires_at,
+                })
+
         if not endpoint.startswith('/'):
             endpoint = '/' + endpoint
         url = QUrl(f"{self.base_url}{endpoint}")
@@ -92,25 +166,64 @@ class BaseNetworkClient(QObject):
             'endpoint': endpoint,
             'payload': payload,
             'operation_type': operation_type,
-            'attempt': attempt
+            'attempt': attempt,
+            'channel': channel,
+            'generation': generation,
+            'command_id': command_id,
+            'expires_at': expires_at,
+            'sent_at': time.monotonic()
         }
 
         # Connect response handler
         operation_id = operation_type or endpoint
         self.pending_replies.append(reply)
+        if channel is not None:
+            self._channel_replies[channel] = reply
 
         reply.finished.connect(lambda: self._handle_response(reply, operation_id, retry_info))
         reply.finished.connect(lambda: self.pending_replies.remove(reply) if reply in self.pending_replies else None)
 
         return reply
 
+    def _supersede(self, channel) -> int:
+        """Aborts the channel's outstanding request or retry and starts a new generation, returns it"""
+        generation = self._channel_generations.get(channel, 0) + 1
+        self._channel_generations[channel] = generation
+
+        retry_timer = self._channel_retries.pop(channel, None)
+        if retry_timer is not None:
+            retry_timer.stop()
+            retry_timer.deleteLater()
+            self.superseded_requests += 1
+
+        reply = self._channel_replies.pop(channel, None)
+        if reply is not None and reply.isRunning():
+            # finished fires synchronously, _handle_response sees the old generation and drops it
+            reply.abort()
+            self.superseded_requests += 1
+
+        return generation
+
+    def _is_superseded(self, retry_info) -> bool:
+        channel = retry_info.get('channel')
+        return channel is not None and retry_info['generation'] != self._channel_generations.get(channel)
+
     def _handle_response(self, reply, operation_type, retry_info):
         """
         Generic response handler
 
         Subclasses can override this method to customize response handling
         """
+        channel = retry_info.get('channel')
+        if channel is not None and self._channel_replies.get(channel) is reply:
+            del self._channel_replies[channel]
+
         try:
+            if self._is_superseded(retry_info):
+                # aborted or overtaken by a newer request on the same channel, its outcome no longer matters
+                return
+            self.last_latency_ms = (time.monotonic() - retry_info['sent_at']) * 1000
+
             if reply.error() == QNetworkReply.NetworkError.NoError:
                 # Successful response
                 data = reply.readAll().data()
@@ -123,12 +236,17 @@ class BaseNetworkClient(QObject):
                 else:
                     response = {}
 
+                self._remove_from_outbox(retry_info)
                 # Call the success handler
                 self._handle_success(operation_type, response)
             else:
-                if self._should_retry(reply, retry_info['attempt']):
+                # durable commands keep retrying until delivered, superseded or expired
+                durable = retry_info['command_id'] is not None
+                if self._should_retry(reply, retry_info['attempt'], bounded=not durable) and not self._is_expired(retry_info):
                     self._schedule_retry(retry_info)
                 else:
+                    # rejected by the device or out of date, replaying it later wouldn't help either
+                    self._remove_from_outbox(retry_info)
                     error_msg = reply.errorString()
                     status_code = reply.attribute(QNetworkRequest.Attribute.HttpStatusCodeAttribute)
 
@@ -153,10 +271,21 @@ class BaseNetworkClient(QObject):
     def _handle_error(self, operation_type, error_msg, status_code):
         raise NotImplementedError("Method must be overridden")
 
-    def _should_retry(self, reply, attempt):
+    def _command_expires_at(self, endpoint, payload) -> float:
+        """Wall clock time after which a durable command is no longer worth delivering"""
+        return time.time() + self.command_ttl
+
+    def _is_expired(self, retry_info) -> bool:
+        return retry_info['expires_at'] is not None and time.time() >= retry_info['expires_at']
+
+    def _remove_from_outbox(self, retry_info):
+        if self.outbox and retry_info['command_id']:
+            self.outbox.remove(self.base_url, retry_info['channel'], retry_info['command_id'])
+
+    def _should_retry(self, reply, attempt, bounded=True):
         """Determine if request should be retried"""
         # Don't retry if we've exceeded max attempts
-        if attempt >= self.max_retries - 1:
+        if bounded and attempt >= self.max_retries - 1:
             return False
 
         error = reply.error()
@@ -188,10 +317,21 @@ class BaseNetworkClient(QObject):
     def _schedule_retry(self, retry_info):
         """Schedule a retry attempt after delay"""
         retry_info['attempt'] += 1
+        delay = self._retry_delay_for(retry_info['attempt'])
+
+        channel = retry_info.get('channel')
+        if channel is not None:
+            # kept so a newer request on the channel can cancel it
+            retry_timer = QTimer(self)
+            retry_timer.setSingleShot(True)
+            retry_timer.timeout.connect(lambda: self._retry_channel_request(retry_timer, retry_info))
+            self._channel_retries[channel] = retry_timer
+            retry_timer.start(delay)
+            return
 
         # Use QTimer to schedule retry after delay
         QTimer.singleShot(
-            self.retry_delay,
+            delay,
             lambda: self._make_request(
                 retry_info['method'],
                 retry_info['endpoint'],
@@ -200,3 +340,30 @@ class BaseNetworkClient(QObject):
                 retry_info['attempt']
             )
         )
+
+    def _retry_channel_request(self, retry_timer, retry_info):
+        if self._channel_retries.get(retry_info['channel']) is retry_timer:
+            del self._channel_retries[retry_info['channel']]
+        retry_timer.deleteLater()
+
+        if self._is_expired(retry_info):
+            self.expired_commands += 1
+            self._remove_from_outbox(retry_info)
+            return
+
+        self._make_request(
+            retry_info['method'],
+            retry_info['endpoint'],
+            retry_info['payload'],
+            retry_info['operation_type'],
+            retry_info['attempt'],
+            channel=retry_info['channel'],
+            generation=retry_info['generation'],
+            command_id=retry_info['command_id'],
+            expires_at=retry_info['expires_at']
+        )
+
+    def _retry_delay_for(self, attempt) -> int:
+        """Exponential backoff from retry_delay up to max_retry_delay, jittered so retries from many clients spread out"""
+        delay = min(self.max_retry_delay, self.retry_delay * 2 ** max(0, attempt - 2))
+        return int(delay / 2 + random.uniform(0, delay / 2))
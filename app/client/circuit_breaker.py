@@ -0,0 +1,72 @@
+import enum
+import threading
+import time
+
+from app.utils.log import get_main_app_logger
+
+logger = get_main_app_logger(__name__)
+
+
+class CircuitState(enum.Enum):
+    CLOSED = 1
+    OPEN = 2
+    HALF_OPEN = 3
+
+
+class CircuitBreaker:
+    """
+    Fails fast once a dependency looks degraded
+
+    After failure_threshold consecutive failures the circuit opens and requests are refused for reset_timeout seconds,
+    then a single trial request is let through (half open), its outcome closes or re-opens the circuit
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 3, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CircuitState.CLOSED
+
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+
+    def allow_request(self) -> bool:
+        with self._lock:
+            if self.state == CircuitState.CLOSED:
+                return True
+
+            if self.state == CircuitState.OPEN:
+                if time.monotonic() - self._opened_at < self.reset_timeout:
+                    return False
+                self.state = CircuitState.HALF_OPEN
+                self._trial_in_flight = False
+
+            if self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            if self.state != CircuitState.CLOSED:
+                logger.info(f"[API] Circuit '{self.name}' closed, requests resumed")
+            self.state = CircuitState.CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def release_trial(self):
+        """Gives the half-open trial slot back without a verdict, e.g. when the trial request was cancelled"""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self.state == CircuitState.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self.state != CircuitState.OPEN:
+                    logger.warning(f"[API] Circuit '{self.name}' opened after {self._failures} consecutive failures")
+                self.state = CircuitState.OPEN
+                self._opened_at = time.monotonic()
@@ -1,20 +1,55 @@
+import asyncio
+import threading
 from abc import ABC, abstractmethod
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable
 
 import anthropic
 
+from app.client.circuit_breaker import CircuitBreaker
+from app.utils.log import get_main_app_logger
+
+logger = get_main_app_logger(__name__)
+
+CLAUDE_MODEL = "claude-3-7-sonnet-20250219"
+
+
+class AIUnavailableError(Exception):
+    """The AI client refused or could not complete a request (deadline exceeded, circuit open, API error)"""
+    pass
+
 
 class AIClient(ABC):
     def __init__(self, api_key):
         self.client = self.create_client(api_key)
+        self._executor: ThreadPoolExecutor | None = None
 
     @abstractmethod
     def create_client(self, api_key):
         pass
 
     @abstractmethod
-    def send_message(self, message: str) -> str:
+    def send_message(self, message: str, max_tokens: int = 5) -> str:
         pass
 
+    def submit_message(self, message: str, max_tokens: int = 5, callback: Callable[[Future], None] = None) -> Future:
+        """
+        Send a message without blocking the caller
+
+        Returns a future for the response text, callback (if given) is invoked with that future once it settles.
+        The default implementation runs send_message on a small private executor
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='ai-client')
+
+        future = self._executor.submit(self.send_message, message, max_tokens)
+        if callback:
+            future.add_done_callback(callback)
+        return future
+
+    async def send_message_async(self, message: str, max_tokens: int = 5) -> str:
+        return await asyncio.wrap_future(self.submit_message(message, max_tokens))
+
 
 class ClaudeClient(AIClient):
     def __init__(self, api_key):
@@ -25,12 +60,119 @@ class ClaudeClient(AIClient):
             api_key=api_key,
         )
 
-    def send_message(self, message: str):
+    def send_message(self, message: str, max_tokens: int = 5):
         message = self.client.messages.create(
-            model="claude-3-7-sonnet-20250219",
-            max_tokens=5,
+            model=CLAUDE_MODEL,
+            max_tokens=max_tokens,
             messages=[
                 {"role": "user", "content": message}
             ]
         )
         return message.content[0].text
+
+
+class AsyncClaudeClient(AIClient):
+    """
+    Claude client running on its own asyncio event loop thread
+
+    Every call has a hard deadline (including time spent waiting for a slot), at most max_in_flight requests are
+    outstanding at once, and a circuit breaker fails calls fast with AIUnavailableError while the API is degraded.
+    send_message remains available for synchronous callers and blocks for at most the deadline
+    """
+
+    def __init__(self, api_key, timeout: float = 10.0, max_in_flight: int = 4, breaker: CircuitBreaker = None):
+        self.timeout = timeout
+        self.max_in_flight = max_in_flight
+        self.breaker = breaker or CircuitBreaker('claude')
+
+        self._loop = asyncio.new_event_loop()
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+        self._thread = threading.Thread(target=self._run_loop, name='ai-client-loop', daemon=True)
+        self._thread.start()
+
+        super().__init__(api_key)
+
+    def create_client(self, api_key):
+        return anthropic.AsyncAnthropic(
+            api_key=api_key,
+            timeout=self.timeout,
+            max_retries=0,  # the deadline covers the whole call, retries are the caller's decision
+        )
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    def close(self):
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=1)
+
+    def send_message(self, message: str, max_tokens: int = 5) -> str:
+        future = self.submit_message(message, max_tokens)
+        try:
+            return future.result(timeout=self.timeout + 1)
+        except TimeoutError as e:
+            future.cancel()
+            raise AIUnavailableError(f"AI request exceeded its {self.timeout}s deadline") from e
+
+    def submit_message(self, message: str, max_tokens: int = 5, callback: Callable[[Future], None] = None) -> Future:
+        future = asyncio.run_coroutine_threadsafe(self._request(message, max_tokens), self._loop)
+        if callback:
+            future.add_done_callback(callback)
+        return future
+
+    async def send_message_async(self, message: str, max_tokens: int = 5) -> str:
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+
+        if running_loop is self._loop:
+            return await self._request(message, max_tokens)
+        return await asyncio.wrap_future(self.submit_message(message, max_tokens))
+
+    async def _request(self, message: str, max_tokens: int) -> str:
+        if not self.breaker.allow_request():
+            raise AIUnavailableError("AI client circuit is open, failing fast")
+
+        try:
+            response = await asyncio.wait_for(self._create_message(message, max_tokens), timeout=self.timeout)
+        except asyncio.TimeoutError as e:
+            self.breaker.record_failure()
+            raise AIUnavailableError(f"AI request exceeded its {self.timeout}s deadline") from e
+        except anthropic.APIStatusError as e:
+            if self._is_client_error(e):
+                # the API answered, the request itself was refused (bad request, auth), not an outage
+                self.breaker.record_success()
+            else:
+                self.breaker.record_failure()
+            raise AIUnavailableError(f"AI request failed: {e}") from e
+        except anthropic.APIError as e:
+            self.breaker.record_failure()
+            raise AIUnavailableError(f"AI request failed: {e}") from e
+        except asyncio.CancelledError:
+            # a BaseException, says nothing about the API, but a cancelled half-open trial must not hold the slot
+            self.breaker.release_trial()
+            raise
+        except Exception:
+            self.breaker.record_failure()
+            raise
+
+        self.breaker.record_success()
+        return response
+
+    @staticmethod
+    def _is_client_error(error: anthropic.APIStatusError) -> bool:
+        # timeouts and rate limiting are 4xx too, but they are exactly what the breaker is for
+        return 400 <= error.status_code < 500 and error.status_code not in (408, 429)
+
+    async def _create_message(self, message: str, max_tokens: int) -> str:
+        async with self._semaphore:
+            response = await self.client.messages.create(
+                model=CLAUDE_MODEL,
+                max_tokens=max_tokens,
+                messages=[
+                    {"role": "user", "content": message}
+                ]
+            )
+        return response.content[0].text
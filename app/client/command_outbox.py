@@ -0,0 +1,97 @@
+import datetime
+import json
+import os
+import threading
+
+from app.utils.log import get_main_app_logger
+
+logger = get_main_app_logger(__name__)
+
+
+class CommandOutbox:
+    """
+    Durable store of device commands that have not been acknowledged yet
+
+    Only the latest command per (device, channel) is kept, a newer one replaces it, so a device that was offline
+    for a while catches up with a single request. The file is rewritten atomically (temp file + os.replace) by a
+    background writer, changes made while it is writing are coalesced into its next write, so put() and remove()
+    never touch the disk on the caller's (GUI) thread. flush() writes synchronously, called on exit
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._commands: dict[str, dict[str, dict]] = {}  # device -> channel -> command
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._changed = threading.Event()
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._load()
+
+        self._writer = threading.Thread(target=self._run_writer, name='CommandOutboxWriter', daemon=True)
+        self._writer.start()
+
+    def put(self, device: str, channel: str, command: dict):
+        with self._lock:
+            self._commands.setdefault(device, {})[channel] = {**command, 'queued_at': datetime.datetime.now().isoformat()}
+        self._changed.set()
+
+    def remove(self, device: str, channel: str, command_id: str):
+        """Drops the channel's command once delivered, unless a newer one replaced it in the meantime"""
+        with self._lock:
+            channels = self._commands.get(device, {})
+            if channels.get(channel, {}).get('id') != command_id:
+                return
+
+            del channels[channel]
+            if not channels:
+                del self._commands[device]
+        self._changed.set()
+
+    def pending(self, device: str) -> dict[str, dict]:
+        with self._lock:
+            return dict(self._commands.get(device, {}))
+
+    def flush(self):
+        """Writes any pending change now, on the calling thread"""
+        if self._changed.is_set():
+            self._changed.clear()
+            self._save()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+
+        try:
+            with open(self.path, encoding='utf8') as f:
+                self._commands = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"[API] Ignoring unreadable command outbox {self.path}: {e}")
+            self._commands = {}
+            return
+
+        pending = sum(len(channels) for channels in self._commands.values())
+        if pending:
+            logger.info(f"[API] {pending} undelivered device commands found in {self.path}")
+
+    def _run_writer(self):
+        while True:
+            self._changed.wait()
+            self._changed.clear()
+            self._save()
+
+    def _save(self):
+        # the writer and flush() may both save, the snapshot is taken under the same lock so the newest one lands last
+        with self._save_lock:
+            with self._lock:
+                data = json.dumps(self._commands)
+
+            temp_path = f"{self.path}.tmp"
+            try:
+                with open(temp_path, 'w', encoding='utf8') as f:
+                    f.write(data)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(temp_path, self.path)
+            except OSError as e:
+                logger.warning(f"[API] Failed to persist command outbox {self.path}: {e}")
@@ -1,16 +1,62 @@
+import time
+from collections import deque
+from dataclasses import dataclass, field
+
 from app.client.base_network_client import BaseNetworkClient
+from app.client.command_outbox import CommandOutbox
 from app.utils.log import get_main_app_logger
 
 logger = get_main_app_logger(__name__)
 
+UNHEALTHY_AFTER_FAILURES = 3
+
+
+@dataclass
+class DeviceHealth:
+    successes: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    last_error: str | None = None
+    latencies_ms: deque[float] = field(default_factory=lambda: deque(maxlen=100))
+
+    @property
+    def healthy(self) -> bool:
+        return self.consecutive_failures < UNHEALTHY_AFTER_FAILURES
+
+    @property
+    def mean_latency_ms(self) -> float:
+        return sum(self.latencies_ms) / len(self.latencies_ms) if self.latencies_ms else 0.0
+
+    @property
+    def max_latency_ms(self) -> float:
+        return max(self.latencies_ms, default=0.0)
+
 
 class PiClient(BaseNetworkClient):
-    def __init__(self, url: str):
-        super().__init__(url)
+    # every timer command replaces the device's state, only the latest one matters
+    STATE_CHANNEL = 'flow_state'
+
+    def __init__(self, url: str, outbox: CommandOutbox = None, name: str = None, timeout: int = 10000, command_ttl: int = 3600):
+        super().__init__(url, timeout=timeout, outbox=outbox, command_ttl=command_ttl)
         self.base_url = url
+        self.name = name or url
+        self.health = DeviceHealth()
+
+    def _command_expires_at(self, endpoint, payload) -> float:
+        expires_at = super()._command_expires_at(endpoint, payload)
+        if endpoint == '/flow-state/pomodoro' and payload:
+            # a pomodoro timer means nothing once it would have run out
+            expires_at = min(expires_at, time.time() + payload['time'])
+        return expires_at
 
     def _handle_success(self, operation_type, response):
-        logger.info(f"[API] Successful HTTP request to pi client (Operation Type: {operation_type}, Response: {response})")
+        if not self.health.healthy:
+            logger.info(f"[API] Pi display '{self.name}' is reachable again")
+        self.health.successes += 1
+        self.health.consecutive_failures = 0
+        self.health.latencies_ms.append(self.last_latency_ms)
+
+        logger.info(f"[API] Successful HTTP request to pi client '{self.name}' (Operation Type: {operation_type}, Latency: {self.last_latency_ms:.0f}ms, Response: {response})")
         self.response_received.emit(operation_type, response)
 
     def _handle_error(self, operation_type, error_msg, status_code):
@@ -18,20 +64,34 @@ class PiClient(BaseNetworkClient):
         if status_code:
             error_detail += f" (HTTP {status_code})"
 
-        logger.error(f"[API] Failed HTTP request to pi client (Operation Type: {operation_type}, Error Details: {error_detail})")
+        self._record_failure(error_detail)
+        logger.error(f"[API] Failed HTTP request to pi client '{self.name}' (Operation Type: {operation_type}, Error Details: {error_detail})")
         self.request_error.emit(operation_type, error_detail)
 
+    def _schedule_retry(self, retry_info):
+        # durable commands can retry for a long time before _handle_error, every failed attempt counts towards health
+        self._record_failure(f"{retry_info['operation_type']} attempt {retry_info['attempt']} failed")
+        super()._schedule_retry(retry_info)
+
+    def _record_failure(self, error_detail: str):
+        was_healthy = self.health.healthy
+        self.health.failures += 1
+        self.health.consecutive_failures += 1
+        self.health.last_error = error_detail
+        if was_healthy and not self.health.healthy:
+            logger.warning(f"[API] Pi display '{self.name}' marked unhealthy after {self.health.consecutive_failures} failed requests")
+
     def start_productive_timer(self, time: int):
         payload = {"time": time}
-        self.post('/flow-state/productive', payload, 'start_productive_timer')
+        self.post('/flow-state/productive', payload, 'start_productive_timer', channel=self.STATE_CHANNEL)
 
     def start_non_productive_timer(self, time: int):
         payload = {"time": time}
-        self.post('/flow-state/non-productive', payload, 'start_non_productive_timer')
+        self.post('/flow-state/non-productive', payload, 'start_non_productive_timer', channel=self.STATE_CHANNEL)
 
     def start_pomodoro_timer(self, time: int):
         payload = {"time": time}
-        self.post('/flow-state/pomodoro', payload, 'start_pomodoro_timer')
+        self.post('/flow-state/pomodoro', payload, 'start_pomodoro_timer', channel=self.STATE_CHANNEL)
 
     def pause_all_timers(self):
-        self.post('/flow-state/pause', None, 'pause_all_timers')
+        self.post('/flow-state/pause', None, 'pause_all_timers', channel=self.STATE_CHANNEL)
@@ -1,3 +1,4 @@
+import datetime
 import uuid
 
 from app.domain.analytics import TimeFrame, AnalyticsReport
@@ -16,6 +17,7 @@ class AnalyticsController:
 
     def connect_slots_to_signals(self):
         self.view.analytics_report_requested.connect(self.on_analytics_report_requested)
+        self.view.custom_range_requested.connect(self.on_custom_range_requested)
         self.view.shutdown_detected.connect(self.on_shutdown_detected)
         self.service.report_generated.connect(self.on_report_generated)
 
@@ -27,6 +29,14 @@ class AnalyticsController:
 
         self.service.request_analytics_report(time_frame, analytics_report_id)
 
+    def on_custom_range_requested(self, start_date: datetime.date, end_date: datetime.date):
+        analytics_report_id = str(uuid.uuid4())
+        self.current_request_id = analytics_report_id
+
+        logger.info(f"[USER_ACTION] Received request to generate analytics report for {start_date} - {end_date} (Request Id: {analytics_report_id})")
+
+        self.service.request_analytics_report(TimeFrame.CUSTOM, analytics_report_id, start_date=start_date, end_date=end_date)
+
     def on_report_generated(self, data: AnalyticsReport, request_id: uuid):
         """Called when data is ready - runs in UI thread"""
         logger.debug(f"[SERVICE_EVENT] Analytics report successfully generated for time frame: {data.time_frame} (Request Id: {request_id})")
@@ -26,6 +26,7 @@ class FlowStateController:
         self.service.timer_updated.connect(self.on_timer_updated)
         self.service.pomodoro_state_changed.connect(self.on_pomodoro_state_changed)
         self.service.current_application_changed.connect(self.on_current_application_changed)
+        self.service.sync_status_changed.connect(self.on_sync_status_changed)
 
     """
     handlers for view events, calls methods in tracking service
@@ -83,3 +84,8 @@ class FlowStateController:
     def on_current_application_changed(self, new_app: Application):
         logger.debug(f"[SERVICE_EVENT] Current application changed to: {new_app.name}")
         self.view.update_recent_applications(ApplicationView(name=new_app.name, is_productive=new_app.is_productive))
+
+    def on_sync_status_changed(self, message: str):
+        if message:
+            logger.warning(f"[SERVICE_EVENT] Sync status: {message}")
+        self.view.update_sync_status(message)
@@ -0,0 +1,73 @@
+import threading
+
+from app.db.database import Database
+from app.domain.models import Application
+from app.utils.log import get_main_app_logger
+
+logger = get_main_app_logger(__name__)
+
+
+class ApplicationCatalog:
+    """
+    In-memory copy of the application table with write-through to the database
+
+    The table is small and only ever grows, so it is loaded once at startup and lookups for known applications
+    need no database I/O. Entries are keyed the same way the table is, by (name, is_productive), with a name index
+    for lookups that don't know the classification yet. Callers get copies, since elapsed_time is mutated per switch
+    """
+
+    def __init__(self, db: Database):
+        self.db = db
+        self._lock = threading.Lock()
+        self._by_key: dict[tuple[str, bool], Application] = {}
+        self._by_name: dict[str, Application] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def load(self):
+        applications = self.db.get_all_applications()
+        with self._lock:
+            self._by_key.clear()
+            self._by_name.clear()
+            for app in applications:
+                self._add(app)
+        logger.info(f"[CATALOG] Loaded {len(applications)} applications into the catalog")
+
+    def get_application(self, app_name: str) -> Application | None:
+        with self._lock:
+            app = self._by_name.get(app_name)
+            self._record_lookup(app)
+            return app.model_copy() if app else None
+
+    def get_or_create_application(self, app_name: str, is_productive: bool) -> Application:
+        with self._lock:
+            app = self._by_key.get((app_name, is_productive))
+            self._record_lookup(app)
+            if not app:
+                app = self.db.get_or_create_application(app_name, is_productive)
+                self._add(app)
+            return app.model_copy()
+
+    def create_application(self, app_name: str, is_productive: bool = False) -> Application:
+        with self._lock:
+            app = self.db.create_application(app_name, is_productive)
+            self._add(app)
+            return app.model_copy()
+
+    def replace_application(self, old_app: Application, new_app: Application):
+        """Swaps a reconciled application in for its provisional entry"""
+        with self._lock:
+            self._by_key.pop((old_app.name, old_app.is_productive), None)
+            self._by_name.pop(old_app.name, None)
+            self._add(new_app)
+
+    def _add(self, app: Application):
+        app = app.model_copy(update={'elapsed_time': 0})
+        self._by_key[(app.name, app.is_productive)] = app
+        self._by_name.setdefault(app.name, app)
+
+    def _record_lookup(self, app: Application | None):
+        if app:
+            self.hits += 1
+        else:
+            self.misses += 1
@@ -1,26 +1,36 @@
 import datetime
+import json
+import uuid
 from contextlib import contextmanager
 
-from sqlalchemy import create_engine, text, func
-from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy import func, select, literal, delete
 from sqlalchemy.orm import sessionmaker, joinedload
 
-from app.db.models import Base, ApplicationModel, SessionModel, WorkdayModel, WorkdayApplicationModel
-from app.domain.models import Workday, Application, Session, WorkdayApplication
+from app.db.models import (
+    Base, ApplicationModel, SessionModel, WorkdayModel, WorkdayApplicationModel, ClassificationModel,
+    PendingClassificationModel, ReplicationOutboxModel, ReplicationAppliedBatchModel, JournalCheckpointModel,
+    DailyRollupModel, ApplicationMonthRollupModel
+)
+from app.db.query_profiler import QueryProfiler
+from app.db.storage_backend import StorageBackend
+from app.domain.models import Workday, Application, Session, WorkdayApplication, Classification, ReplicationBatch
 
 
 class Database:
-    def __init__(self, db_url):
-        self.engine = create_engine(
-            url=db_url,
-            pool_pre_ping=True,
-            echo=True,
-        )
-        self.create_tables()
+    def __init__(self, db_url, echo: bool = False, slow_query_threshold_ms: float = 100.0, replicate: bool = False):
+        self.backend = StorageBackend.for_url(db_url)
+        # when set, every write that changes tracked time also queues a replication_outbox batch in its transaction
+        self.replicate = replicate
+        # full statement echo is a debug opt-in, routine instrumentation goes through the profiler
+        self.engine = self.backend.create_engine(echo=echo)
+        self.profiler = QueryProfiler(slow_query_threshold_ms)
+        self.profiler.attach(self.engine)
         self.Session = sessionmaker(bind=self.engine)
+        self.create_tables()
 
     def create_tables(self):
         Base.metadata.create_all(self.engine)
+        self._backfill_rollups()
 
     def get_session(self):
         return self.Session()
@@ -58,22 +68,290 @@ class Database:
             app = session.query(ApplicationModel).filter_by(name=app_name).first()
             return Application.from_orm(app) if app else None
 
+    def get_all_applications(self) -> list[Application]:
+        with self.session_scope() as session:
+            apps = session.query(ApplicationModel).order_by(ApplicationModel.id).all()
+            return [Application.from_orm(app) for app in apps]
+
     def bulk_save_workday_applications(self, workday_applications: list[WorkdayApplication]):
         with self.session_scope() as session:
             values = [
                 {k: v for k, v in app.dict().items() if k not in ['id', 'application']}
                 for app in workday_applications
             ]
+            self._upsert_workday_applications(session, values)
+
+    def save_flush(self, workday: Workday, workday_applications: list[WorkdayApplication], journal_sequence: int = None):
+        """
+        Workday update and application time upserts in one transaction, together with their replication batch and
+        the flush journal checkpoint they cover
+        """
+        with self.session_scope() as session:
+            if journal_sequence is not None:
+                self._save_journal_checkpoint(session, journal_sequence)
+
+            workday_model = session.get(WorkdayModel, workday.id)
+            workday_model.pomodoros_left = workday.pomodoros_left
+
+            values = [
+                {k: v for k, v in app.dict().items() if k not in ['id', 'application']}
+                for app in workday_applications
+            ]
+            if values:
+                self._upsert_workday_applications(session, values)
 
-            stmt = insert(WorkdayApplicationModel).values(values)
+            if self.replicate:
+                app_keys = dict(
+                    (app_id, (name, is_productive)) for app_id, name, is_productive in
+                    session.query(ApplicationModel.id, ApplicationModel.name, ApplicationModel.is_productive)
+                    .filter(ApplicationModel.id.in_([v['application_id'] for v in values]))
+                )
+                self._queue_replication(session, 'flush', {
+                    'date': workday_model.date.isoformat(),
+                    'pomodoros_left': workday_model.pomodoros_left,
+                    'applications': [[*app_keys[v['application_id']], v['time_seconds']] for v in values],
+                })
+
+    def get_journal_checkpoint(self) -> int:
+        with self.session_scope() as session:
+            checkpoint = session.get(JournalCheckpointModel, 1)
+            return checkpoint.sequence if checkpoint else 0
+
+    def _save_journal_checkpoint(self, session, sequence: int):
+        stmt = self.backend.insert(JournalCheckpointModel).values(id=1, sequence=sequence)
+        session.execute(stmt.on_conflict_do_update(index_elements=['id'], set_=dict(sequence=stmt.excluded.sequence)))
+
+    def apply_journal_credits(self, credits: list[tuple[datetime.date, str, bool, int]], journal_sequence: int):
+        """Replays (date, app name, is_productive, seconds) credits left in the flush journal by a crash"""
+        with self.session_scope() as session:
+            self._save_journal_checkpoint(session, journal_sequence)
+
+            by_date: dict[datetime.date, list[tuple[str, bool, int]]] = {}
+            for date, name, is_productive, seconds in credits:
+                by_date.setdefault(date, []).append((name, is_productive, seconds))
+
+            for date, applications in by_date.items():
+                workday = self._get_or_create_workday(session, date)
+                self._upsert_workday_applications(session, [
+                    {
+                        'workday_id': workday.id,
+                        'application_id': self._get_or_create_application_model(session, name, is_productive).id,
+                        'time_seconds': seconds,
+                    }
+                    for name, is_productive, seconds in applications
+                ])
+
+                if self.replicate:
+                    self._queue_replication(session, 'flush', {
+                        'date': date.isoformat(),
+                        'pomodoros_left': workday.pomodoros_left,
+                        'applications': [list(application) for application in applications],
+                    })
+
+    def _upsert_workday_applications(self, session, values: list[dict]):
+        stmt = self.backend.insert(WorkdayApplicationModel).values(values)
+        update_stmt = stmt.on_conflict_do_update(
+            index_elements=['workday_id', 'application_id'],
+            set_=dict(
+                time_seconds=WorkdayApplicationModel.time_seconds + stmt.excluded.time_seconds
+            )
+        )
+        session.execute(update_stmt)
+
+        workday_dates = dict(
+            session.query(WorkdayModel.id, WorkdayModel.date)
+            .filter(WorkdayModel.id.in_({v['workday_id'] for v in values}))
+        )
+        app_classifications = dict(
+            session.query(ApplicationModel.id, ApplicationModel.is_productive)
+            .filter(ApplicationModel.id.in_({v['application_id'] for v in values}))
+        )
+        self._add_to_rollups(session, [
+            (workday_dates[v['workday_id']], v['application_id'], app_classifications[v['application_id']], v['time_seconds'])
+            for v in values
+        ])
+
+    def _add_to_rollups(self, session, entries: list[tuple[datetime.date, int, bool, int]]):
+        """
+        Adds (date, application id, is_productive, seconds) to the rollup tables in the caller's transaction
+
+        daily_rollup keeps productive / non-productive totals per day and application_month_rollup keeps
+        per-application totals per month, so range reports read a handful of rows per month instead of every
+        workday_application row in the range
+        """
+        daily: dict[datetime.date, list[int]] = {}
+        monthly: dict[tuple[datetime.date, int], int] = {}
+        for date, application_id, is_productive, seconds in entries:
+            totals = daily.setdefault(date, [0, 0])
+            totals[0 if is_productive else 1] += seconds
+            month = date.replace(day=1)
+            monthly[(month, application_id)] = monthly.get((month, application_id), 0) + seconds
+
+        self._add_to_daily_rollup(session, daily)
+        if monthly:
+            stmt = self.backend.insert(ApplicationMonthRollupModel).values([
+                {'month': month, 'application_id': application_id, 'time_seconds': seconds}
+                for (month, application_id), seconds in monthly.items()
+            ])
+            session.execute(stmt.on_conflict_do_update(
+                index_elements=['month', 'application_id'],
+                set_=dict(time_seconds=ApplicationMonthRollupModel.time_seconds + stmt.excluded.time_seconds)
+            ))
+
+    def _add_to_daily_rollup(self, session, daily: dict[datetime.date, list[int]]):
+        if not daily:
+            return
+        stmt = self.backend.insert(DailyRollupModel).values([
+            {'date': date, 'productive_seconds': productive, 'non_productive_seconds': non_productive}
+            for date, (productive, non_productive) in daily.items()
+        ])
+        session.execute(stmt.on_conflict_do_update(
+            index_elements=['date'],
+            set_=dict(
+                productive_seconds=DailyRollupModel.productive_seconds + stmt.excluded.productive_seconds,
+                non_productive_seconds=DailyRollupModel.non_productive_seconds + stmt.excluded.non_productive_seconds
+            )
+        ))
+
+    def _backfill_rollups(self):
+        """Builds the rollup tables from workday_application once, for stores created before they existed"""
+        with self.session_scope() as session:
+            if session.query(DailyRollupModel.date).first() or session.query(ApplicationMonthRollupModel.id).first():
+                return
+
+            rows = (
+                session.query(
+                    WorkdayModel.date,
+                    WorkdayApplicationModel.application_id,
+                    ApplicationModel.is_productive,
+                    WorkdayApplicationModel.time_seconds
+                )
+                .join(WorkdayApplicationModel.workday)
+                .join(WorkdayApplicationModel.application)
+                .all()
+            )
+            for i in range(0, len(rows), 500):
+                self._add_to_rollups(session, [tuple(row) for row in rows[i:i + 500]])
+
+    def get_classification(self, app_name: str, tag: str) -> Classification | None:
+        with self.session_scope() as session:
+            classification = session.query(ClassificationModel).filter_by(app_name=app_name, tag=tag).first()
+            return Classification.from_orm(classification) if classification else None
+
+    def get_classifications(self) -> list[Classification]:
+        with self.session_scope() as session:
+            classifications = session.query(ClassificationModel).order_by(ClassificationModel.classified_at).all()
+            return [Classification.from_orm(classification) for classification in classifications]
+
+    def save_classification(self, classification: Classification):
+        with self.session_scope() as session:
+            stmt = self.backend.insert(ClassificationModel).values(**classification.model_dump())
             update_stmt = stmt.on_conflict_do_update(
-                index_elements=['workday_id', 'application_id'],
+                index_elements=['app_name', 'tag'],
                 set_=dict(
-                    time_seconds=WorkdayApplicationModel.time_seconds + text('excluded.time_seconds')
+                    is_productive=stmt.excluded.is_productive,
+                    classified_at=stmt.excluded.classified_at
                 )
             )
             session.execute(update_stmt)
 
+    def queue_pending_classification(self, application_id: int):
+        with self.session_scope() as session:
+            stmt = self.backend.insert(PendingClassificationModel).values(application_id=application_id)
+            session.execute(stmt.on_conflict_do_nothing(index_elements=['application_id']))
+
+    def get_pending_classifications(self) -> list[Application]:
+        with self.session_scope() as session:
+            apps = (
+                session.query(ApplicationModel)
+                .join(PendingClassificationModel, PendingClassificationModel.application_id == ApplicationModel.id)
+                .order_by(PendingClassificationModel.queued_at)
+                .all()
+            )
+            return [Application.from_orm(app) for app in apps]
+
+    def delete_pending_classification(self, application_id: int):
+        with self.session_scope() as session:
+            session.execute(delete(PendingClassificationModel).where(PendingClassificationModel.application_id == application_id))
+
+    def reconcile_application(self, application: Application, is_productive: bool) -> tuple[Application, int]:
+        """
+        Re-points a provisionally classified application at its real classification in one transaction
+
+        If no (name, is_productive) row exists yet the provisional row is simply flipped. Otherwise every
+        workday_application row of the provisional app is folded into the existing row with a single
+        insert ... select upsert, and the provisional rows are deleted. Returns the reconciled application and the
+        seconds that moved within today's workday, so in-memory totals can be adjusted
+        """
+        today = datetime.date.today()
+        with self.session_scope() as session:
+            session.execute(delete(PendingClassificationModel).where(PendingClassificationModel.application_id == application.id))
+
+            moved_today = (
+                session.query(func.coalesce(func.sum(WorkdayApplicationModel.time_seconds), 0))
+                .join(WorkdayApplicationModel.workday)
+                .filter(WorkdayApplicationModel.application_id == application.id, WorkdayModel.date == today)
+                .scalar()
+            )
+
+            target = self._fold_application(session, session.get(ApplicationModel, application.id), is_productive)
+            if self.replicate:
+                self._queue_replication(session, 'reconcile', {
+                    'name': application.name,
+                    'from': application.is_productive,
+                    'to': is_productive,
+                })
+            return Application.from_orm(target), moved_today
+
+    def _fold_application(self, session, application: ApplicationModel, is_productive: bool) -> ApplicationModel:
+        if application.is_productive != is_productive:
+            # the time moves between the productive and non-productive day totals
+            sign = 1 if is_productive else -1
+            self._add_to_daily_rollup(session, {
+                date: [sign * seconds, -sign * seconds] for date, seconds in
+                session.query(WorkdayModel.date, WorkdayApplicationModel.time_seconds)
+                .join(WorkdayApplicationModel.workday)
+                .filter(WorkdayApplicationModel.application_id == application.id)
+            })
+
+        target = session.query(ApplicationModel).filter_by(name=application.name, is_productive=is_productive).first()
+        if not target:
+            application.is_productive = is_productive
+            session.flush()
+            return application
+
+        moved_rows = select(
+            WorkdayApplicationModel.workday_id,
+            literal(target.id),
+            WorkdayApplicationModel.time_seconds
+        ).where(WorkdayApplicationModel.application_id == application.id)
+
+        stmt = self.backend.insert(WorkdayApplicationModel).from_select(['workday_id', 'application_id', 'time_seconds'], moved_rows)
+        session.execute(stmt.on_conflict_do_update(
+            index_elements=['workday_id', 'application_id'],
+            set_=dict(
+                time_seconds=WorkdayApplicationModel.time_seconds + stmt.excluded.time_seconds
+            )
+        ))
+        session.execute(delete(WorkdayApplicationModel).where(WorkdayApplicationModel.application_id == application.id))
+
+        moved_months = select(
+            ApplicationMonthRollupModel.month,
+            literal(target.id),
+            ApplicationMonthRollupModel.time_seconds
+        ).where(ApplicationMonthRollupModel.application_id == application.id)
+
+        stmt = self.backend.insert(ApplicationMonthRollupModel).from_select(['month', 'application_id', 'time_seconds'], moved_months)
+        session.execute(stmt.on_conflict_do_update(
+            index_elements=['month', 'application_id'],
+            set_=dict(
+                time_seconds=ApplicationMonthRollupModel.time_seconds + stmt.excluded.time_seconds
+            )
+        ))
+        session.execute(delete(ApplicationMonthRollupModel).where(ApplicationMonthRollupModel.application_id == application.id))
+        session.execute(delete(ApplicationModel).where(ApplicationModel.id == application.id))
+        return target
+
     def save_session(self, current_session: Session):
         today = datetime.date.today()
         with self.session_scope() as db_session:
@@ -82,6 +360,134 @@ class Database:
             session.workday = workday
             db_session.add(session)
 
+            if self.replicate:
+                self._queue_replication(db_session, 'session', {
+                    'date': today.isoformat(),
+                    'start_time': current_session.start_time.isoformat(),
+                    'end_time': current_session.end_time.isoformat() if current_session.end_time else None,
+                    'interruption_count': current_session.interruption_count,
+                })
+
+    def _queue_replication(self, session, kind: str, payload: dict):
+        session.add(ReplicationOutboxModel(batch_id=str(uuid.uuid4()), kind=kind, payload=json.dumps(payload)))
+
+    def get_replication_batches(self, limit: int) -> list[ReplicationBatch]:
+        with self.session_scope() as session:
+            batches = session.query(ReplicationOutboxModel).order_by(ReplicationOutboxModel.id).limit(limit).all()
+            return [ReplicationBatch.from_orm(batch) for batch in batches]
+
+    def delete_replication_batches(self, ids: list[int]):
+        with self.session_scope() as session:
+            session.execute(delete(ReplicationOutboxModel).where(ReplicationOutboxModel.id.in_(ids)))
+
+    def get_replication_lag(self) -> tuple[int, datetime.datetime | None]:
+        """Number of batches still waiting to be replicated and when the oldest one was written"""
+        with self.session_scope() as session:
+            return session.query(func.count(ReplicationOutboxModel.id), func.min(ReplicationOutboxModel.created_at)).one()
+
+    def apply_replication_batch(self, batch: ReplicationBatch) -> bool:
+        """
+        Applies a batch replicated from a local store, returns False if it was already applied
+
+        The batch id is recorded in the same transaction as its effects, so a batch re-sent after a lost
+        acknowledgement is skipped instead of counted twice. Rows are matched by natural key (workday date,
+        application name and classification), time is added to whatever other devices already replicated
+        """
+        with self.session_scope() as session:
+            stmt = self.backend.insert(ReplicationAppliedBatchModel).values(batch_id=batch.batch_id)
+            if not session.execute(stmt.on_conflict_do_nothing(index_elements=['batch_id'])).rowcount:
+                return False
+
+            payload = json.loads(batch.payload)
+            if batch.kind == 'flush':
+                workday = self._get_or_create_workday(session, datetime.date.fromisoformat(payload['date']))
+                workday.pomodoros_left = min(workday.pomodoros_left, payload['pomodoros_left'])
+                values = [
+                    {
+                        'workday_id': workday.id,
+                        'application_id': self._get_or_create_application_model(session, name, is_productive).id,
+                        'time_seconds': seconds,
+                    }
+                    for name, is_productive, seconds in payload['applications']
+                ]
+                if values:
+                    self._upsert_workday_applications(session, values)
+            elif batch.kind == 'session':
+                workday = self._get_or_create_workday(session, datetime.date.fromisoformat(payload['date']))
+                session.add(SessionModel(
+                    workday_id=workday.id,
+                    start_time=datetime.datetime.fromisoformat(payload['start_time']),
+                    end_time=datetime.datetime.fromisoformat(payload['end_time']) if payload['end_time'] else None,
+                    interruption_count=payload['interruption_count'],
+                ))
+            elif batch.kind == 'reconcile':
+                application = session.query(ApplicationModel).filter_by(name=payload['name'], is_productive=payload['from']).first()
+                if application:
+                    self._fold_application(session, application, payload['to'])
+            else:
+                raise ValueError(f"Unknown replication batch kind: {batch.kind}")
+            return True
+
+    def _get_or_create_workday(self, session, date: datetime.date) -> WorkdayModel:
+        workday = session.query(WorkdayModel).filter_by(date=date).first()
+        if not workday:
+            workday = WorkdayModel(date=date)
+            session.add(workday)
+            session.flush()
+        return workday
+
+    def _get_or_create_application_model(self, session, name: str, is_productive: bool) -> ApplicationModel:
+        app = session.query(ApplicationModel).filter_by(name=name, is_productive=is_productive).first()
+        if not app:
+            app = ApplicationModel(name=name, is_productive=is_productive)
+            session.add(app)
+            session.flush()
+        return app
+
+    def is_empty(self) -> bool:
+        with self.session_scope() as session:
+            return not session.query(ApplicationModel.id).first() and not session.query(WorkdayModel.id).first()
+
+    def export_snapshot(self) -> dict:
+        """Applications, workdays, tracked time and classifications keyed by natural key, to seed an empty store"""
+        with self.session_scope() as session:
+            return {
+                'applications': [tuple(row) for row in session.query(ApplicationModel.name, ApplicationModel.is_productive)],
+                'workdays': [tuple(row) for row in session.query(WorkdayModel.date, WorkdayModel.pomodoros_left)],
+                'workday_applications': [
+                    tuple(row) for row in
+                    session.query(WorkdayModel.date, ApplicationModel.name, ApplicationModel.is_productive, WorkdayApplicationModel.time_seconds)
+                    .join(WorkdayApplicationModel.workday)
+                    .join(WorkdayApplicationModel.application)
+                ],
+                'classifications': [Classification.from_orm(c) for c in session.query(ClassificationModel)],
+            }
+
+    def import_snapshot(self, snapshot: dict):
+        with self.session_scope() as session:
+            applications = {
+                (name, is_productive): self._get_or_create_application_model(session, name, is_productive)
+                for name, is_productive in snapshot['applications']
+            }
+            workdays = {}
+            for date, pomodoros_left in snapshot['workdays']:
+                workdays[date] = self._get_or_create_workday(session, date)
+                workdays[date].pomodoros_left = pomodoros_left
+
+            values = [
+                {
+                    'workday_id': workdays[date].id,
+                    'application_id': applications[(name, is_productive)].id,
+                    'time_seconds': seconds,
+                }
+                for date, name, is_productive, seconds in snapshot['workday_applications']
+            ]
+            for i in range(0, len(values), 500):
+                self._upsert_workday_applications(session, values[i:i + 500])
+
+            for classification in snapshot['classifications']:
+                session.add(ClassificationModel(**classification.model_dump()))
+
     def get_todays_workday(self) -> Workday:
         today = datetime.date.today()
         with self.session_scope() as session:
@@ -104,24 +510,77 @@ class Database:
             workday_model = session.get(WorkdayModel, workday.id)
             workday_model.pomodoros_left = workday.pomodoros_left
 
-    def get_workday_application_totals_from(self, date: datetime.date):
+    def get_workday_application_history(self) -> list[tuple[datetime.date, Application, int]]:
+        """Every (date, application, seconds) row, to load the in-memory analytics index"""
         with self.session_scope() as session:
-            app_breakdowns = (
-                session.query(
-                    ApplicationModel.name,
-                    ApplicationModel.is_productive,
-                    func.sum(WorkdayApplicationModel.time_seconds).label('total_time')
-                )
-                .join(WorkdayApplicationModel.application)
+            applications = {app.id: Application.from_orm(app) for app in session.query(ApplicationModel)}
+            rows = (
+                session.query(WorkdayModel.date, WorkdayApplicationModel.application_id, WorkdayApplicationModel.time_seconds)
                 .join(WorkdayApplicationModel.workday)
-                .filter(WorkdayModel.date >= date)
-                .group_by(
-                    ApplicationModel.id,
-                    ApplicationModel.name,
-                    ApplicationModel.is_productive
+                .order_by(WorkdayModel.date)
+            )
+            return [(date, applications[application_id], seconds) for date, application_id, seconds in rows]
+
+    def get_application_totals_between(self, start: datetime.date | None, end: datetime.date):
+        """
+        Per-application totals for start..end (inclusive, start None meaning all time), served from the rollups
+
+        Whole months come from application_month_rollup, only the partial months at the edges of the range are
+        summed from workday_application, so the cost stays flat as history grows
+        """
+        first_full_month = start.replace(day=1) if start else None
+        if start and start.day != 1:
+            first_full_month = (first_full_month + datetime.timedelta(days=32)).replace(day=1)
+        # the month containing end only counts as full when end is its last day
+        end_month = end.replace(day=1)
+        last_full_month = end_month if (end + datetime.timedelta(days=1)).month != end.month else None
+        month_range_end = last_full_month or (end_month - datetime.timedelta(days=1)).replace(day=1)
+
+        with self.session_scope() as session:
+            parts = []
+            if first_full_month is None or first_full_month <= month_range_end:
+                monthly = select(
+                    ApplicationMonthRollupModel.application_id,
+                    ApplicationMonthRollupModel.time_seconds
+                ).where(ApplicationMonthRollupModel.month <= month_range_end)
+                if first_full_month:
+                    monthly = monthly.where(ApplicationMonthRollupModel.month >= first_full_month)
+                parts.append(monthly)
+
+                daily_ranges = []
+                if first_full_month and start < first_full_month:
+                    daily_ranges.append((start, first_full_month - datetime.timedelta(days=1)))
+                if not last_full_month:
+                    daily_ranges.append((end_month, end))
+            else:
+                # no whole month between the ends, either a single month or a partial head and tail month,
+                # both are cheap to sum from workday_application directly
+                daily_ranges = [(start, end)]
+
+            for range_start, range_end in daily_ranges:
+                parts.append(
+                    select(WorkdayApplicationModel.application_id, WorkdayApplicationModel.time_seconds)
+                    .join(WorkdayApplicationModel.workday)
+                    .where(WorkdayModel.date >= range_start, WorkdayModel.date <= range_end)
                 )
-                .order_by(func.sum(WorkdayApplicationModel.time_seconds).desc())
+
+            totals = parts[0].union_all(*parts[1:]).subquery() if len(parts) > 1 else parts[0].subquery()
+            total_time = func.sum(totals.c.time_seconds)
+            return (
+                session.query(ApplicationModel.name, ApplicationModel.is_productive, total_time.label('total_time'))
+                .join(totals, totals.c.application_id == ApplicationModel.id)
+                .group_by(ApplicationModel.id, ApplicationModel.name, ApplicationModel.is_productive)
+                .order_by(total_time.desc())
                 .all()
             )
 
-            return app_breakdowns
+    def get_productivity_totals_between(self, start: datetime.date | None, end: datetime.date) -> tuple[int, int]:
+        """Productive and non-productive seconds for start..end (inclusive) from the daily rollup"""
+        with self.session_scope() as session:
+            query = session.query(
+                func.coalesce(func.sum(DailyRollupModel.productive_seconds), 0),
+                func.coalesce(func.sum(DailyRollupModel.non_productive_seconds), 0)
+            ).filter(DailyRollupModel.date <= end)
+            if start:
+                query = query.filter(DailyRollupModel.date >= start)
+            return tuple(query.one())
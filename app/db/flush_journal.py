@@ -0,0 +1,120 @@
+import datetime
+import json
+import os
+import time
+from dataclasses import dataclass
+
+from app.utils.log import get_main_app_logger
+
+logger = get_main_app_logger(__name__)
+
+
+@dataclass(frozen=True)
+class JournalCredit:
+    sequence: int
+    date: datetime.date
+    app_name: str
+    is_productive: bool
+    seconds: int
+
+
+class FlushJournal:
+    """
+    Append-only journal of time credits that have not reached the database yet
+
+    Every credit is written (one json line) as it accrues and handed to the OS immediately, so a crash or kill of
+    the app loses nothing; fsync is grouped, append syncs once sync_interval seconds passed since the last one and
+    the owner calls sync() on a sync_interval timer for the tail written before a pause, together bounding what a
+    power loss can take to about sync_interval seconds.
+    The database stores the sequence of the last credit each flush covered in the flush transaction itself,
+    records past that checkpoint are replayed at startup, covered records are dropped from the file.
+    Credits carry natural keys (date, app name, classification) so replay doesn't depend on row ids
+    """
+
+    def __init__(self, path: str, sync_interval: float = 5.0):
+        self.path = path
+        self.sync_interval = sync_interval
+        self.sequence = 0
+        self._last_sync = time.monotonic()
+        self._unsynced = 0
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        for credit in self.read():
+            self.sequence = max(self.sequence, credit.sequence)
+        self._file = open(path, 'a', encoding='utf8')
+
+    def read(self, after: int = 0) -> list[JournalCredit]:
+        if not os.path.exists(self.path):
+            return []
+
+        credits = []
+        with open(self.path, encoding='utf8') as f:
+            for line_number, line in enumerate(f, 1):
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # only the last line can be torn by a crash mid-write, anything after it was never acknowledged
+                    logger.warning(f"[JOURNAL] Ignoring torn record at line {line_number} of {self.path}")
+                    break
+                if record['seq'] > after:
+                    credits.append(JournalCredit(
+                        sequence=record['seq'],
+                        date=datetime.date.fromisoformat(record['date']),
+                        app_name=record['app'],
+                        is_productive=record['productive'],
+                        seconds=record['seconds']
+                    ))
+        return credits
+
+    def append(self, date: datetime.date, app_name: str, is_productive: bool, seconds: int) -> int:
+        self.sequence += 1
+        self._file.write(self._format(JournalCredit(self.sequence, date, app_name, is_productive, seconds)))
+        self._file.flush()
+        self._unsynced += 1
+
+        if time.monotonic() - self._last_sync >= self.sync_interval:
+            self.sync()
+        return self.sequence
+
+    def sync(self):
+        if self._unsynced:
+            os.fsync(self._file.fileno())
+            self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def checkpoint(self, sequence: int):
+        """Called once the database committed every credit up to sequence"""
+        # sequences keep counting past the checkpoint after a truncate, the database checkpoint never moves back
+        self.sequence = max(self.sequence, sequence)
+        if sequence >= self.sequence:
+            self._file.truncate(0)
+            self._file.seek(0)
+            os.fsync(self._file.fileno())
+            self._unsynced = 0
+            return
+
+        # credits accrued while the flush was being written, keep only those
+        remaining = self.read(after=sequence)
+        self._file.close()
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'w', encoding='utf8') as f:
+            f.writelines(self._format(credit) for credit in remaining)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+        self._file = open(self.path, 'a', encoding='utf8')
+        self._unsynced = 0
+
+    @staticmethod
+    def _format(credit: JournalCredit) -> str:
+        return json.dumps({
+            'seq': credit.sequence,
+            'date': credit.date.isoformat(),
+            'app': credit.app_name,
+            'productive': credit.is_productive,
+            'seconds': credit.seconds,
+        }) + '\n'
+
+    def close(self):
+        self.sync()
+        self._file.close()
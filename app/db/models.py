@@ -1,6 +1,6 @@
 import datetime
 
-from sqlalchemy import Column, Integer, String, Boolean, Date, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Integer, String, Boolean, Date, DateTime, ForeignKey, UniqueConstraint, Text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 
@@ -70,3 +70,93 @@ class SessionModel(Base):
 
     def __repr__(self):
         return f"<SessionModel(id={self.id}, start='{self.start_time}', end={self.end_time})>"
+
+
+class ClassificationModel(Base):
+    __tablename__ = 'classification_cache'
+
+    id = Column(Integer, primary_key=True)
+    app_name = Column(String(255), nullable=False)
+    tag = Column(String(512), nullable=False)
+    is_productive = Column(Boolean, nullable=False)
+    classified_at = Column(DateTime, default=datetime.datetime.now, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint('app_name', 'tag', name='uix_classification_app_name_tag'),
+    )
+
+    def __repr__(self):
+        return f"<ClassificationModel(id={self.id}, app_name='{self.app_name}', tag='{self.tag}', productive={self.is_productive})>"
+
+
+class PendingClassificationModel(Base):
+    __tablename__ = 'pending_classification'
+
+    id = Column(Integer, primary_key=True)
+    application_id = Column(Integer, ForeignKey('application.id'), nullable=False, unique=True)
+    queued_at = Column(DateTime, default=datetime.datetime.now, nullable=False)
+
+    application = relationship("ApplicationModel")
+
+    def __repr__(self):
+        return f"<PendingClassificationModel(id={self.id}, app_id={self.application_id}, queued_at={self.queued_at})>"
+
+
+class ReplicationOutboxModel(Base):
+    __tablename__ = 'replication_outbox'
+
+    id = Column(Integer, primary_key=True)
+    batch_id = Column(String(36), nullable=False, unique=True)
+    kind = Column(String(32), nullable=False)
+    payload = Column(Text, nullable=False)  # json, rows identified by natural keys since ids differ between stores
+    created_at = Column(DateTime, default=datetime.datetime.now, nullable=False)
+
+    def __repr__(self):
+        return f"<ReplicationOutboxModel(id={self.id}, batch_id='{self.batch_id}', kind='{self.kind}')>"
+
+
+class ReplicationAppliedBatchModel(Base):
+    __tablename__ = 'replication_applied_batch'
+
+    batch_id = Column(String(36), primary_key=True)
+    applied_at = Column(DateTime, default=datetime.datetime.now, nullable=False)
+
+    def __repr__(self):
+        return f"<ReplicationAppliedBatchModel(batch_id='{self.batch_id}', applied_at={self.applied_at})>"
+
+
+class JournalCheckpointModel(Base):
+    __tablename__ = 'journal_checkpoint'
+
+    id = Column(Integer, primary_key=True)
+    sequence = Column(Integer, nullable=False, default=0)  # last flush journal credit committed to this database
+
+    def __repr__(self):
+        return f"<JournalCheckpointModel(id={self.id}, sequence={self.sequence})>"
+
+
+class DailyRollupModel(Base):
+    __tablename__ = 'daily_rollup'
+
+    date = Column(Date, primary_key=True)
+    productive_seconds = Column(Integer, nullable=False, default=0)
+    non_productive_seconds = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<DailyRollupModel(date='{self.date}', productive={self.productive_seconds}s, non_productive={self.non_productive_seconds}s)>"
+
+
+class ApplicationMonthRollupModel(Base):
+    __tablename__ = 'application_month_rollup'
+
+    id = Column(Integer, primary_key=True)
+    month = Column(Date, nullable=False)  # first day of the month
+    application_id = Column(Integer, ForeignKey('application.id'), nullable=False)
+    time_seconds = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        UniqueConstraint('month', 'application_id', name='uq_application_month_rollup'),
+    )
+
+    def __repr__(self):
+        return f"<ApplicationMonthRollupModel(month='{self.month}', app_id={self.application_id}, time={self.time_seconds}s)>"
@@ -0,0 +1,120 @@
+import logging
+import re
+import threading
+import time
+from bisect import bisect_left
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.utils.log import get_main_app_logger
+
+logger = get_main_app_logger(__name__)
+slow_query_logger = logging.getLogger('slow_queries')
+
+# upper bounds (ms) of the latency histogram buckets, the last bucket is open ended
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    rows: int = 0
+    errors: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    buckets: list[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS_MS) + 1))
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_ms / self.count if self.count else 0.0
+
+    def percentile_ms(self, percentile: float) -> float:
+        """Upper bound of the bucket holding the given percentile, inf if it falls in the open bucket"""
+        if not self.count:
+            return 0.0
+        target = percentile * self.count
+        seen = 0
+        for bound, bucket_count in zip(LATENCY_BUCKETS_MS + (float('inf'),), self.buckets):
+            seen += bucket_count
+            if seen >= target:
+                return bound
+        return float('inf')
+
+
+class QueryProfiler:
+    """
+    Per-statement latency histograms and row counts, gathered from engine cursor events
+
+    Statements are keyed by their normalized SQL (literals and placeholders replaced, multi-row VALUES lists
+    collapsed) so every flush upsert or application lookup lands in the same entry. Statements slower than
+    slow_query_threshold_ms are written to the slow_queries logger with their parameters
+    """
+
+    def __init__(self, slow_query_threshold_ms: float = 100.0):
+        self.slow_query_threshold_ms = slow_query_threshold_ms
+        self.stats: dict[str, QueryStats] = {}
+        self._lock = threading.Lock()
+
+    def attach(self, engine: Engine):
+        event.listen(engine, 'before_cursor_execute', self._before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', self._after_cursor_execute)
+        event.listen(engine, 'handle_error', self._handle_error)
+
+    @staticmethod
+    def normalize(statement: str) -> str:
+        sql = re.sub(r'\s+', ' ', statement).strip()
+        sql = re.sub(r"'(?:[^']|'')*'", '?', sql)
+        sql = re.sub(r'%\(\w+\)s|:\w+|%s|\$\d+', '?', sql)
+        sql = re.sub(r'\b\d+(?:\.\d+)?\b', '?', sql)
+        sql = re.sub(r'(\([?, ]+\))(?:\s*,\s*\([?, ]+\))+', r'\1, ...', sql)
+        return sql
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('query_start_time', []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        elapsed_ms = (time.perf_counter() - conn.info['query_start_time'].pop()) * 1000
+        rows = max(cursor.rowcount or 0, 0)  # as reported by the driver, -1 when it can't tell
+        self._record(statement, elapsed_ms, rows)
+
+        if elapsed_ms >= self.slow_query_threshold_ms:
+            slow_query_logger.warning(f"{elapsed_ms:.1f}ms, {rows} rows: {statement} | params: {parameters!r}")
+
+    def _handle_error(self, exception_context):
+        start_times = exception_context.connection.info.get('query_start_time') if exception_context.connection else None
+        if start_times:
+            start_times.pop()
+        if exception_context.statement:
+            with self._lock:
+                self._entry(exception_context.statement).errors += 1
+
+    def _record(self, statement: str, elapsed_ms: float, rows: int):
+        with self._lock:
+            stats = self._entry(statement)
+            stats.count += 1
+            stats.rows += rows
+            stats.total_ms += elapsed_ms
+            stats.max_ms = max(stats.max_ms, elapsed_ms)
+            stats.buckets[bisect_left(LATENCY_BUCKETS_MS, elapsed_ms)] += 1
+
+    def _entry(self, statement: str) -> QueryStats:
+        key = self.normalize(statement)
+        stats = self.stats.get(key)
+        if stats is None:
+            stats = self.stats[key] = QueryStats()
+        return stats
+
+    def log_summary(self, limit: int = 10):
+        with self._lock:
+            ranked = sorted(self.stats.items(), key=lambda item: item[1].total_ms, reverse=True)[:limit]
+            total = sum(stats.count for stats in self.stats.values())
+
+        logger.info(f"[DB] Query profile: {total} statements across {len(self.stats)} distinct queries")
+        for sql, stats in ranked:
+            logger.info(
+                f"[DB] {stats.count}x total {stats.total_ms:.1f}ms, mean {stats.mean_ms:.2f}ms, "
+                f"p95 <= {stats.percentile_ms(0.95)}ms, max {stats.max_ms:.1f}ms, rows {stats.rows}, "
+                f"errors {stats.errors}: {sql[:200]}"
+            )
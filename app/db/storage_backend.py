@@ -0,0 +1,103 @@
+import os
+from abc import ABC, abstractmethod
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Engine, make_url
+
+from app.utils.log import get_main_app_logger
+from app.utils.resolve_path import get_data_directory
+
+logger = get_main_app_logger(__name__)
+
+DEFAULT_SQLITE_FILENAME = 'flow_state.db'
+
+
+def default_database_url() -> str:
+    return f"sqlite:///{os.path.join(get_data_directory(), DEFAULT_SQLITE_FILENAME)}"
+
+
+class StorageBackend(ABC):
+    """
+    Dialect specific pieces of the database layer
+
+    Database only talks to the engine and to insert() for upserts, both Postgres and SQLite inserts expose the same
+    on_conflict_do_update / on_conflict_do_nothing / excluded interface, so queries stay dialect agnostic
+    """
+    name = None
+
+    def __init__(self, db_url: str):
+        self.db_url = db_url
+
+    @classmethod
+    def for_url(cls, db_url: str) -> 'StorageBackend':
+        backend_name = make_url(db_url).get_backend_name()
+        for backend in (PostgresBackend, SQLiteBackend):
+            if backend.name == backend_name:
+                return backend(db_url)
+        raise ValueError(f"Unsupported database backend: {backend_name}")
+
+    @abstractmethod
+    def create_engine(self, echo: bool = False) -> Engine:
+        pass
+
+    @abstractmethod
+    def insert(self, table):
+        pass
+
+
+class PostgresBackend(StorageBackend):
+    name = 'postgresql'
+
+    def create_engine(self, echo: bool = False) -> Engine:
+        return create_engine(
+            url=self.db_url,
+            pool_pre_ping=True,
+            echo=echo,
+            connect_args={'connect_timeout': 10},  # fail fast when the server is unreachable instead of hanging
+        )
+
+    def insert(self, table):
+        return postgresql.insert(table)
+
+
+class SQLiteBackend(StorageBackend):
+    """
+    Embedded SQLite store in WAL mode
+
+    WAL lets the UI thread read while a flush writes, synchronous=NORMAL only fsyncs at checkpoints (a power loss
+    may drop the last transactions but never corrupts the file), and busy_timeout makes concurrent writers from
+    worker threads wait instead of failing
+    """
+    name = 'sqlite'
+
+    PRAGMAS = (
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA foreign_keys=ON",
+        "PRAGMA busy_timeout=5000",
+        "PRAGMA temp_store=MEMORY",
+    )
+
+    def create_engine(self, echo: bool = False) -> Engine:
+        database = make_url(self.db_url).database
+        if database and database != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(database)), exist_ok=True)
+            logger.info(f"[DB] Using local SQLite database at {database}")
+
+        engine = create_engine(
+            url=self.db_url,
+            echo=echo,
+            connect_args={'check_same_thread': False},
+        )
+        event.listen(engine, 'connect', self._set_pragmas)
+        return engine
+
+    def _set_pragmas(self, dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in self.PRAGMAS:
+            cursor.execute(pragma)
+        cursor.close()
+
+    def insert(self, table):
+        return sqlite.insert(table)
@@ -1,3 +1,4 @@
+import datetime
 from dataclasses import dataclass, field
 
 from app.domain.enums import TimeFrame
@@ -12,3 +13,5 @@ class AnalyticsReport:
     non_productive_time: float
     productive_time_breakdown: list[ApplicationView] = field(default_factory=list)
     non_productive_time_breakdown: list[ApplicationView] = field(default_factory=list)
+    start_date: datetime.date | None = None  # None for all time
+    end_date: datetime.date | None = None
@@ -17,4 +17,5 @@ class TimeFrame(enum.Enum):
     TODAY = 1
     WEEK = 2
     MONTH = 3
-    ALL = 4
\ No newline at end of file
+    ALL = 4
+    CUSTOM = 5
\ No newline at end of file
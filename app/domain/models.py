@@ -116,6 +116,29 @@ class ScriptResponse(BaseModel):
         return f"ScriptResponse(app_type={self.app_type}, app_name={self.app_name}, tag={self.tag}"
 
 
+class Classification(BaseModel):
+    app_name: str
+    tag: str
+    is_productive: bool
+    classified_at: datetime
+
+    model_config = ConfigDict(
+        from_attributes=True
+    )
+
+
+class ReplicationBatch(BaseModel):
+    id: int
+    batch_id: str
+    kind: str
+    payload: str
+    created_at: datetime
+
+    model_config = ConfigDict(
+        from_attributes=True
+    )
+
+
 class ApplicationView(BaseModel):
     name: str
     is_productive: bool
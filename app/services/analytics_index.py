@@ -0,0 +1,124 @@
+import datetime
+import threading
+
+import numpy as np
+
+from app.domain.models import Application
+from app.utils.log import get_main_app_logger
+
+logger = get_main_app_logger(__name__)
+
+
+class AnalyticsIndex:
+    """
+    In-memory prefix sums of tracked time, answers any date range in O(apps)
+
+    Rows are the days that have tracked time (sorted ordinals), row i + 1 of the cumulative matrices holds the totals
+    of every day up to and including day i, per application and per productivity class. A range is the difference
+    of two rows found by binary search. The index is loaded once from the database at startup and then kept current
+    from the database writer's completed flushes and reconciliations, so it never re-reads the history
+    """
+    NON_PRODUCTIVE, PRODUCTIVE = 0, 1
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ordinals = np.empty(0, dtype=np.int64)
+        self._app_totals = np.zeros((1, 0), dtype=np.int64)
+        self._class_totals = np.zeros((1, 2), dtype=np.int64)
+        self._columns: dict[int, int] = {}  # application id -> column
+        self._applications: list[Application] = []
+        self.loaded = False
+
+    def load(self, history: list[tuple[datetime.date, Application, int]]):
+        """Builds the index from (date, application, seconds) rows, one per workday application"""
+        columns: dict[int, int] = {}
+        applications: list[Application] = []
+        for _, application, _ in history:
+            if application.id not in columns:
+                columns[application.id] = len(applications)
+                applications.append(application)
+
+        ordinals = np.array([date.toordinal() for date, _, _ in history], dtype=np.int64)
+        days, rows = np.unique(ordinals, return_inverse=True)
+        cols = np.array([columns[application.id] for _, application, _ in history], dtype=np.int64)
+        seconds = np.array([seconds for _, _, seconds in history], dtype=np.int64)
+        classes = np.array([application.is_productive for application in applications], dtype=np.int64)
+
+        app_totals = np.zeros((len(days) + 1, len(applications)), dtype=np.int64)
+        np.add.at(app_totals, (rows + 1, cols), seconds)
+        class_totals = np.zeros((len(days) + 1, 2), dtype=np.int64)
+        np.add.at(class_totals, (rows + 1, classes[cols] if len(cols) else cols), seconds)
+
+        with self._lock:
+            self._ordinals = days
+            self._app_totals = np.cumsum(app_totals, axis=0)
+            self._class_totals = np.cumsum(class_totals, axis=0)
+            self._columns = columns
+            self._applications = applications
+            self.loaded = True
+
+        logger.info(f"[ANALYTICS] Index loaded, {len(days)} days x {len(applications)} applications")
+
+    def add(self, date: datetime.date, applications: dict[Application, int]):
+        """Adds a committed flush, cheap when date is the latest day (the usual case)"""
+        with self._lock:
+            row = self._row_for(date.toordinal())
+            for application, seconds in applications.items():
+                if not seconds:
+                    continue
+                column = self._column_for(application)
+                self._app_totals[row:, column] += seconds
+                self._class_totals[row:, int(application.is_productive)] += seconds
+
+    def reassign(self, application: Application, reconciled_app: Application):
+        """Mirrors Database.reconcile_application, the provisional app's time moves to the reconciled app"""
+        with self._lock:
+            column = self._columns.pop(application.id, None)
+            if column is None:
+                return
+
+            moved = self._app_totals[:, column].copy()
+            if application.is_productive != reconciled_app.is_productive:
+                self._class_totals[:, int(application.is_productive)] -= moved
+                self._class_totals[:, int(reconciled_app.is_productive)] += moved
+
+            target = self._columns.get(reconciled_app.id)
+            if target is None:
+                self._columns[reconciled_app.id] = column
+                self._applications[column] = reconciled_app
+                return
+
+            # the provisional column stays behind empty, it is skipped when reporting
+            self._app_totals[:, target] += moved
+            self._app_totals[:, column] = 0
+
+    def totals_between(self, start: datetime.date | None, end: datetime.date) -> tuple[list[tuple[Application, int]], int, int]:
+        """Per-application seconds (largest first), productive and non-productive seconds for start..end inclusive"""
+        with self._lock:
+            lo = int(np.searchsorted(self._ordinals, start.toordinal(), side='left')) if start else 0
+            hi = int(np.searchsorted(self._ordinals, end.toordinal(), side='right'))
+            app_totals = self._app_totals[hi] - self._app_totals[lo]
+            class_totals = self._class_totals[hi] - self._class_totals[lo]
+            applications = list(self._applications)
+
+        order = np.argsort(-app_totals, kind='stable')
+        breakdown = [(applications[column], int(app_totals[column])) for column in order if app_totals[column] > 0]
+        return breakdown, int(class_totals[self.PRODUCTIVE]), int(class_totals[self.NON_PRODUCTIVE])
+
+    def _row_for(self, ordinal: int) -> int:
+        """Cumulative row that first includes ordinal, inserting the day if it has no time yet"""
+        position = int(np.searchsorted(self._ordinals, ordinal))
+        if position == len(self._ordinals) or self._ordinals[position] != ordinal:
+            self._ordinals = np.insert(self._ordinals, position, ordinal)
+            self._app_totals = np.insert(self._app_totals, position + 1, self._app_totals[position], axis=0)
+            self._class_totals = np.insert(self._class_totals, position + 1, self._class_totals[position], axis=0)
+        return position + 1
+
+    def _column_for(self, application: Application) -> int:
+        column = self._columns.get(application.id)
+        if column is None:
+            column = len(self._applications)
+            self._columns[application.id] = column
+            self._applications.append(application)
+            self._app_totals = np.hstack([self._app_totals, np.zeros((len(self._app_totals), 1), dtype=np.int64)])
+        return column
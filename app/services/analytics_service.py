@@ -1,12 +1,15 @@
 import datetime
 import uuid
 
-from PyQt6.QtCore import QObject, pyqtSignal, QThreadPool
+from PyQt6.QtCore import QObject, Qt, pyqtSignal, QThreadPool
 
 from app.db.database import Database
 from app.domain.analytics import TimeFrame, AnalyticsReport
 from app.domain.models import ApplicationView
 from app.domain.qt_worker import QTWorker
+from app.services.analytics_index import AnalyticsIndex
+from app.services.data_flush_service import DataFlushService
+from app.services.database_writer import DatabaseWriter
 from app.utils.log import get_main_app_logger
 
 logger = get_main_app_logger(__name__)
@@ -18,11 +21,29 @@ class AnalyticsService(QObject):
     generation_progress = pyqtSignal(int, str)  # progress_percent, request_id
     generation_finished = pyqtSignal(str)
 
-    def __init__(self, db: Database):
+    def __init__(
+            self,
+            db: Database,
+            index: AnalyticsIndex | None = None,
+            writer: DatabaseWriter | None = None,
+            data_flush_service: DataFlushService | None = None
+    ):
         super().__init__()
         self.db = db
+        self.index = index
+        self.writer = writer
+        self.data_flush_service = data_flush_service
         self.thread_pool = QThreadPool.globalInstance()
         self.active_workers = []
+
+        if self.index and writer:
+            # kept current from committed writes, the index must be loaded before the writer takes any work. Both run
+            # on the writer thread in write order, together with its queue update (see DatabaseWriter.read_consistent)
+            writer.flush_applied.connect(self.index.add, Qt.ConnectionType.DirectConnection)
+            writer.application_reconciled.connect(
+                lambda application, reconciled_app, _: self.index.reassign(application, reconciled_app),
+                Qt.ConnectionType.DirectConnection
+            )
         logger.debug("[INIT] AnalyticsService initialization complete")
 
     def disable(self):
@@ -33,10 +54,22 @@ class AnalyticsService(QObject):
             worker.signals.progress.disconnect()
         self.active_workers.clear()
 
-    def request_analytics_report(self, time_frame: TimeFrame, analytics_report_id: uuid.uuid4()):
+    def request_analytics_report(
+            self,
+            time_frame: TimeFrame,
+            analytics_report_id: uuid.uuid4(),
+            start_date: datetime.date | None = None,
+            end_date: datetime.date | None = None
+    ):
+        from_, to = self._date_range(time_frame, start_date, end_date)
+        index_totals, uncommitted = self._read_live_totals(from_, to)
         worker = QTWorker(
             self._generate_analytics_report,
-            time_frame=time_frame
+            time_frame=time_frame,
+            from_=from_,
+            to=to,
+            index_totals=index_totals,
+            uncommitted=uncommitted
         )
 
         # Connect worker signals to service methods
@@ -63,37 +96,85 @@ class AnalyticsService(QObject):
             self.active_workers.remove(worker)
         self.generation_finished.emit(analytics_report_id)
 
-    def _generate_analytics_report(self, time_frame: TimeFrame, progress_callback):
-        logger.debug(f"[ANALYTICS] Generating analytics report for time frame: {time_frame}")
-
-        from_ = datetime.date(2025, 5, 31)
+    @staticmethod
+    def _date_range(time_frame: TimeFrame, start_date: datetime.date | None, end_date: datetime.date | None):
+        today = datetime.date.today()
+        from_ = None  # all time
+        to = today
 
         if time_frame == TimeFrame.TODAY:
-            from_ = datetime.date.today()
+            from_ = today
         elif time_frame == TimeFrame.WEEK:
-            from_ = datetime.date.today() - datetime.timedelta(days=6)
+            from_ = today - datetime.timedelta(days=6)
         elif time_frame == TimeFrame.MONTH:
-            from_ = datetime.date.today() - datetime.timedelta(days=29)
+            from_ = today - datetime.timedelta(days=29)
+        elif time_frame == TimeFrame.CUSTOM:
+            from_, to = start_date, end_date
+        return from_, to
+
+    def _read_live_totals(self, from_: datetime.date | None, to: datetime.date):
+        """
+        Index totals for the range (None without a loaded index) and the credits not committed yet, as
+        [(date, {application: seconds})], read together on this (the GUI) thread
+
+        Time is flushed every few minutes, so recent totals also count what is pending in the flush service or
+        queued in the writer. Pending credits are only handed to the writer on this thread, and the writer updates
+        the index and its queue under one lock, so no credit is missed or counted twice
+        """
+        uncommitted = []
+        if self.data_flush_service:
+            pending_date, pending = self.data_flush_service.unflushed_credits()
+            if pending:
+                uncommitted.append((pending_date, pending))
+
+        def read(queued: list) -> tuple | None:
+            uncommitted.extend(queued)
+            return self.index.totals_between(from_, to) if self.index and self.index.loaded else None
+
+        if self.writer:
+            return self.writer.read_consistent(read), uncommitted
+        return read([]), uncommitted
+
+    def _generate_analytics_report(
+            self,
+            time_frame: TimeFrame,
+            progress_callback,
+            from_: datetime.date | None,
+            to: datetime.date,
+            index_totals: tuple | None = None,
+            uncommitted: list[tuple[datetime.date, dict]] = ()
+    ):
+        logger.debug(f"[ANALYTICS] Generating analytics report for time frame: {time_frame}")
 
-        total_productive = 0
-        total_non_productive = 0
         productive_apps = []
         non_productive_apps = []
 
-        aggregated_workday_applications = self.db.get_workday_application_totals_from(from_)
-
-        for workday_application in aggregated_workday_applications:
+        if index_totals is not None:
+            # two prefix lookups per application, any range costs the same
+            totals, total_productive, total_non_productive = index_totals
+            totals = [(application.name, application.is_productive, seconds) for application, seconds in totals]
+        else:
+            # both come from the rollup tables, so WEEK / MONTH / ALL cost about the same as TODAY. A queued flush
+            # committing before this read is briefly counted twice, only the index is read consistently
+            total_productive, total_non_productive = self.db.get_productivity_totals_between(from_, to)
+            totals = [tuple(row) for row in self.db.get_application_totals_between(from_, to)]
+
+        for date, applications in uncommitted:
+            if applications and (from_ is None or from_ <= date) and date <= to:
+                totals, total_productive, total_non_productive = self._add_unflushed(
+                    totals, total_productive, total_non_productive, applications
+                )
+
+        for name, is_productive, total_time in totals:
             application_view = ApplicationView(
-                name=workday_application.name,
-                is_productive=workday_application.is_productive,
-                elapsed_time=workday_application.total_time
+                name=name,
+                is_productive=is_productive,
+                elapsed_time=total_time
             )
 
-            if workday_application.is_productive:
-                total_productive += workday_application.total_time
+            if is_productive:
                 productive_apps.append(application_view)
             else:
-                total_non_productive += workday_application.total_time
                 non_productive_apps.append(application_view)
 
         for app_view in productive_apps:
@@ -108,9 +189,25 @@ class AnalyticsService(QObject):
             productive_time=total_productive,
             non_productive_time=total_non_productive,
             productive_time_breakdown=productive_apps,
-            non_productive_time_breakdown=non_productive_apps
+            non_productive_time_breakdown=non_productive_apps,
+            start_date=from_,
+            end_date=to
         )
 
         logger.debug(f"[ANALYTICS] Analytics report generation completed for time frame: {time_frame}")
 
         return analytics_report
+
+    @staticmethod
+    def _add_unflushed(totals: list[tuple], total_productive: int, total_non_productive: int, applications: dict):
+        merged = {(name, is_productive): seconds for name, is_productive, seconds in totals}
+        for application, seconds in applications.items():
+            key = (application.name, application.is_productive)
+            merged[key] = merged.get(key, 0) + seconds
+            if application.is_productive:
+                total_productive += seconds
+            else:
+                total_non_productive += seconds
+
+        totals = sorted(((name, is_productive, seconds) for (name, is_productive), seconds in merged.items() if seconds > 0), key=lambda row: -row[2])
+        return totals, total_productive, total_non_productive
@@ -0,0 +1,138 @@
+import threading
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from app.domain.models import ScriptResponse
+from app.utils.log import get_main_app_logger
+
+logger = get_main_app_logger(__name__)
+
+
+class ActivitySource(QThread):
+    """
+    Producer of foreground application records
+
+    Subclasses implement run() and hand every observed record to _publish(), consumers only
+    connect to new_script_response and never need to know whether the source polls or is pushed to
+    """
+    new_script_response = pyqtSignal(object)
+
+    def __init__(self):
+        super().__init__()
+        self.running = False
+        self.last_script_response = None
+        self._wake_event = threading.Event()
+
+    def start(self, *args, **kwargs):
+        self._wake_event.clear()
+        super().start(*args, **kwargs)
+
+    def stop(self):
+        self.running = False
+        self.last_script_response = None
+        self.requestInterruption()
+        self._wake_event.set()
+        self._on_stop()
+
+        if not self.wait(1000):  # Wait up to 1 second
+            logger.warning("Thread didn't stop gracefully, forcing termination")
+            self.terminate()
+            self.wait()
+
+    def run(self):
+        raise NotImplementedError("Method must be overridden")
+
+    def wake(self):
+        """Called when the user becomes active again, sources that back off should resume sampling promptly"""
+        pass
+
+    def _on_stop(self):
+        """Hook for subclasses to release anything run() may be blocked on"""
+        pass
+
+    def _should_run(self) -> bool:
+        return self.running and not self.isInterruptionRequested()
+
+    def _sleep(self, seconds: float):
+        """Sleep without periodic wakeups, returns early on stop() or wake()"""
+        if self._should_run() and self._wake_event.wait(seconds):
+            if self._should_run():
+                self._wake_event.clear()
+
+    def _publish(self, script_response: ScriptResponse) -> bool:
+        if script_response != self.last_script_response:
+            logger.debug(f"[TRACKING] New script response detected by {type(self).__name__}: {script_response}")
+            self.new_script_response.emit(script_response)
+            self.last_script_response = script_response
+            return True
+        return False
+
+    @staticmethod
+    def parse_script_output(output: str) -> ScriptResponse:
+        response = output.strip()
+        split_response = response.split(':', 2)
+
+        if len(split_response) < 2:
+            raise Exception(f"Bash script response error, split response < 2: {response}")
+
+        return ScriptResponse.from_arr(*split_response)
+
+
+class FileActivitySource(ActivitySource):
+    """
+    Replays `type:name:tag` records from a text file, for running the pipeline without a macOS probe
+
+    Each line may be prefixed with the number of seconds to wait before it is emitted, e.g.
+    `5 WEB:github.com:`, otherwise default_interval is used. Blank lines and lines starting with # are skipped
+    """
+
+    def __init__(self, path: str, default_interval: float = 2.0, loop: bool = False):
+        super().__init__()
+        self.path = path
+        self.default_interval = default_interval
+        self.loop = loop
+        logger.debug("[INIT] FileActivitySource initialization complete")
+
+    def run(self):
+        self.running = True
+        try:
+            records = self._load_records()
+        except OSError as e:
+            logger.error(f"[TRACKING] Unable to read activity file {self.path}: {e}")
+            return
+
+        while self._should_run():
+            for delay, record in records:
+                self._sleep(delay)
+                if not self._should_run():
+                    return
+                try:
+                    self._publish(self.parse_script_output(record))
+                except Exception as e:
+                    logger.error(f"[TRACKING] Invalid record in activity file {self.path}: {e}")
+
+            if not self.loop:
+                break
+
+        # hold the last record until stopped, like a user parked on one window
+        while self._should_run():
+            self._sleep(60)
+
+    def _load_records(self) -> list[tuple[float, str]]:
+        records = []
+        with open(self.path) as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith('#'):
+                    continue
+
+                delay = self.default_interval
+                head, _, rest = line.partition(' ')
+                if rest and ':' not in head:
+                    try:
+                        delay = float(head)
+                        line = rest.strip()
+                    except ValueError:
+                        pass
+                records.append((delay, line))
+        return records
@@ -1,76 +1,75 @@
 import subprocess
-
-from PyQt6.QtCore import QThread, pyqtSignal
+import time
 
 from app.domain.models import ScriptResponse
+from app.services.app_tracking.activity_source import ActivitySource
+from app.services.app_tracking.poll_scheduler import AdaptivePollScheduler
 from app.utils.log import get_main_app_logger
 from app.utils.resolve_path import get_script_path
 
 logger = get_main_app_logger(__name__)
 
+SCRIPT_TIMEOUT_SECONDS = 7
+METRICS_LOG_INTERVAL_SECONDS = 300
+
 
-class AppMonitorService(QThread):
-    new_script_response = pyqtSignal(object)
+class AppMonitorService(ActivitySource):
+    """Polling activity source, samples the foreground application on an adaptive interval"""
 
-    def __init__(self):
+    def __init__(self, scheduler: AdaptivePollScheduler = None):
         super().__init__()
-        self.running = False
         self.script_path = get_script_path('get_current_application.sh')
-        self.last_script_response = None
+        self.scheduler = scheduler or AdaptivePollScheduler()
 
-        logger.debug("[INIT] AppMonitorService initialization complete")
+        logger.debug(f"[INIT] {type(self).__name__} initialization complete")
 
-    def stop(self):
-        self.running = False
-        self.last_script_response = None
-        self.requestInterruption()
-
-        if not self.wait(1000):  # Wait up to 1 second
-            logger.warning("Thread didn't stop gracefully, forcing termination")
-            self.terminate()
-            self.wait()
+    def wake(self):
+        self.scheduler.wake()
+        self._wake_event.set()
 
     def run(self):
         self.running = True
-        while self.running and not self.isInterruptionRequested():
+        self.scheduler.wake()
+        last_metrics_log = time.monotonic()
+
+        while self._should_run():
             try:
-                script_response = self.get_active_app()
+                changed = self._publish(self.get_active_app())
+                interval = self.scheduler.record_poll(changed)
 
-                if script_response != self.last_script_response:
-                    logger.debug(f"[TRACKING] New script response detected by monitoring service: {script_response}")
-                    self.new_script_response.emit(script_response)
-                    self.last_script_response = script_response
+                if time.monotonic() - last_metrics_log >= METRICS_LOG_INTERVAL_SECONDS:
+                    self._log_poll_metrics()
+                    last_metrics_log = time.monotonic()
 
-                # Run on a 2-second interval
-                for _ in range(20):
-                    if not self.running or self.isInterruptionRequested():
-                        break
-                    self.msleep(100)
+                self._sleep(interval)
 
             except Exception as e:
                 logger.error(f"[TRACKING] Error while monitoring current application: {e}")
-                self.msleep(4000)
+                self._sleep(4)
 
-    def get_active_app(self):
+        self._log_poll_metrics()
+
+    def _log_poll_metrics(self):
+        metrics = self.scheduler.metrics()
+        logger.info(
+            f"[TRACKING] Poll metrics (interval: {metrics.current_interval:.1f}s, rate: {metrics.polls_per_minute:.1f}/min, "
+            f"changes: {metrics.changes_detected}, detection latency mean: {metrics.mean_detection_latency:.2f}s, "
+            f"max: {metrics.max_detection_latency:.2f}s)"
+        )
+
+    def get_active_app(self) -> ScriptResponse:
         """Get the currently active application using bash script"""
         try:
             # Run the bash script
             result = subprocess.run([self.script_path],
                                     capture_output=True,
                                     text=True,
-                                    timeout=7)
+                                    timeout=SCRIPT_TIMEOUT_SECONDS)
 
             if result.returncode != 0:
                 raise Exception(f"Script error, bash script returned status code: {result.returncode}")
 
-            # Process the output
-            response = result.stdout.strip()
-            split_response = response.split(':', 2)
-
-            if len(split_response) < 2:
-                raise Exception(f"Bash script response error, split response < 2: {response}")
-
-            return ScriptResponse.from_arr(*split_response)
+            return self.parse_script_output(result.stdout)
 
         except subprocess.TimeoutExpired as e:
             logger.error(f"Script timed out while running: {e}")
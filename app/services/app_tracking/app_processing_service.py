@@ -1,8 +1,12 @@
+import sys
+import traceback
+
 from PyQt6.QtCore import pyqtSlot, QRunnable, QObject, pyqtSignal
 
-from app.client.claude_client import AIClient
-from app.db.database import Database
+from app.db.application_catalog import ApplicationCatalog
 from app.domain.models import ScriptResponse, Application
+from app.services.app_tracking.classification_service import ClassificationService, PROVISIONAL_IS_PRODUCTIVE
+from app.services.app_tracking.reclassification_service import ReclassificationService
 from app.utils.log import get_main_app_logger
 
 logger = get_main_app_logger(__name__)
@@ -22,10 +26,17 @@ class AppProcessingService(QRunnable):
         result = pyqtSignal(object)
         progress = pyqtSignal(float)
 
-    def __init__(self, db: Database, ai_client: AIClient, script_response: ScriptResponse):
+    def __init__(
+            self,
+            catalog: ApplicationCatalog,
+            classification_service: ClassificationService,
+            script_response: ScriptResponse,
+            reclassification_service: ReclassificationService = None
+    ):
         super().__init__()
-        self.db = db
-        self.ai_client = ai_client
+        self.catalog = catalog
+        self.classification_service = classification_service
+        self.reclassification_service = reclassification_service
         self.script_response = script_response
         self.signals = self.Signals()
         self.tag_applications = {'youtube', 'reddit'}
@@ -39,64 +50,50 @@ class AppProcessingService(QRunnable):
         2. CASE 2: desktop app or web app in database, return
         3. CASE 3: new desktop app or web app, add to db workflow
         """
-        app = self.get_application(self.script_response.app_name)
-        if self.script_response.app_name in self.tag_applications and self.script_response.tag:
-            app = self.process_tag_workflow(self.script_response.app_name, self.script_response.tag)
-        elif not app:
-            app = self.process_new_application(self.script_response.app_type, self.script_response.app_name)
-
-        self.signals.result.emit(app)
+        try:
+            app = self.get_application(self.script_response.app_name)
+            if self.script_response.app_name in self.tag_applications and self.script_response.tag:
+                app = self.process_tag_workflow(self.script_response.app_name, self.script_response.tag)
+            elif not app:
+                app = self.process_new_application(self.script_response.app_type, self.script_response.app_name)
+        except Exception:
+            logger.error(f"[PROCESSING] Failed to process {self.script_response}: {traceback.format_exc()}")
+            exctype, value = sys.exc_info()[:2]
+            self.signals.error.emit((exctype, value, traceback.format_exc()))
+        else:
+            self.signals.result.emit(app)
+        finally:
+            self.signals.finished.emit()
 
     def get_application(self, app_name: str) -> Application:
-        return self.db.get_application(app_name)
+        return self.catalog.get_application(app_name)
 
     def get_or_create_application(self, app_name: str, is_productive: bool = False) -> Application:
-        return self.db.get_or_create_application(app_name, is_productive)
+        return self.catalog.get_or_create_application(app_name, is_productive)
 
 
     def process_new_application(self, app_type: str, app_name: str) -> Application:
         if app_type == 'APP':
             is_productive = True
+        elif self.reclassification_service:
+            # never wait on the network here, unknown web apps are tracked provisionally and reconciled later
+            is_productive = self.classification_service.classify_web_app_offline(app_name)
         else:
-            claude_inquiry = self.format_web_app_inquiry(app_name)
-            response = self.ai_client.send_message(claude_inquiry)
-            is_productive = (response == 'True' or response == 'true')
+            is_productive = self.classification_service.classify_web_app(app_name)
 
         logger.info(f"[PROCESSING] Application '{app_name}' encountered for the first time. Creating entry in the database.")
 
-        return self.db.create_application(app_name, is_productive)
+        if is_productive is not None:
+            return self.catalog.create_application(app_name, is_productive)
+
+        app = self.catalog.create_application(app_name, PROVISIONAL_IS_PRODUCTIVE)
+        self.reclassification_service.enqueue(app)
+        return app
 
-    def process_tag_workflow(self, app_name: str, msg: str) -> Application:
+    def process_tag_workflow(self, app_name: str, tag: str) -> Application:
         """
         tag workflows -> any workflows where intervention via AI client is needed to determine productivity
         example: youtube videos, subreddits, etc
         """
-        formatted_msg = ''
-
-        if app_name == 'youtube':
-            formatted_msg = self.format_yt_video_inquiry(msg)
-        elif app_name == 'reddit':
-            formatted_msg = self.format_subreddit_inquiry(msg)
-        else:
-            logger.error(f"[PROCESSING] App name not valid for tag workflow: {app_name}")
-
-        is_productive = self.ai_client.send_message(formatted_msg).lower() == 'true'
+        is_productive = self.classification_service.classify_tag(app_name, tag)
         return self.get_or_create_application(app_name, is_productive)
-
-    def format_web_app_inquiry(self, app_name: str):
-        return (
-                f"Is this web application likely to be productive or non-productive content? " +
-                f"Answer with exactly one word, either 'True' for productive or 'False' for non-productive: {app_name}"
-        )
-
-    def format_yt_video_inquiry(self, yt_video_title: str):
-        return (
-                f"Is this YouTube video title likely to be productive or non-productive content? " +
-                f"Answer with exactly one word, either 'True' for productive or 'False' for non-productive: {yt_video_title}"
-        )
-
-    def format_subreddit_inquiry(self, subreddit_name: str):
-        return (
-                f"Is this subreddit likely to be productive or non-productive content? " +
-                f"Answer with exactly one word, either 'True' for productive or 'False' for non-productive: {subreddit_name}"
-        )
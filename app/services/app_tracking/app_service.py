@@ -1,10 +1,16 @@
+import itertools
+from concurrent.futures import Future
+
 from PyQt6.QtCore import QObject, pyqtSignal, QThreadPool
 
-from app.client.claude_client import AIClient
-from app.db.database import Database
+from app.db.application_catalog import ApplicationCatalog
 from app.domain.models import ScriptResponse, Application
-from app.services.app_tracking.app_monitor_service import AppMonitorService
+from app.services.app_tracking.activity_source import ActivitySource
 from app.services.app_tracking.app_processing_service import AppProcessingService
+from app.services.app_tracking.classification_service import ClassificationService
+from app.services.app_tracking.reclassification_service import ReclassificationService
+from app.services.app_tracking.single_flight import SingleFlight
+from app.services.app_tracking.switch_debouncer import SwitchDebouncer
 from app.utils.log import get_main_app_logger
 
 logger = get_main_app_logger(__name__)
@@ -13,48 +19,122 @@ DEFAULT_POMODORO_TIME = 600
 
 
 class AppService(QObject):
-    current_application_changed = pyqtSignal(object, object)  # old app, new app
-
-    def __init__(self, db: Database, ai_client: AIClient):
+    current_application_changed = pyqtSignal(object, object, float)  # old app, new app, switched_at (time.monotonic)
+    application_reclassified = pyqtSignal(object, object, int)  # provisional app, reconciled app, seconds to move today
+
+    def __init__(
+            self,
+            catalog: ApplicationCatalog,
+            classification_service: ClassificationService,
+            activity_source: ActivitySource,
+            switch_debouncer: SwitchDebouncer = None,
+            lookup_concurrency: int = 4,
+            reclassification_service: ReclassificationService = None
+    ):
         super().__init__()
-        self.db = db
-        self.ai_client = ai_client
-
-        self.app_monitor = AppMonitorService()
-        self.threadpool = QThreadPool.globalInstance()
+        self.catalog = catalog
+        self.classification_service = classification_service
+        self.reclassification_service = reclassification_service
+
+        self.activity_source = activity_source
+        self.switch_debouncer = switch_debouncer or SwitchDebouncer()
+        # lookups get their own pool so slow AI calls never starve analytics on the global one
+        self.threadpool = QThreadPool()
+        self.threadpool.setMaxThreadCount(lookup_concurrency)
+        self.single_flight = SingleFlight()
         self.current_application = None
 
+        # resolutions run in parallel but are committed in switch order, older results that arrive late are dropped
+        self._sequence = itertools.count(1)
+        self._committed_sequence = 0
+        self.superseded_results = 0
+        # provisional app id -> reconciled app, for resolutions that were in flight when it was reconciled
+        self._reconciled: dict[int, Application] = {}
+
         self.connect_slots_to_signals()
 
         logger.debug("[INIT] AppService initialization complete")
 
     def enable(self):
-        self.app_monitor.start()
-        logger.debug("[TRACKING] App monitor enabled")
+        self.activity_source.start()
+        if self.reclassification_service:
+            self.reclassification_service.enable()
+        logger.debug(f"[TRACKING] Activity source enabled ({type(self.activity_source).__name__})")
 
     def disable(self):
-        self.app_monitor.stop()
-        logger.debug("[TRACKING] App monitor disabled")
+        self.activity_source.stop()
+        if self.reclassification_service:
+            self.reclassification_service.disable()
+        self.switch_debouncer.reset()
+        self.classification_service.log_stats()
+        logger.info(f"[TRACKING] Dropped {self.superseded_results} superseded app resolutions")
+        logger.debug("[TRACKING] Activity source disabled")
+
+    def wake(self):
+        """Samples the active application right away instead of at the source's next (possibly backed off) poll"""
+        self.activity_source.wake()
 
     def connect_slots_to_signals(self):
-        self.app_monitor.new_script_response.connect(self._handle_new_script_response)
+        self.activity_source.new_script_response.connect(self.switch_debouncer.submit)
+        self.switch_debouncer.script_response_committed.connect(self._handle_new_script_response)
+        if self.reclassification_service:
+            self.reclassification_service.application_reclassified.connect(self._handle_reclassification)
 
     def get_current_application(self):
         return self.current_application
 
-    def _handle_new_script_response(self, script_response: ScriptResponse):
+    def _handle_new_script_response(self, script_response: ScriptResponse, switched_at: float):
+        sequence = next(self._sequence)
+        key = (script_response.app_name, script_response.tag or '')
+        future, is_leader = self.single_flight.join(key)
+        future.add_done_callback(lambda f: self._handle_resolution(f, sequence, switched_at))
+
+        if not is_leader:
+            logger.debug(f"[TRACKING] Resolution already in flight for application: {script_response.app_name}, sharing its result")
+            return
+
         logger.debug(f"[TRACKING] Received new script response for application: {script_response.app_name}, spinning up App Processing Service")
-        worker = AppProcessingService(self.db, self.ai_client, script_response)
-        worker.signals.result.connect(self._handle_app_change)
+        worker = AppProcessingService(self.catalog, self.classification_service, script_response, self.reclassification_service)
+        worker.signals.result.connect(lambda new_app: self._settle(key, lambda: self.single_flight.resolve(key, new_app)))
+        worker.signals.error.connect(lambda error: self._settle(key, lambda: self.single_flight.fail(key, error[1])))
         self.threadpool.start(worker)
 
-    def _handle_app_change(self, new_app: Application):
+    def _settle(self, key, settle_future):
+        settle_future()  # runs every waiter's _handle_resolution
+        if not self.single_flight.in_flight():
+            # later lookups read the catalog, which already holds the reconciled apps
+            self._reconciled.clear()
+
+    def _handle_resolution(self, future: Future, sequence: int, switched_at: float):
+        # settled from the result/error slots, so this runs on the main thread
+        if future.exception():
+            logger.error(f"[TRACKING] Failed to resolve application (sequence: {sequence}): {future.exception()}")
+            return
+
+        if sequence < self._committed_sequence:
+            self.superseded_results += 1
+            logger.debug(f"[TRACKING] Dropping resolution {sequence}, switch {self._committed_sequence} is already committed")
+            return
+        self._committed_sequence = sequence
+
+        # every waiter gets its own copy, elapsed time is tracked per instance
+        new_app = self._reconciled.get(future.result().id, future.result())
+        self._handle_app_change(new_app.model_copy(), switched_at)
+
+    def _handle_app_change(self, new_app: Application, switched_at: float):
         logger.debug(f"[TRACKING] Received new application from App Processing Service for script")
-        self.current_application_changed.emit(self.current_application, new_app)
+        old_app = self.current_application
         self.current_application = new_app
+        # switched_at is when focus actually moved, lookup latency and the debounce dwell are backdated by accounting
+        self.current_application_changed.emit(old_app, new_app, switched_at)
+
+    def _handle_reclassification(self, old_app: Application, new_app: Application, moved_today: int):
+        if self.single_flight.in_flight():
+            # a lookup that read the catalog before the switch-over may still resolve to old_app
+            self._reconciled[old_app.id] = new_app
+
+        if self.current_application == old_app:
+            self.current_application = new_app.model_copy(update={'elapsed_time': self.current_application.elapsed_time})
+            logger.debug(f"[TRACKING] Current application '{new_app.name}' reconciled to productive: {new_app.is_productive}")
 
-    def increment_application_time(self, elapsed_time: int) -> int:
-        if not self.current_application:
-            logger.error(f"[SYNC] Cannot increment application time b/c current application is not set")
-        self.current_application.elapsed_time += elapsed_time
-        return self.current_application.elapsed_time
+        self.application_reclassified.emit(old_app, new_app, moved_today)
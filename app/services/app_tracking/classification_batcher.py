@@ -0,0 +1,177 @@
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Callable
+
+from app.client.claude_client import AIClient, AIUnavailableError
+from app.utils.log import get_main_app_logger
+
+logger = get_main_app_logger(__name__)
+
+
+@dataclass
+class BatchStats:
+    items: int = 0
+    requests: int = 0
+    fallbacks: int = 0  # items a batch failed to answer, classified one by one
+
+    @property
+    def requests_saved(self) -> int:
+        return self.items - self.requests
+
+
+class ClassificationBatcher:
+    """
+    Gathers unknown web app names over a short window and classifies them with a single structured request
+
+    classify() blocks the calling worker until its batch is answered. A batch is sent once max_batch_size names are
+    waiting or max_wait seconds after the first one arrived. Names the model leaves out or answers with something
+    unusable, or every name of a malformed batch, are classified one at a time through fallback, all of them within
+    fallback_timeout seconds, names still left after it fail with AIUnavailableError (provisional classification)
+    """
+
+    def __init__(
+            self,
+            ai_client: AIClient,
+            fallback: Callable[[str], bool],
+            max_batch_size: int = 20,
+            max_wait: float = 0.5,
+            fallback_timeout: float = 10.0
+    ):
+        self.ai_client = ai_client
+        self.fallback = fallback
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait
+        self.fallback_timeout = fallback_timeout
+        self.stats = BatchStats()
+        self._stats_lock = threading.Lock()  # batches are sent from timer and worker threads
+
+        self._lock = threading.Lock()
+        self._pending: OrderedDict[str, Future] = OrderedDict()
+        self._timer: threading.Timer | None = None
+
+    def classify(self, app_name: str) -> bool:
+        return self.submit(app_name).result()
+
+    def submit(self, app_name: str) -> Future:
+        with self._lock:
+            future = self._pending.get(app_name)
+            if future is not None:
+                return future
+
+            future = Future()
+            self._pending[app_name] = future
+
+            if len(self._pending) >= self.max_batch_size:
+                batch = self._take_batch()
+            else:
+                batch = None
+                if self._timer is None:
+                    self._timer = threading.Timer(self.max_wait, self._flush_on_timer)
+                    self._timer.daemon = True
+                    self._timer.start()
+
+        if batch:
+            threading.Thread(target=self._send_batch, args=(batch,), daemon=True).start()
+        return future
+
+    def _take_batch(self) -> OrderedDict[str, Future]:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, OrderedDict()
+        return batch
+
+    def _flush_on_timer(self):
+        with self._lock:
+            self._timer = None
+            batch = self._take_batch()
+        if batch:
+            self._send_batch(batch)
+
+    def _send_batch(self, batch: OrderedDict[str, Future]):
+        names = list(batch)
+        with self._stats_lock:
+            self.stats.items += len(names)
+
+        if len(names) == 1:
+            self._classify_individually(batch)
+            return
+
+        logger.info(f"[PROCESSING] Classifying {len(names)} web applications in a single batch request")
+        with self._stats_lock:
+            self.stats.requests += 1
+        try:
+            response = self.ai_client.send_message(self.format_batch_inquiry(names), max_tokens=20 + 15 * len(names))
+        except Exception as e:
+            logger.error(f"[PROCESSING] Batch classification request failed: {e}")
+            for future in batch.values():
+                future.set_exception(e)
+            return
+
+        results = self.parse_batch_response(response, names)
+        if results is None:
+            logger.warning(f"[PROCESSING] Malformed batch classification response, falling back to per-item requests: {response!r}")
+            results = {}
+
+        missing = OrderedDict()
+        for name, future in batch.items():
+            if name in results:
+                future.set_result(results[name])
+            else:
+                missing[name] = future
+
+        if missing:
+            with self._stats_lock:
+                self.stats.fallbacks += len(missing)
+            self._classify_individually(missing)
+
+    def _classify_individually(self, batch: OrderedDict[str, Future]):
+        deadline = time.monotonic() + self.fallback_timeout
+        for name, future in batch.items():
+            if time.monotonic() >= deadline:
+                # the callers are blocked on these, they get a provisional classification and a later retry instead
+                future.set_exception(AIUnavailableError(f"Per-item classification exceeded its {self.fallback_timeout}s deadline"))
+                continue
+
+            with self._stats_lock:
+                self.stats.requests += 1
+            try:
+                future.set_result(self.fallback(name))
+            except Exception as e:
+                future.set_exception(e)
+
+    @staticmethod
+    def format_batch_inquiry(names: list[str]) -> str:
+        return (
+                f"For each web application below, decide whether it is likely to be productive or non-productive content. " +
+                f"Respond with only a JSON object that maps every name, exactly as given, to true for productive " +
+                f"or false for non-productive: {json.dumps(names)}"
+        )
+
+    @staticmethod
+    def parse_batch_response(response: str, names: list[str]) -> dict[str, bool] | None:
+        match = re.search(r'\{.*\}', response, re.DOTALL)
+        if not match:
+            return None
+
+        try:
+            parsed = json.loads(match.group(0))
+        except json.JSONDecodeError:
+            return None
+        if not isinstance(parsed, dict):
+            return None
+
+        normalized = {str(key).strip().lower(): value for key, value in parsed.items()}
+        results = {}
+        for name in names:
+            value = normalized.get(name.lower())
+            if isinstance(value, str):
+                value = {'true': True, 'false': False}.get(value.strip().lower())
+            if isinstance(value, bool):
+                results[name] = value
+        return results
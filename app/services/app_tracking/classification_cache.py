@@ -0,0 +1,102 @@
+import datetime
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from app.db.database import Database
+from app.domain.models import Classification
+from app.utils.log import get_main_app_logger
+
+logger = get_main_app_logger(__name__)
+
+MAX_TAG_LENGTH = 512
+
+
+@dataclass
+class CacheStats:
+    memory_hits: int = 0
+    db_hits: int = 0
+    misses: int = 0
+    expired: int = 0
+
+
+class ClassificationCache:
+    """
+    Persistent cache of tag workflow classifications keyed by (app_name, normalized tag)
+
+    Lookups go through an in-memory LRU first, then the classification_cache table. Entries older than ttl are
+    reported as misses so they get re-verified by the AI client, which then overwrites them
+    """
+
+    def __init__(self, db: Database, max_size: int = 2048, ttl: datetime.timedelta = datetime.timedelta(days=30)):
+        self.db = db
+        self.max_size = max_size
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._stats_lock = threading.Lock()  # lookups run on the resolution pool threads
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple[str, str], Classification] = OrderedDict()
+
+    @staticmethod
+    def normalize_tag(tag: str) -> str:
+        tag = unicodedata.normalize('NFKC', tag).casefold()
+        tag = re.sub(r'^\(\d+\)\s*', '', tag.strip())  # unread notification counters, e.g. "(3) video title"
+        tag = re.sub(r'\s+', ' ', tag)
+        return tag[:MAX_TAG_LENGTH]
+
+    def get(self, app_name: str, tag: str) -> bool | None:
+        key = (app_name, self.normalize_tag(tag))
+
+        with self._lock:
+            classification = self._entries.get(key)
+            if classification:
+                self._entries.move_to_end(key)
+
+        if classification:
+            with self._stats_lock:
+                self.stats.memory_hits += 1
+        else:
+            classification = self.db.get_classification(*key)
+            if not classification:
+                with self._stats_lock:
+                    self.stats.misses += 1
+                return None
+            with self._stats_lock:
+                self.stats.db_hits += 1
+            self._remember(key, classification)
+
+        if datetime.datetime.now() - classification.classified_at > self.ttl:
+            with self._stats_lock:
+                self.stats.expired += 1
+            return None
+
+        return classification.is_productive
+
+    def all(self) -> list[Classification]:
+        """Every stored classification, expired ones included, e.g. to train the title classifier"""
+        return self.db.get_classifications()
+
+    def put(self, app_name: str, tag: str, is_productive: bool):
+        key = (app_name, self.normalize_tag(tag))
+        classification = Classification(
+            app_name=key[0],
+            tag=key[1],
+            is_productive=is_productive,
+            classified_at=datetime.datetime.now()
+        )
+
+        try:
+            self.db.save_classification(classification)
+        except Exception as e:
+            logger.error(f"[CACHE] Failed to persist classification for {key}: {e}")
+
+        self._remember(key, classification)
+
+    def _remember(self, key: tuple[str, str], classification: Classification):
+        with self._lock:
+            self._entries[key] = classification
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
@@ -0,0 +1,156 @@
+from concurrent.futures import Future
+
+from app.client.claude_client import AIClient, AIUnavailableError
+from app.services.app_tracking.classification_batcher import ClassificationBatcher
+from app.services.app_tracking.classification_cache import ClassificationCache
+from app.services.app_tracking.rule_classifier import RuleClassifier
+from app.services.app_tracking.title_classifier import TitleClassifier
+from app.utils.log import get_main_app_logger
+
+logger = get_main_app_logger(__name__)
+
+# used when the AI client is unavailable, tracking goes on instead of waiting for the API to recover
+PROVISIONAL_IS_PRODUCTIVE = False
+
+
+class ClassificationService:
+    """Decides whether web apps and tag workflow content (youtube videos, subreddits) are productive"""
+
+    def __init__(
+            self,
+            ai_client: AIClient,
+            cache: ClassificationCache,
+            rules: RuleClassifier = None,
+            batch_size: int = 20,
+            batch_wait: float = 0.5,
+            title_classifier: TitleClassifier = None,
+            batch_fallback_timeout: float = 10.0
+    ):
+        self.ai_client = ai_client
+        self.cache = cache
+        self.rules = rules or RuleClassifier()
+        self.title_classifier = title_classifier
+        self.batcher = ClassificationBatcher(ai_client, self._classify_web_app_directly, batch_size, batch_wait, batch_fallback_timeout)
+
+        logger.debug("[INIT] ClassificationService initialization complete")
+
+    def classify_web_app(self, app_name: str) -> bool:
+        is_productive = self.rules.classify('web', app_name)
+        if is_productive is not None:
+            return is_productive
+
+        try:
+            return self.batcher.classify(app_name)
+        except AIUnavailableError as e:
+            logger.warning(f"[PROCESSING] {e}, using provisional classification for {app_name}")
+            return PROVISIONAL_IS_PRODUCTIVE
+
+    def classify_web_app_offline(self, app_name: str) -> bool | None:
+        """Classifies from local rules only, None means the app has to be queued for the AI client"""
+        return self.rules.classify('web', app_name)
+
+    def submit_web_app(self, app_name: str) -> Future:
+        return self.batcher.submit(app_name)
+
+    def _classify_web_app_directly(self, app_name: str) -> bool:
+        response = self.ai_client.send_message(self.format_web_app_inquiry(app_name))
+        return self.parse_response(response)
+
+    def classify_tag(self, app_name: str, tag: str) -> bool:
+        text = self._rule_input(app_name, tag)
+        is_productive = self.rules.classify(app_name, text)
+        if is_productive is not None:
+            return is_productive
+
+        is_productive = self.cache.get(app_name, tag)
+        if is_productive is not None:
+            logger.debug(f"[PROCESSING] Classification cache hit for {app_name} tag: {tag}")
+            return is_productive
+
+        if self.title_classifier:
+            is_productive = self.title_classifier.predict(app_name, text)
+            if is_productive is not None:
+                return is_productive
+
+        if app_name == 'youtube':
+            formatted_msg = self.format_yt_video_inquiry(tag)
+        elif app_name == 'reddit':
+            formatted_msg = self.format_subreddit_inquiry(tag)
+        else:
+            raise ValueError(f"App name not valid for tag workflow: {app_name}")
+
+        try:
+            is_productive = self.parse_response(self.ai_client.send_message(formatted_msg))
+        except AIUnavailableError as e:
+            logger.warning(f"[PROCESSING] {e}, using provisional classification for {app_name} tag: {tag}")
+            return PROVISIONAL_IS_PRODUCTIVE
+
+        self.cache.put(app_name, tag, is_productive)
+        if self.title_classifier:
+            self.title_classifier.learn(app_name, text, is_productive)
+        return is_productive
+
+    def train_title_classifier(self):
+        if not self.title_classifier:
+            return
+
+        try:
+            classifications = self.cache.all()
+        except Exception as e:
+            logger.error(f"[PROCESSING] Failed to load classifications for the title classifier: {e}")
+            return
+
+        self.title_classifier.fit([
+            (c.app_name, self._rule_input(c.app_name, c.tag), c.is_productive)
+            for c in classifications
+        ])
+
+    def log_stats(self):
+        stats = self.cache.stats
+        logger.info(
+            f"[PROCESSING] Classification cache stats (memory hits: {stats.memory_hits}, db hits: {stats.db_hits}, "
+            f"misses: {stats.misses}, expired: {stats.expired})"
+        )
+        batch_stats = self.batcher.stats
+        logger.info(
+            f"[PROCESSING] Classification batch stats (items: {batch_stats.items}, requests: {batch_stats.requests}, "
+            f"requests saved: {batch_stats.requests_saved}, fallbacks: {batch_stats.fallbacks})"
+        )
+        top_rules = ', '.join(f"{rule_id}: {hits}" for rule_id, hits in self.rules.top_hits(10))
+        logger.info(f"[PROCESSING] Classification rules saved {self.rules.calls_saved()} AI calls ({top_rules or 'no hits'})")
+        if self.title_classifier:
+            model_stats = self.title_classifier.stats
+            logger.info(
+                f"[PROCESSING] Title classifier stats (AI calls saved: {model_stats.answered}, "
+                f"accuracy: {model_stats.accuracy:.1%} over {model_stats.shadow_checks} AI answers, "
+                f"confident accuracy: {model_stats.confident_accuracy:.1%} over {model_stats.confident_checks}, "
+                f"trained on: {model_stats.trained})"
+            )
+
+    def _rule_input(self, app_name: str, tag: str) -> str:
+        text = self.cache.normalize_tag(tag)
+        if app_name == 'reddit':
+            text = text.removeprefix('r/')
+        return text
+
+    @staticmethod
+    def parse_response(response: str) -> bool:
+        return response.strip().lower() == 'true'
+
+    def format_web_app_inquiry(self, app_name: str):
+        return (
+                f"Is this web application likely to be productive or non-productive content? " +
+                f"Answer with exactly one word, either 'True' for productive or 'False' for non-productive: {app_name}"
+        )
+
+    def format_yt_video_inquiry(self, yt_video_title: str):
+        return (
+                f"Is this YouTube video title likely to be productive or non-productive content? " +
+                f"Answer with exactly one word, either 'True' for productive or 'False' for non-productive: {yt_video_title}"
+        )
+
+    def format_subreddit_inquiry(self, subreddit_name: str):
+        return (
+                f"Is this subreddit likely to be productive or non-productive content? " +
+                f"Answer with exactly one word, either 'True' for productive or 'False' for non-productive: {subreddit_name}"
+        )
@@ -0,0 +1,92 @@
+import re
+import subprocess
+import threading
+from abc import ABC, abstractmethod
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from app.utils.log import get_main_app_logger
+
+logger = get_main_app_logger(__name__)
+
+PROBE_TIMEOUT_SECONDS = 2
+
+
+class IdleProbe(ABC):
+    """Reports how long the user hasn't touched any input device"""
+
+    @abstractmethod
+    def idle_seconds(self) -> float:
+        pass
+
+
+class HIDIdleProbe(IdleProbe):
+    """Reads HIDIdleTime (nanoseconds since the last keyboard / mouse / trackpad event) from the IOHIDSystem registry"""
+    COMMAND = ['ioreg', '-c', 'IOHIDSystem', '-d', '4', '-k', 'HIDIdleTime']
+    PATTERN = re.compile(r'"HIDIdleTime"\s*=\s*(\d+)')
+
+    def idle_seconds(self) -> float:
+        result = subprocess.run(self.COMMAND, capture_output=True, text=True, timeout=PROBE_TIMEOUT_SECONDS)
+        match = self.PATTERN.search(result.stdout)
+        if result.returncode != 0 or not match:
+            raise RuntimeError(f"ioreg returned no HIDIdleTime (status code: {result.returncode})")
+        return int(match.group(1)) / 1_000_000_000
+
+
+class IdleMonitor(QThread):
+    """
+    Watches input idle time and reports when the user leaves and comes back
+
+    While the user is active the probe is only sampled when the threshold could next be crossed (threshold minus
+    the idle time just read), so an active user costs a handful of probes per threshold. Once idle it samples every
+    resume_interval seconds so tracking resumes promptly on the first input. idle_started carries how long input
+    had already been idle, the time since then should not be credited
+    """
+    idle_started = pyqtSignal(float)  # seconds since the last input
+    activity_resumed = pyqtSignal()
+
+    def __init__(self, probe: IdleProbe, threshold: float = 300.0, resume_interval: float = 1.0, min_interval: float = 5.0):
+        super().__init__()
+        self.probe = probe
+        self.threshold = threshold
+        self.resume_interval = resume_interval
+        self.min_interval = min_interval
+
+        self.running = False
+        self.is_idle = False
+        self.idle_seconds = 0.0
+        self._stop_event = threading.Event()
+
+        logger.debug("[INIT] IdleMonitor initialization complete")
+
+    def start(self, *args, **kwargs):
+        self.running = True
+        self._stop_event.clear()
+        super().start(*args, **kwargs)
+
+    def stop(self):
+        self.running = False
+        self._stop_event.set()
+        if not self.wait(PROBE_TIMEOUT_SECONDS * 1000 + 1000):
+            logger.warning("[IDLE] Idle monitor thread didn't stop gracefully")
+        self.is_idle = False
+
+    def run(self):
+        while self.running:
+            try:
+                self.idle_seconds = self.probe.idle_seconds()
+            except Exception as e:
+                logger.warning(f"[IDLE] Idle probe unavailable, idle detection disabled: {e}")
+                return
+
+            if not self.is_idle and self.idle_seconds >= self.threshold:
+                self.is_idle = True
+                logger.info(f"[IDLE] No input for {self.idle_seconds:.0f}s, user is idle")
+                self.idle_started.emit(self.idle_seconds)
+            elif self.is_idle and self.idle_seconds < self.threshold:
+                self.is_idle = False
+                logger.info("[IDLE] Input detected, user is active again")
+                self.activity_resumed.emit()
+
+            delay = self.resume_interval if self.is_idle else max(self.min_interval, self.threshold - self.idle_seconds)
+            self._stop_event.wait(delay)
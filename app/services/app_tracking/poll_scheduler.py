@@ -0,0 +1,91 @@
+import time
+from collections import deque
+from dataclasses import dataclass
+
+from app.utils.log import get_main_app_logger
+
+logger = get_main_app_logger(__name__)
+
+
+@dataclass
+class PollMetrics:
+    current_interval: float
+    polls_per_minute: float
+    changes_detected: int
+    mean_detection_latency: float  # estimated seconds between a switch and its detection
+    max_detection_latency: float
+
+
+class AdaptivePollScheduler:
+    """
+    Decides how long the poller sleeps between samples
+
+    Polls at min_interval for fast_window seconds after a switch, then backs off exponentially while nothing
+    changes, up to max_interval. wake() snaps back to fast polling, e.g. when the user returns from idle
+    """
+
+    def __init__(
+            self,
+            min_interval: float = 1.0,
+            max_interval: float = 10.0,
+            backoff: float = 1.5,
+            fast_window: float = 10.0,
+            metrics_window: float = 60.0
+    ):
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+        self.backoff = max(1.0, backoff)
+        self.fast_window = fast_window
+        self.metrics_window = metrics_window
+
+        self.interval = min_interval
+        self.last_change_at = time.monotonic()
+        self.last_poll_at: float | None = None
+
+        self._poll_times: deque[float] = deque()
+        self._changes_detected = 0
+        self._latency_total = 0.0
+        self._latency_max = 0.0
+
+    def record_poll(self, changed: bool, now: float | None = None) -> float:
+        """Record the outcome of a poll and return the number of seconds to sleep before the next one"""
+        now = time.monotonic() if now is None else now
+
+        if changed and self.last_poll_at is not None:
+            # the switch happened somewhere between the previous sample and this one
+            gap = now - self.last_poll_at
+            self._changes_detected += 1
+            self._latency_total += gap / 2
+            self._latency_max = max(self._latency_max, gap)
+
+        self.last_poll_at = now
+        self._poll_times.append(now)
+        while self._poll_times and now - self._poll_times[0] > self.metrics_window:
+            self._poll_times.popleft()
+
+        if changed:
+            self.last_change_at = now
+            self.interval = self.min_interval
+        elif now - self.last_change_at >= self.fast_window:
+            self.interval = min(self.max_interval, self.interval * self.backoff)
+
+        return self.interval
+
+    def wake(self, now: float | None = None):
+        now = time.monotonic() if now is None else now
+        self.last_change_at = now
+        self.interval = self.min_interval
+
+    def metrics(self) -> PollMetrics:
+        polls_per_minute = 0.0
+        if len(self._poll_times) > 1:
+            span = self._poll_times[-1] - self._poll_times[0]
+            polls_per_minute = (len(self._poll_times) - 1) / span * 60 if span > 0 else 0.0
+
+        return PollMetrics(
+            current_interval=self.interval,
+            polls_per_minute=polls_per_minute,
+            changes_detected=self._changes_detected,
+            mean_detection_latency=self._latency_total / self._changes_detected if self._changes_detected else 0.0,
+            max_detection_latency=self._latency_max
+        )
@@ -0,0 +1,118 @@
+import threading
+from concurrent.futures import Future
+
+from PyQt6.QtCore import QObject, pyqtSignal, QTimer
+
+from app.db.application_catalog import ApplicationCatalog
+from app.db.database import Database
+from app.domain.models import Application
+from app.services.app_tracking.classification_service import ClassificationService
+from app.services.database_writer import DatabaseWriter
+from app.utils.log import get_main_app_logger
+
+logger = get_main_app_logger(__name__)
+
+
+class ReclassificationService(QObject):
+    """
+    Resolves provisional web app classifications in the background
+
+    New web apps that no local rule recognises are tracked straight away under a provisional classification and
+    queued in the pending_classification table. The real classification is requested through the batcher, and once
+    it arrives the application is reconciled through the database writer, in order with the flushes, and the
+    catalog and in-memory apps are switched over once it committed. Failed requests stay queued and are retried
+    every retry_interval seconds, and anything still queued at startup is picked up again
+    """
+    application_reclassified = pyqtSignal(object, object, int)  # provisional app, reconciled app, seconds moved today
+    _classification_settled = pyqtSignal(object, object)  # provisional app, settled future
+
+    def __init__(
+            self,
+            db: Database,
+            catalog: ApplicationCatalog,
+            classification_service: ClassificationService,
+            writer: DatabaseWriter,
+            retry_interval: float = 300.0
+    ):
+        super().__init__()
+        self.db = db
+        self.catalog = catalog
+        self.classification_service = classification_service
+        self.writer = writer
+        self.retry_interval = retry_interval
+        self.reconciled = 0
+
+        self._lock = threading.Lock()
+        self._in_flight: set[int] = set()
+        self.retry_timer = QTimer()
+
+        self._classification_settled.connect(self._handle_classification)
+        self.writer.application_reconciled.connect(self._handle_reconciled)
+        self.writer.reconcile_failed.connect(self._handle_reconcile_failed)
+        self.retry_timer.timeout.connect(self.resume)
+
+        logger.debug("[INIT] ReclassificationService initialization complete")
+
+    def enable(self):
+        self.resume()
+        self.retry_timer.start(int(self.retry_interval * 1000))
+
+    def disable(self):
+        self.retry_timer.stop()
+        logger.info(f"[PROCESSING] Reconciled {self.reconciled} provisionally classified applications")
+
+    def enqueue(self, application: Application):
+        """Called from processing workers right after a provisional application is created"""
+        self.db.queue_pending_classification(application.id)
+        logger.info(f"[PROCESSING] '{application.name}' tracked provisionally (productive: {application.is_productive}), real classification queued")
+        self._submit(application)
+
+    def resume(self):
+        pending = self.db.get_pending_classifications()
+        if pending:
+            logger.info(f"[PROCESSING] Requesting classifications for {len(pending)} provisional applications")
+        for application in pending:
+            self._submit(application)
+
+    def _submit(self, application: Application):
+        with self._lock:
+            if application.id in self._in_flight:
+                return
+            self._in_flight.add(application.id)
+
+        future = self.classification_service.submit_web_app(application.name)
+        future.add_done_callback(lambda f: self._classification_settled.emit(application, f))
+
+    def _handle_classification(self, application: Application, future: Future):
+        if future.exception():
+            self._release(application)
+            logger.warning(f"[PROCESSING] Classification for '{application.name}' still unavailable, will retry: {future.exception()}")
+            return
+
+        is_productive = future.result()
+        if is_productive == application.is_productive:
+            self.db.delete_pending_classification(application.id)
+            self._release(application)
+            logger.debug(f"[PROCESSING] Provisional classification confirmed for '{application.name}'")
+            return
+
+        # stays in flight until the writer reports back, so a retry can't queue a second reconciliation
+        self.writer.submit_reconcile(application, is_productive)
+
+    def _release(self, application: Application):
+        with self._lock:
+            self._in_flight.discard(application.id)
+
+    def _handle_reconciled(self, application: Application, reconciled_app: Application, moved_today: int):
+        self._release(application)
+        self.catalog.replace_application(application, reconciled_app)
+        self.reconciled += 1
+        logger.info(
+            f"[PROCESSING] Reconciled '{application.name}' to productive: {reconciled_app.is_productive} "
+            f"(app id {application.id} -> {reconciled_app.id}, {moved_today}s moved today)"
+        )
+        self.application_reclassified.emit(application, reconciled_app, moved_today)
+
+    def _handle_reconcile_failed(self, application: Application, error: str):
+        self._release(application)
+        logger.warning(f"[PROCESSING] Reconciliation of '{application.name}' will be retried: {error}")
@@ -0,0 +1,130 @@
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+
+import yaml
+
+from app.utils.log import get_main_app_logger
+
+logger = get_main_app_logger(__name__)
+
+RULE_KINDS = ('exact', 'suffixes', 'keywords', 'regexes')
+LABELS = {'productive': True, 'non_productive': False}
+
+
+@dataclass
+class CompiledScope:
+    exact: dict[str, tuple[bool, str]] = field(default_factory=dict)
+    suffixes: dict[str, tuple[bool, str]] = field(default_factory=dict)
+    pattern: re.Pattern | None = None  # keywords and regexes combined into one alternation
+    groups: dict[str, tuple[bool, str]] = field(default_factory=dict)
+
+
+class RuleClassifier:
+    """
+    Local classifier that answers obvious cases without calling the AI client
+
+    Rules are grouped by scope ('web' for web app names, 'youtube' / 'reddit' for tag workflows) and compiled once:
+    exact names into a dict, suffixes into a dict probed at every label boundary of the input, and keywords plus
+    regexes into a single combined pattern. Precedence is exact, then suffix, then pattern. hits counts how many
+    AI calls each rule saved
+    """
+
+    def __init__(self, rules: dict | None = None):
+        self.scopes: dict[str, CompiledScope] = {}
+        self.hits: Counter[str] = Counter()
+        self._hits_lock = threading.Lock()  # rules are matched on the resolution pool threads
+        self.rule_count = 0
+
+        for scope, scope_rules in (rules or {}).items():
+            self.scopes[scope] = self._compile_scope(scope, scope_rules or {})
+
+    @classmethod
+    def from_file(cls, path: str) -> 'RuleClassifier':
+        try:
+            with open(path) as f:
+                rules = yaml.safe_load(f) or {}
+        except OSError as e:
+            logger.warning(f"[PROCESSING] Classification rules not loaded ({e}), every lookup will go to the AI client")
+            return cls()
+
+        classifier = cls(rules)
+        logger.info(f"[PROCESSING] Compiled {classifier.rule_count} classification rules from {path}")
+        return classifier
+
+    def classify(self, scope: str, text: str) -> bool | None:
+        compiled = self.scopes.get(scope)
+        if compiled is None or not text:
+            return None
+
+        text = text.strip().lower()
+        match = compiled.exact.get(text) or self._match_suffix(compiled, text) or self._match_pattern(compiled, text)
+        if match is None:
+            return None
+
+        is_productive, rule_id = match
+        with self._hits_lock:
+            self.hits[rule_id] += 1
+        logger.debug(f"[PROCESSING] Rule {rule_id} classified '{text}' as productive: {is_productive}")
+        return is_productive
+
+    def calls_saved(self) -> int:
+        with self._hits_lock:
+            return sum(self.hits.values())
+
+    def top_hits(self, n: int) -> list[tuple[str, int]]:
+        with self._hits_lock:
+            return self.hits.most_common(n)
+
+    @staticmethod
+    def _match_suffix(compiled: CompiledScope, text: str) -> tuple[bool, str] | None:
+        if not compiled.suffixes:
+            return None
+
+        candidate = text
+        while True:
+            match = compiled.suffixes.get(candidate)
+            if match:
+                return match
+            _, dot, candidate = candidate.partition('.')
+            if not dot:
+                return None
+
+    @staticmethod
+    def _match_pattern(compiled: CompiledScope, text: str) -> tuple[bool, str] | None:
+        if compiled.pattern is None:
+            return None
+        m = compiled.pattern.search(text)
+        return compiled.groups[m.lastgroup] if m else None
+
+    def _compile_scope(self, scope: str, scope_rules: dict) -> CompiledScope:
+        compiled = CompiledScope()
+        alternatives = []
+
+        for label, is_productive in LABELS.items():
+            label_rules = scope_rules.get(label) or {}
+            for kind in RULE_KINDS:
+                for rule in label_rules.get(kind) or []:
+                    rule = str(rule).strip().lower()
+                    rule_id = f"{scope}.{label}.{kind}:{rule}"
+                    self.rule_count += 1
+
+                    if kind == 'exact':
+                        compiled.exact.setdefault(rule, (is_productive, rule_id))
+                    elif kind == 'suffixes':
+                        compiled.suffixes.setdefault(rule.lstrip('.'), (is_productive, rule_id))
+                    else:
+                        expression = rf"\b{re.escape(rule)}\b" if kind == 'keywords' else rule
+                        try:
+                            re.compile(expression)
+                        except re.error as e:
+                            logger.error(f"[PROCESSING] Skipping invalid classification rule {rule_id}: {e}")
+                            continue
+                        group = f"r{len(alternatives)}"
+                        compiled.groups[group] = (is_productive, rule_id)
+                        alternatives.append(f"(?P<{group}>{expression})")
+
+        if alternatives:
+            compiled.pattern = re.compile('|'.join(alternatives))
+        return compiled
@@ -0,0 +1,41 @@
+import threading
+from concurrent.futures import Future
+from typing import Hashable
+
+
+class SingleFlight:
+    """
+    Collapses concurrent work for the same key into one call
+
+    The first caller for a key becomes the leader and does the work, every caller that joins while it is in flight
+    gets the same future, which the leader settles with resolve() or fail()
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, Future] = {}
+
+    def join(self, key: Hashable) -> tuple[Future, bool]:
+        """Returns the shared future for key and whether the caller is the leader"""
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                return future, False
+
+            future = Future()
+            self._calls[key] = future
+            return future, True
+
+    def resolve(self, key: Hashable, result):
+        self._pop(key).set_result(result)
+
+    def fail(self, key: Hashable, exception: BaseException):
+        self._pop(key).set_exception(exception)
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+    def _pop(self, key: Hashable) -> Future:
+        with self._lock:
+            return self._calls.pop(key)
@@ -0,0 +1,91 @@
+import time
+from dataclasses import dataclass
+
+from PyQt6.QtCore import QObject, pyqtSignal, QTimer
+
+from app.domain.models import ScriptResponse
+from app.utils.log import get_main_app_logger
+
+logger = get_main_app_logger(__name__)
+
+DEFAULT_SWITCH_DWELL_MS = 1500
+
+
+@dataclass
+class DebounceStats:
+    received: int = 0
+    committed: int = 0
+    dropped: int = 0  # transient switches that never reached the processing pipeline
+    transient_seconds: float = 0.0
+
+
+class SwitchDebouncer(QObject):
+    """
+    Coalescing stage between the activity source and app processing
+
+    A new script response is held as a candidate until it has stayed in focus for dwell_ms, switches that are
+    replaced before then are dropped. Seconds spent on dropped switches stay with the committed application,
+    a committed switch is reported with the monotonic time it was first observed, so accounting can backdate it
+    """
+    script_response_committed = pyqtSignal(object, float)  # script response, switched_at (time.monotonic)
+
+    def __init__(self, dwell_ms: int = DEFAULT_SWITCH_DWELL_MS):
+        super().__init__()
+        self.dwell_ms = dwell_ms
+        self.stats = DebounceStats()
+
+        self.committed: ScriptResponse | None = None
+        self.candidate: ScriptResponse | None = None
+        self.candidate_since = 0.0
+
+        self.dwell_timer = QTimer()
+        self.dwell_timer.setSingleShot(True)
+        self.dwell_timer.timeout.connect(self._commit_candidate)
+
+        logger.debug("[INIT] SwitchDebouncer initialization complete")
+
+    def submit(self, script_response: ScriptResponse):
+        self.stats.received += 1
+        now = time.monotonic()
+
+        if self.committed is None or self.dwell_ms <= 0:
+            self._commit(script_response, now)
+            return
+
+        if self.candidate is not None:
+            self._drop_candidate(now)
+
+        if script_response == self.committed:
+            # flapped back before the dwell expired, nothing changed
+            return
+
+        self.candidate = script_response
+        self.candidate_since = now
+        self.dwell_timer.start(self.dwell_ms)
+
+    def reset(self):
+        self.dwell_timer.stop()
+        self.committed = None
+        self.candidate = None
+        logger.info(
+            f"[TRACKING] Switch debouncer stats (received: {self.stats.received}, committed: {self.stats.committed}, "
+            f"pipeline runs saved: {self.stats.dropped}, transient time: {self.stats.transient_seconds:.1f}s)"
+        )
+
+    def _drop_candidate(self, now: float):
+        self.dwell_timer.stop()
+        self.stats.dropped += 1
+        self.stats.transient_seconds += now - self.candidate_since
+        logger.debug(f"[TRACKING] Dropping transient switch to {self.candidate.app_name} after {now - self.candidate_since:.2f}s")
+        self.candidate = None
+
+    def _commit_candidate(self):
+        if self.candidate is None:
+            return
+        candidate, self.candidate = self.candidate, None
+        self._commit(candidate, self.candidate_since)
+
+    def _commit(self, script_response: ScriptResponse, switched_at: float):
+        self.committed = script_response
+        self.stats.committed += 1
+        self.script_response_committed.emit(script_response, switched_at)
@@ -0,0 +1,163 @@
+import threading
+from dataclasses import dataclass
+
+import numpy as np
+
+from app.utils.log import get_main_app_logger
+
+logger = get_main_app_logger(__name__)
+
+HASH_MULTIPLIER = np.uint64(0x100000001B3)
+HASH_MIX_SHIFT = np.uint64(29)
+
+
+@dataclass
+class TitleClassifierStats:
+    answered: int = 0  # confident predictions returned instead of calling the AI client
+    shadow_checks: int = 0  # AI answers the model also scored
+    shadow_correct: int = 0
+    confident_checks: int = 0  # shadow checks where the model was above the threshold
+    confident_correct: int = 0
+    trained: int = 0
+
+    @property
+    def accuracy(self) -> float:
+        return self.shadow_correct / self.shadow_checks if self.shadow_checks else 0.0
+
+    @property
+    def confident_accuracy(self) -> float:
+        return self.confident_correct / self.confident_checks if self.confident_checks else 0.0
+
+
+class HashedNgramModel:
+    """
+    Logistic regression over hashed character n-grams
+
+    Text is turned into code points once, every n-gram is hashed with a vectorized rolling hash into n_features
+    buckets, and the score is a single gather and sum over the weight vector. Updates are plain SGD steps, so the
+    model can keep learning one label at a time
+    """
+
+    def __init__(self, n_features: int = 2 ** 18, ngram_range: tuple[int, int] = (2, 4), learning_rate: float = 0.5):
+        self.n_features = n_features
+        self.ngram_range = ngram_range
+        self.learning_rate = learning_rate
+        self.weights = np.zeros(n_features, dtype=np.float64)
+        self.bias = 0.0
+        self.samples = 0  # distinct labels seen, maintained by the owner since fit() revisits samples
+
+    def features(self, text: str) -> np.ndarray:
+        codes = np.frombuffer(f" {text} ".encode('utf-32-le'), dtype=np.uint32).astype(np.uint64)
+        indices = []
+        for n in range(self.ngram_range[0], self.ngram_range[1] + 1):
+            count = len(codes) - n + 1
+            if count <= 0:
+                break
+            hashes = np.full(count, n, dtype=np.uint64)
+            for offset in range(n):
+                hashes = hashes * HASH_MULTIPLIER + codes[offset:offset + count]
+            hashes ^= hashes >> HASH_MIX_SHIFT
+            indices.append(hashes % np.uint64(self.n_features))
+        return np.concatenate(indices).astype(np.intp) if indices else np.empty(0, dtype=np.intp)
+
+    def predict_proba(self, indices: np.ndarray) -> float:
+        if not len(indices):
+            return 0.5
+        score = self.bias + self.weights[indices].sum() / np.sqrt(len(indices))
+        return float(1.0 / (1.0 + np.exp(-score)))
+
+    def partial_fit(self, indices: np.ndarray, label: bool):
+        if not len(indices):
+            return
+        scale = 1.0 / np.sqrt(len(indices))
+        gradient = self.predict_proba(indices) - float(label)
+        np.add.at(self.weights, indices, -self.learning_rate * gradient * scale)
+        self.bias -= self.learning_rate * gradient * 0.1
+
+
+class TitleClassifier:
+    """
+    Offline classifier for tag workflow content (youtube titles, subreddit names), one model per app
+
+    Trained from the classifications the AI client already produced and kept learning from every new answer.
+    predict() only answers once a model has seen min_samples labels and its confidence reaches the threshold,
+    everything else still goes to the AI client. Every AI answer is also scored by the model to track its accuracy;
+    in shadow mode the model never answers and is only evaluated
+    """
+
+    def __init__(
+            self,
+            confidence_threshold: float = 0.9,
+            min_samples: int = 50,
+            shadow: bool = False,
+            n_features: int = 2 ** 18
+    ):
+        self.confidence_threshold = confidence_threshold
+        self.min_samples = min_samples
+        self.shadow = shadow
+        self.n_features = n_features
+        self.stats = TitleClassifierStats()
+        self._stats_lock = threading.Lock()  # predictions and answers arrive from the resolution pool threads
+
+        self._lock = threading.Lock()
+        self._models: dict[str, HashedNgramModel] = {}
+
+    def fit(self, samples: list[tuple[str, str, bool]], epochs: int = 3):
+        """samples are (app_name, text, is_productive) triples"""
+        with self._lock:
+            encoded = [(self._model(app_name), self._model(app_name).features(text), label) for app_name, text, label in samples]
+            order = np.arange(len(encoded))
+            rng = np.random.default_rng(0)
+            for _ in range(epochs):
+                rng.shuffle(order)
+                for i in order:
+                    model, indices, label = encoded[i]
+                    model.partial_fit(indices, label)
+            for model, _, _ in encoded:
+                model.samples += 1
+        with self._stats_lock:
+            self.stats.trained += len(samples)
+
+        logger.info(f"[PROCESSING] Title classifier trained on {len(samples)} labels ({', '.join(self._models) or 'no models'})")
+
+    def predict(self, app_name: str, text: str) -> bool | None:
+        confidence, is_productive = self._score(app_name, text)
+        if self.shadow or confidence < self.confidence_threshold:
+            return None
+
+        with self._stats_lock:
+            self.stats.answered += 1
+        logger.debug(f"[PROCESSING] Title classifier answered {app_name} tag: {text} (productive: {is_productive}, confidence: {confidence:.2f})")
+        return is_productive
+
+    def learn(self, app_name: str, text: str, is_productive: bool):
+        confidence, predicted = self._score(app_name, text)
+        if confidence:
+            with self._stats_lock:
+                self.stats.shadow_checks += 1
+                self.stats.shadow_correct += predicted == is_productive
+                if confidence >= self.confidence_threshold:
+                    self.stats.confident_checks += 1
+                    self.stats.confident_correct += predicted == is_productive
+
+        with self._lock:
+            model = self._model(app_name)
+            model.partial_fit(model.features(text), is_productive)
+            model.samples += 1
+        with self._stats_lock:
+            self.stats.trained += 1
+
+    def _score(self, app_name: str, text: str) -> tuple[float, bool]:
+        """Returns (confidence, is_productive), confidence is 0 while the model is not ready"""
+        with self._lock:
+            model = self._models.get(app_name)
+            if model is None or model.samples < self.min_samples:
+                return 0.0, False
+            probability = model.predict_proba(model.features(text))
+        return max(probability, 1.0 - probability), probability >= 0.5
+
+    def _model(self, app_name: str) -> HashedNgramModel:
+        model = self._models.get(app_name)
+        if model is None:
+            model = self._models[app_name] = HashedNgramModel(self.n_features)
+        return model
@@ -1,9 +1,12 @@
+import datetime
 from collections import defaultdict
 
-from PyQt6.QtCore import QObject, QTimer
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
 
 from app.db.database import Database
+from app.db.flush_journal import FlushJournal
 from app.domain.models import Application, Workday, WorkdayApplication
+from app.services.database_writer import DatabaseWriter
 from app.utils.log import get_main_app_logger
 
 logger = get_main_app_logger(__name__)
@@ -12,67 +15,162 @@ DEFAULT_POMODORO_TIME = 600
 
 
 class DataFlushService(QObject):
-    def __init__(self, db: Database):
+    """
+    Accumulates time credits per application and writes them to the database every flush_interval seconds
+
+    Credits are recorded as they accrue (the current app included), and with a journal every credit is also
+    appended to it first, so the flush interval only bounds database write load, not what a crash can lose.
+    Each flush stores the journal sequence it covers in the same transaction, anything after it is replayed by
+    recover() at startup. With a writer the flush itself runs on the database writer thread, the journal is
+    trimmed once it reports the write committed
+    """
+    flush_failed = pyqtSignal(str)  # the writer keeps retrying, the credits are safe in the journal meanwhile
+    writes_settled = pyqtSignal()  # every submitted flush has been committed
+
+    def __init__(self, db: Database, journal: FlushJournal = None, flush_interval: float = 60.0, writer: DatabaseWriter = None):
         super().__init__()
         self.db = db
+        self.journal = journal
+        self.writer = writer
+        self.flush_interval = flush_interval
         self.workday = None
         self.pending_applications_to_flush: defaultdict[Application, int] = defaultdict(int)
 
         self.flush_timer = QTimer()
+        # fsyncs the journal tail when no further credit arrives to trigger the grouped sync in append
+        self.journal_sync_timer = QTimer()
+        self.connect_slots_to_signals()
         logger.debug("[INIT] DataFlushService initialization complete")
 
     def connect_slots_to_signals(self):
         self.flush_timer.timeout.connect(self._handle_flush_to_db)
+        if self.journal:
+            self.journal_sync_timer.timeout.connect(self.journal.sync)
+        if self.writer:
+            self.writer.flush_completed.connect(self._on_flush_completed)
+            self.writer.flush_failed.connect(self.flush_failed)
+            self.writer.drained.connect(self.writes_settled)
 
     def enable(self, workday: Workday = None):
         if workday:
             self.workday = workday
-        self.flush_timer.start(60000)
+        self.flush_timer.start(int(self.flush_interval * 1000))
+        if self.journal and self.journal.sync_interval > 0:
+            self.journal_sync_timer.start(int(self.journal.sync_interval * 1000))
 
     def disable(self):
         self.flush_timer.stop()
+        self.journal_sync_timer.stop()
+        if self.journal:
+            self.journal.sync()
+
+    def unflushed_credits(self) -> tuple[datetime.date | None, dict[Application, int]]:
+        """Date and per-application seconds credited but not handed to the database yet, a copy"""
+        if self.workday is None:
+            return None, {}
+        return self.workday.date, {app: seconds for app, seconds in self.pending_applications_to_flush.items() if seconds}
+
+    def set_workday(self, workday: Workday):
+        """Credits from now on belong to workday, e.g. after midnight, earlier ones must have been flushed already"""
+        self.workday = workday
+
+    def recover(self):
+        """Replays journal credits a crash kept from reaching the database"""
+        if not self.journal:
+            return
+
+        checkpoint = self.db.get_journal_checkpoint()
+        credits = self.journal.read(after=checkpoint)
+        if credits:
+            totals: defaultdict[tuple, int] = defaultdict(int)
+            for credit in credits:
+                totals[(credit.date, credit.app_name, credit.is_productive)] += credit.seconds
+
+            self.db.apply_journal_credits(
+                [(*key, seconds) for key, seconds in totals.items() if seconds],
+                credits[-1].sequence
+            )
+            logger.info(f"[FLUSH] Replayed {len(credits)} journal credits ({sum(totals.values())}s) left by an unclean shutdown")
+            checkpoint = credits[-1].sequence
+
+        self.journal.checkpoint(checkpoint)
 
-    def force_flush(self, application: Application, reactivate: bool):
+    def force_flush(self, reactivate: bool):
+        """Hands everything credited so far to the database, never waits for the write (see writes_pending)"""
         logger.info(f"[FLUSH] Processing request to force flush data to database")
         self.flush_timer.stop()
-        if application:
-            self.pending_applications_to_flush[application] += application.elapsed_time
-            application.elapsed_time = 0
         self._handle_flush_to_db()
-
         self.flush_timer.start() if reactivate else None
 
-    def add_app_to_next_flush(self, application: Application):
-        self.pending_applications_to_flush[application] += application.elapsed_time
-        logger.debug(f"[FLUSH] {application.name} has been added to the next flush (time: {application.elapsed_time})")
+    def writes_pending(self) -> bool:
+        """Whether a submitted flush is still being written, writes_settled is emitted once it has"""
+        return self.writer is not None and not self.writer.is_idle()
+
+    def credit(self, application: Application, seconds: int):
+        """Adds tracked (or, when negative, withdrawn) time to the next flush"""
+        if not seconds:
+            return
+        if self.journal:
+            self.journal.append(self.workday.date, application.name, application.is_productive, seconds)
+        self.pending_applications_to_flush[application] += seconds
+
+    def reassign_application(self, old_app: Application, new_app: Application) -> int:
+        """
+        Moves unflushed time of a reconciled application to its new row, returns the seconds moved, including
+        those the writer re-pointed in flushes submitted after the reconciliation committed
+        """
+        duration = self.pending_applications_to_flush.pop(old_app, 0)
+        if duration:
+            if self.journal:
+                self.journal.append(self.workday.date, old_app.name, old_app.is_productive, -duration)
+                self.journal.append(self.workday.date, new_app.name, new_app.is_productive, duration)
+            self.pending_applications_to_flush[new_app] += duration
+        if self.writer:
+            duration += self.writer.release_reassignment(old_app)
+        return duration
 
     def _handle_flush_to_db(self):
         logger.info(f"[FLUSH] Flushing workday and {len(self.pending_applications_to_flush)} application records to db")
+        if self.writer:
+            self._submit_to_writer()
+            return
+
         try:
-            self.db.update_workday(self.workday)
             self._flush_applications_to_db()
             self.pending_applications_to_flush.clear()
             logger.debug("[FLUSH] Successfully flushed data to database")
         except Exception as e:
             logger.error(f"[FLUSH] Failed to flush data to database: {str(e)}")
 
-    def _flush_applications_to_db(self):
-        if not self.pending_applications_to_flush:
-            return
+    def _submit_to_writer(self):
+        journal_sequence = self.journal.sequence if self.journal else None
+        if self.writer.submit_flush(self.workday, self.pending_applications_to_flush, journal_sequence):
+            self.pending_applications_to_flush = defaultdict(int)
+        else:
+            logger.warning("[FLUSH] Flush deferred, the database writer is backed up")
+
+    def _on_flush_completed(self, journal_sequence: int | None, merged: int):
+        if self.journal and journal_sequence is not None:
+            self.journal.checkpoint(journal_sequence)
+        logger.debug(f"[FLUSH] Successfully flushed data to database (journal sequence: {journal_sequence})")
 
+    def _flush_applications_to_db(self):
         try:
             workday_applications = [
                 WorkdayApplication(
                     workday_id=self.workday.id,
                     application_id=app.id,
                     time_seconds=duration
-                ) for app, duration in self.pending_applications_to_flush.items()
+                ) for app, duration in self.pending_applications_to_flush.items() if duration
             ]
 
             for wa in workday_applications:
                 logger.debug(f"[FLUSH] workday_id={wa.workday_id}, app_name={wa.application_id}, time={wa.time_seconds}s")
 
-            self.db.bulk_save_workday_applications(workday_applications)
+            journal_sequence = self.journal.sequence if self.journal else None
+            self.db.save_flush(self.workday, workday_applications, journal_sequence)
+            if self.journal:
+                self.journal.checkpoint(journal_sequence)
         except Exception as e:
             logger.error(f"[FLUSH] Failed to save workday applications: {str(e)}")
             raise
@@ -0,0 +1,281 @@
+import datetime
+import threading
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from typing import Callable
+
+from PyQt6.QtCore import QThread, pyqtSignal
+from sqlalchemy.exc import OperationalError
+
+from app.db.database import Database
+from app.domain.models import Application, Workday, WorkdayApplication
+from app.utils.log import get_main_app_logger
+
+logger = get_main_app_logger(__name__)
+
+
+@dataclass
+class FlushBatch:
+    workday: Workday
+    applications: defaultdict[Application, int] = field(default_factory=lambda: defaultdict(int))
+    journal_sequence: int | None = None
+    merged: int = 1
+    attempts: int = 0  # failed writes so far, a batch that failed once is never merged into
+
+
+@dataclass
+class ReconcileJob:
+    application: Application
+    is_productive: bool
+
+
+class DatabaseWriter(QThread):
+    """
+    Single writer thread for tracking data, the GUI thread only hands it work
+
+    Jobs are applied strictly in submission order. A flush batch submitted while the previous one is still queued
+    for the same workday is merged into it, so a slow database means fewer, larger writes rather than a growing
+    queue. Once max_pending jobs are waiting submit_flush refuses more work (backpressure), the caller keeps its
+    credits and offers them again at the next flush. Failed jobs stay at the head of the queue and are retried
+    with exponential backoff while the database is unavailable (OperationalError, the credits are safe in the
+    journal meanwhile). A batch that fails max_attempts times for any other reason is split into one write per
+    application, and a single-application write that still fails is dropped (dead-lettered) so the rest of the
+    queue can move on. Reconciliations go through the same queue so they are ordered with the flushes that
+    reference the provisional application, queued batches are re-pointed once one completes and batches submitted
+    later are re-pointed on submission (a failed reconciliation is dropped, its pending classification is retried
+    later)
+    """
+    flush_completed = pyqtSignal(object, int)  # journal sequence covered (or None), batches merged into the write
+    # flush_applied and application_reconciled are emitted while the job queue is locked, together with the queue
+    # update, so directly connected slots see them in write order and read_consistent() never sees a write twice
+    # (or not at all). Such slots must not call back into the writer
+    flush_applied = pyqtSignal(object, object)  # workday date, {application: seconds} committed
+    flush_failed = pyqtSignal(str)
+    drained = pyqtSignal()  # the last queued job has been applied
+    application_reconciled = pyqtSignal(object, object, int)  # provisional app, reconciled app, seconds moved today
+    reconcile_failed = pyqtSignal(object, str)
+
+    def __init__(
+            self,
+            db: Database,
+            max_pending: int = 16,
+            max_attempts: int = 5,
+            initial_backoff: float = 1.0,
+            max_backoff: float = 60.0
+    ):
+        super().__init__()
+        self.db = db
+        self.max_pending = max_pending
+        self.max_attempts = max_attempts
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.running = False
+        self.last_committed_sequence = None
+        self.writes = 0
+        self.merges = 0
+        self.dead_lettered = 0
+
+        self._condition = threading.Condition()
+        self._jobs: deque[FlushBatch | ReconcileJob] = deque()
+        self._busy = False
+        self._reassigned: dict[int, Application] = {}  # provisional app id -> reconciled app
+        self._repointed_today: dict[int, int] = {}  # provisional app id -> today's seconds re-pointed on submission
+
+        logger.debug("[INIT] DatabaseWriter initialization complete")
+
+    def start(self, *args, **kwargs):
+        self.running = True
+        super().start(*args, **kwargs)
+
+    def stop(self, timeout: float = 10.0):
+        self.drain(timeout)
+        with self._condition:
+            self.running = False
+            self._condition.notify_all()
+        self.wait(int(timeout * 1000))
+        logger.info(f"[FLUSH] Database writer stopped ({self.writes} writes, {self.merges} merged batches, {len(self._jobs)} jobs left)")
+
+    def drain(self, timeout: float = 10.0) -> bool:
+        """Blocks until every submitted job has been written, e.g. before shutdown"""
+        with self._condition:
+            return self._condition.wait_for(lambda: not self._jobs and not self._busy, timeout)
+
+    def is_idle(self) -> bool:
+        with self._condition:
+            return not self._jobs and not self._busy
+
+    def submit_flush(self, workday: Workday, applications: dict[Application, int], journal_sequence: int | None) -> bool:
+        with self._condition:
+            last = self._jobs[-1] if self._jobs else None
+            mergeable = (
+                isinstance(last, FlushBatch) and last.workday.id == workday.id and not last.attempts
+                and not (self._busy and len(self._jobs) == 1)
+            )
+
+            if not mergeable and len(self._jobs) >= self.max_pending:
+                logger.warning(f"[FLUSH] Database writer is {len(self._jobs)} jobs behind, holding flush back")
+                return False
+
+            if mergeable:
+                batch = last
+                batch.workday = workday
+                batch.merged += 1
+                self.merges += 1
+            else:
+                batch = FlushBatch(workday)
+                self._jobs.append(batch)
+
+            for application, seconds in applications.items():
+                reconciled_app = self._reassigned.get(application.id)
+                if reconciled_app is None:
+                    batch.applications[application] += seconds
+                    continue
+                # reconciled after these credits accrued, application_reconciled hasn't reached the caller yet
+                batch.applications[reconciled_app] += seconds
+                if workday.date == datetime.date.today():
+                    self._repointed_today[application.id] = self._repointed_today.get(application.id, 0) + seconds
+            if journal_sequence is not None:
+                batch.journal_sequence = journal_sequence
+
+            self._condition.notify_all()
+            return True
+
+    def submit_reconcile(self, application: Application, is_productive: bool):
+        with self._condition:
+            self._jobs.append(ReconcileJob(application, is_productive))
+            self._condition.notify_all()
+
+    def read_consistent(self, read: Callable[[list[tuple[datetime.date, dict[Application, int]]]], object]):
+        """
+        Calls read with the (date, {application: seconds}) credits of every flush not committed yet, no write
+        completes meanwhile, so state kept current from flush_applied (the analytics index) read inside it matches
+        """
+        with self._condition:
+            return read([(job.workday.date, dict(job.applications)) for job in self._jobs if isinstance(job, FlushBatch)])
+
+    def release_reassignment(self, application: Application) -> int:
+        """
+        Forgets the mapping of a reconciled provisional application, called once the caller re-pointed its own
+        credits so no later flush can reference it. Returns today's seconds submit_flush re-pointed after
+        application_reconciled was emitted, which its seconds moved today doesn't include
+        """
+        with self._condition:
+            self._reassigned.pop(application.id, None)
+            return self._repointed_today.pop(application.id, 0)
+
+    def run(self):
+        backoff = self.initial_backoff
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._jobs or not self.running)
+                if not self._jobs:
+                    return
+                job = self._jobs[0]
+                self._busy = True
+
+            try:
+                applied = self._apply(job)
+            except Exception as e:
+                if isinstance(job, ReconcileJob):
+                    # the pending_classification row survives the rollback, the reclassification retry picks it up
+                    logger.error(f"[FLUSH] Reconciliation of '{job.application.name}' failed: {e}")
+                    with self._condition:
+                        self._jobs.popleft()
+                        self._busy = False
+                        self._condition.notify_all()
+                        drained = not self._jobs
+                    self.reconcile_failed.emit(job.application, str(e))
+                    if drained:
+                        self.drained.emit()
+                    continue
+
+                job.attempts += 1
+                if not isinstance(e, OperationalError) and job.attempts >= self.max_attempts:
+                    # the database is up, something in the batch itself keeps failing
+                    self._set_aside(job, e)
+                    backoff = self.initial_backoff
+                    continue
+
+                logger.error(f"[FLUSH] Database write failed, retrying in {backoff:.0f}s: {e}")
+                self.flush_failed.emit(str(e))
+                with self._condition:
+                    self._busy = False
+                    self._condition.notify_all()
+                    self._condition.wait_for(lambda: not self.running, backoff)
+                    if not self.running:
+                        return
+                backoff = min(backoff * 2, self.max_backoff)
+                continue
+
+            backoff = self.initial_backoff
+            with self._condition:
+                self._jobs.popleft()
+                if applied:
+                    self.flush_applied.emit(*applied)
+                self._busy = False
+                self._condition.notify_all()
+                drained = not self._jobs
+            if isinstance(job, FlushBatch):
+                self.flush_completed.emit(job.journal_sequence, job.merged)
+            if drained:
+                self.drained.emit()
+
+    def _set_aside(self, batch: FlushBatch, error: Exception):
+        """Splits a failing batch into single-application writes, or dead-letters it if it already is one"""
+        parts = [
+            FlushBatch(batch.workday, defaultdict(int, {application: seconds}))
+            for application, seconds in batch.applications.items()
+        ]
+        if parts:
+            # the journal is only checkpointed once every part has been written (or dropped)
+            parts[-1].journal_sequence = batch.journal_sequence
+        if len(parts) > 1:
+            logger.warning(f"[FLUSH] Splitting a batch that failed {batch.attempts} times into {len(parts)} writes: {error}")
+        else:
+            credits = ', '.join(f"{application.name}: {seconds}s" for application, seconds in batch.applications.items())
+            logger.error(f"[FLUSH] Dropping flush for {batch.workday.date} ({credits or 'workday only'}) after {batch.attempts} failed writes: {error}")
+            self.flush_failed.emit(f"Dropped a flush that failed {batch.attempts} times: {error}")
+
+        with self._condition:
+            self._jobs.popleft()
+            if len(parts) > 1:
+                self._jobs.extendleft(reversed(parts))
+            else:
+                self.dead_lettered += 1
+            self._busy = False
+            self._condition.notify_all()
+            drained = not self._jobs
+        if drained:
+            self.drained.emit()
+
+    def _apply(self, job: FlushBatch | ReconcileJob) -> tuple[datetime.date, dict[Application, int]] | None:
+        """Writes job, returns the (date, {application: seconds}) a flush committed"""
+        if isinstance(job, ReconcileJob):
+            reconciled_app, moved_today = self.db.reconcile_application(job.application, job.is_productive)
+            with self._condition:
+                self._reassigned[job.application.id] = reconciled_app
+                for queued in list(self._jobs)[1:]:
+                    if isinstance(queued, FlushBatch) and job.application in queued.applications:
+                        seconds = queued.applications.pop(job.application)
+                        queued.applications[reconciled_app] += seconds
+                        if queued.workday.date == datetime.date.today():
+                            # not committed yet so not in moved_today, but already part of today's in-memory totals
+                            moved_today += seconds
+                self.application_reconciled.emit(job.application, reconciled_app, moved_today)
+            return None
+
+        with self._condition:
+            applications = list(job.applications.items())
+            workday = job.workday
+            journal_sequence = job.journal_sequence
+
+        workday_applications = [
+            WorkdayApplication(workday_id=workday.id, application_id=app.id, time_seconds=seconds)
+            for app, seconds in applications if seconds
+        ]
+        self.db.save_flush(workday, workday_applications, journal_sequence)
+        self.writes += 1
+        if journal_sequence is not None:
+            self.last_committed_sequence = journal_sequence
+        logger.debug(f"[FLUSH] Wrote {len(workday_applications)} application records ({job.merged} batches merged)")
+        return workday.date, {app: seconds for app, seconds in applications if seconds}
@@ -3,14 +3,18 @@ from PyQt6.QtCore import QObject, pyqtSignal, QTimer, Qt
 from app.domain.enums import FlowStateStatus, ProductivityState
 from app.domain.models import Application, Workday
 from app.services.app_tracking.app_service import AppService
+from app.services.app_tracking.idle_monitor import IdleMonitor
 from app.services.data_flush_service import DataFlushService
 from app.services.pi_sync_service import PiSyncService
+from app.services.time_accounting_engine import TimeAccountingEngine
 from app.services.workday.pomodoro_service import PomodoroService
 from app.services.workday.workday_service import WorkdayService
 from app.utils.log import get_main_app_logger
 
 logger = get_main_app_logger(__name__)
 
+DEFAULT_REFRESH_INTERVAL_MS = 1000
+
 
 class FlowStateCoordinator(QObject):
     application_status_changed = pyqtSignal(bool)
@@ -18,6 +22,7 @@ class FlowStateCoordinator(QObject):
     timer_updated = pyqtSignal(object, int, int)  # (state, total time, current app time if applicable)
     pomodoro_state_changed = pyqtSignal(int, int, bool)
     current_application_changed = pyqtSignal(object)
+    sync_status_changed = pyqtSignal(str)  # problem saving tracked time, empty once resolved
 
     def __init__(
             self,
@@ -25,7 +30,9 @@ class FlowStateCoordinator(QObject):
             app_service: AppService,
             pomodoro_service: PomodoroService,
             data_flush_service: DataFlushService,
-            pi_sync_service: PiSyncService
+            pi_sync_service: PiSyncService,
+            refresh_interval_ms: int = DEFAULT_REFRESH_INTERVAL_MS,
+            idle_monitor: IdleMonitor = None
     ):
         super().__init__()
         self.workday_service = workday_service
@@ -33,11 +40,17 @@ class FlowStateCoordinator(QObject):
         self.pomodoro_service = pomodoro_service
         self.data_flush_service = data_flush_service
         self.pi_sync_service = pi_sync_service
+        self.idle_monitor = idle_monitor
+        self.accounting = TimeAccountingEngine(workday_service, data_flush_service)
 
         self.status = FlowStateStatus.INACTIVE
         self.state = ProductivityState.IDLE
+        self.user_idle = False
+        self.flush_failing = False
 
-        self.sync_timer = QTimer()
+        # only refreshes the UI, totals come from the accounting engine however often (or late) this fires
+        self.refresh_interval_ms = refresh_interval_ms
+        self.refresh_timer = QTimer()
 
         self.connect_slots_to_signals()
 
@@ -45,17 +58,26 @@ class FlowStateCoordinator(QObject):
 
     def connect_slots_to_signals(self):
         self.app_service.current_application_changed.connect(self._handle_new_app)
+        self.app_service.application_reclassified.connect(self._handle_reclassified_app)
         self.workday_service.new_workday_loaded.connect(self._on_new_workday_loaded)
-        self.workday_service.daily_flush_triggered.connect(self._force_data_flush, Qt.ConnectionType.DirectConnection)
+        self.workday_service.daily_flush_triggered.connect(self._handle_daily_flush, Qt.ConnectionType.DirectConnection)
         self.pomodoro_service.pomodoro_completed.connect(self.end_pomodoro)
-        self.sync_timer.timeout.connect(self._handle_sync_update)
+        self.refresh_timer.timeout.connect(self._handle_refresh)
+        self.data_flush_service.flush_failed.connect(self._handle_flush_failed)
+        self.data_flush_service.writes_settled.connect(self._handle_writes_settled)
+        if self.idle_monitor:
+            self.idle_monitor.idle_started.connect(self._handle_user_idle)
+            self.idle_monitor.activity_resumed.connect(self._handle_user_active)
 
     def start_tracking(self):
         if self.status == FlowStateStatus.INACTIVE:
             self.status = FlowStateStatus.ACTIVE
             self.app_service.enable()
             self.data_flush_service.enable(self.workday_service.get_todays_workday())
-            self.sync_timer.start(1000)
+            self.accounting.resume()
+            self.refresh_timer.start(self.refresh_interval_ms)
+            if self.idle_monitor:
+                self.idle_monitor.start()
             self.application_status_changed.emit(True)
             logger.info("[TRACKING] Application tracking has been started")
         else:
@@ -65,28 +87,50 @@ class FlowStateCoordinator(QObject):
         if self.status == FlowStateStatus.ACTIVE:
             self.status = FlowStateStatus.SHUTDOWN
 
-            self.sync_timer.stop()
+            self.refresh_timer.stop()
+            if self.idle_monitor:
+                self.idle_monitor.stop()
             self.app_service.disable()
+            self.user_idle = False
+            self.accounting.pause()
 
             self._update_state(ProductivityState.IDLE)
             self._force_data_flush(False)
             self.pi_sync_service.disable()
 
-            self.status = FlowStateStatus.INACTIVE
-            self.application_status_changed.emit(False)
-            logger.info("[TRACKING] Application tracking has been stopped")
+            # otherwise finished once the writer reports the final flush committed (or failing)
+            if not self.data_flush_service.writes_pending():
+                self._finish_stop_tracking()
         else:
             logger.warning("[TRACKING] Attempted to stop tracking while not tracking")
 
+    def _finish_stop_tracking(self):
+        self.status = FlowStateStatus.INACTIVE
+        self.application_status_changed.emit(False)
+        logger.info("[TRACKING] Application tracking has been stopped")
+
     def load_workday(self):
         self.workday_service.load_todays_workday()
 
     def _on_new_workday_loaded(self, workday: Workday):
+        # after midnight, the previous day's credits were flushed by _handle_daily_flush
+        self.data_flush_service.set_workday(workday)
         self.workday_loaded.emit(workday)
 
+    def set_refresh_interval(self, interval_ms: int):
+        """Throttles (or speeds up) UI refreshes, e.g. while the window is hidden"""
+        sooner = interval_ms < self.refresh_interval_ms
+        self.refresh_interval_ms = interval_ms
+        if self.refresh_timer.isActive():
+            self.refresh_timer.start(interval_ms)
+            if sooner:
+                # e.g. the window was just shown, don't leave it on values from the slow interval
+                self._handle_refresh()
+
     def _pause_tracking(self):
         if self.status == FlowStateStatus.ACTIVE:
             self.app_service.disable()
+            self.accounting.pause()
             self._force_data_flush(False)
             logger.info("[TRACKING] Application tracking has been paused")
         else:
@@ -96,6 +140,7 @@ class FlowStateCoordinator(QObject):
         if self.status == FlowStateStatus.ACTIVE:
             self.app_service.enable()
             self.data_flush_service.enable()
+            self.accounting.resume()
             logger.info("[TRACKING] Application tracking has been resumed")
         else:
             logger.warning("[TRACKING] Attempted to resume tracking while not tracking")
@@ -107,12 +152,15 @@ class FlowStateCoordinator(QObject):
             logger.warning("[POMO] Attempted to start pomodoro with no pomodoros remaining")
             return
 
-        self.sync_timer.stop()
+        if self.user_idle:
+            # starting it was input, the idle monitor's activity_resumed will find nothing left to resume
+            self.user_idle = False
+            self.refresh_timer.start(self.refresh_interval_ms)
+
         self._pause_tracking()
         self.pomodoro_service.start_pomodoro()
         self._update_state(ProductivityState.POMODORO)
         self.pomodoro_state_changed.emit(self.pomodoro_service.pomodoro_time, pomodoros_remaining, True)
-        self.sync_timer.start()
 
         logger.info(f"[POMO] Requested pomodoro successfully started. Remaining: {pomodoros_remaining}")
 
@@ -125,16 +173,54 @@ class FlowStateCoordinator(QObject):
         self.state = ProductivityState.IDLE
 
         if self.status == FlowStateStatus.ACTIVE:
-            self.sync_timer.stop()
             self._resume_tracking()
-            self.sync_timer.start()
+            if self.idle_monitor and self.idle_monitor.is_idle:
+                # the user walked away during the pomodoro
+                self._handle_user_idle(self.idle_monitor.idle_seconds)
 
         logger.info(f"[POMO] Active pomodoro successfully ended.")
 
-    def _handle_new_app(self, old_app: Application, new_app: Application):
-        # if old app -> save to flush service to be flushed
-        if old_app:
-            self.data_flush_service.add_app_to_next_flush(old_app)
+    def _handle_user_idle(self, idle_seconds: float):
+        if self.status != FlowStateStatus.ACTIVE or self.user_idle or self.state == ProductivityState.POMODORO:
+            return
+
+        self.user_idle = True
+        self.refresh_timer.stop()
+        # the threshold was reached after the last input, nothing since then counts
+        withdrawn = self.accounting.pause(self.accounting.clock() - idle_seconds)
+        # the activity source keeps running (its poller backs off on its own), only crediting stops
+        self._force_data_flush(False)
+        self._update_state(ProductivityState.IDLE)
+        logger.info(f"[TRACKING] User idle, tracking paused ({withdrawn}s since the last input withdrawn)")
+
+    def _handle_user_active(self):
+        if not self.user_idle:
+            return
+
+        self.user_idle = False
+        if self.status != FlowStateStatus.ACTIVE:
+            return
+
+        self.data_flush_service.enable()
+        self.accounting.resume()
+        self.refresh_timer.start(self.refresh_interval_ms)
+        # the user may have come back to a different window than the one they left
+        self.app_service.wake()
+
+        current_app = self.app_service.get_current_application()
+        if current_app:
+            self._update_state(ProductivityState.PRODUCTIVE if current_app.is_productive else ProductivityState.NON_PRODUCTIVE)
+        logger.info("[TRACKING] User active again, tracking resumed")
+
+    def _handle_new_app(self, old_app: Application, new_app: Application, switched_at: float):
+        moved_seconds = self.accounting.switch(new_app, switched_at)
+        if moved_seconds:
+            logger.debug(f"[TRACKING] Backdated switch to '{new_app.name}', {moved_seconds}s moved from the previous app")
+
+        if self.user_idle:
+            # nothing is credited while idle, the state follows the current app once the user is back
+            self.current_application_changed.emit(new_app)
+            return
 
         expected_state = ProductivityState.PRODUCTIVE if new_app.is_productive else ProductivityState.NON_PRODUCTIVE
         if self.state != expected_state:
@@ -142,6 +228,21 @@ class FlowStateCoordinator(QObject):
 
         self.current_application_changed.emit(new_app)
 
+    def _handle_reclassified_app(self, old_app: Application, new_app: Application, moved_seconds: int):
+        if self.accounting.application == old_app:
+            # settles the provisional app first, so the reassignment below covers every second credited to it
+            self.accounting.rebind(self.app_service.get_current_application())
+        moved_seconds += self.data_flush_service.reassign_application(old_app, new_app)
+        if old_app.is_productive == new_app.is_productive:
+            return
+
+        if moved_seconds:
+            self.workday_service.increment_workday_time(-moved_seconds, old_app.is_productive)
+            self.workday_service.increment_workday_time(moved_seconds, new_app.is_productive)
+
+        if self.app_service.get_current_application() == new_app and self.state != ProductivityState.POMODORO and not self.user_idle:
+            self._update_state(ProductivityState.PRODUCTIVE if new_app.is_productive else ProductivityState.NON_PRODUCTIVE)
+
     def _update_state(self, state: ProductivityState):
         logger.debug(f"[STATE] Productivity state change detected (Old State: {self.state}, New State: {state})")
 
@@ -156,21 +257,44 @@ class FlowStateCoordinator(QObject):
         self.pi_sync_service.update_pi_state(state, time)
         self.state = state
 
-    def _handle_sync_update(self):
+    def _handle_refresh(self):
         if self.state == ProductivityState.POMODORO and self.pomodoro_service.pomodoro_active:
-            pomodoro_time_remaining = self.pomodoro_service.decrement_pomodoro_time()
-            if pomodoro_time_remaining >= 0:
-                self.timer_updated.emit(self.state, pomodoro_time_remaining, -1)
-                logger.debug(f"[SYNC] Pomodoro time updated, new time: {pomodoro_time_remaining}")
-        else:
-            is_productive = True if self.state == ProductivityState.PRODUCTIVE else False
-            workday_updated_time = self.workday_service.increment_workday_time(1, is_productive)
-            application_updated_time = self.app_service.increment_application_time(1)
-            self.timer_updated.emit(self.state, workday_updated_time, application_updated_time)
+            pomodoro_time_remaining = self.pomodoro_service.pomodoro_time
+            self.timer_updated.emit(self.state, pomodoro_time_remaining, -1)
+            logger.debug(f"[SYNC] Pomodoro time updated, new time: {pomodoro_time_remaining}")
+        elif self.accounting.application:
+            self.accounting.settle()
+            is_productive = self.state == ProductivityState.PRODUCTIVE
+            workday_time = self.workday_service.get_productive_time() if is_productive else self.workday_service.get_non_productive_time()
+            application_time = self.accounting.application.elapsed_time
+            self.timer_updated.emit(self.state, workday_time, application_time)
             logger.debug(
-                f"[SYNC] Productivity time updated, is productive: {is_productive}, total time: {workday_updated_time}, current app time: {application_updated_time}")
+                f"[SYNC] Productivity time updated, is productive: {is_productive}, total time: {workday_time}, current app time: {application_time}")
+
+    def _handle_flush_failed(self, error: str):
+        if not self.flush_failing:
+            self.flush_failing = True
+            self.sync_status_changed.emit("Saving tracked time failed, retrying")
+
+        if self.status == FlowStateStatus.SHUTDOWN:
+            # the writer keeps retrying in the background and the journal covers a crash, no reason to hold the stop
+            logger.warning(f"[TRACKING] Final flush failed, stopping anyway: {error}")
+            self._finish_stop_tracking()
+
+    def _handle_writes_settled(self):
+        if self.flush_failing:
+            self.flush_failing = False
+            self.sync_status_changed.emit("")
+
+        if self.status == FlowStateStatus.SHUTDOWN:
+            self._finish_stop_tracking()
+
+    def _handle_daily_flush(self):
+        # runs before the workday is swapped, settles the open segment into the old day and flushes it
+        self._force_data_flush(True)
 
     def _force_data_flush(self, reactivate=True):
         logger.debug(f"[FLUSH] Forced data flush requested")
-        current_application = self.app_service.get_current_application()
-        self.data_flush_service.force_flush(current_application, reactivate)
+        # credit everything up to now, the flush (or the midnight rollover) must not miss the open segment
+        self.accounting.settle()
+        self.data_flush_service.force_flush(reactivate)
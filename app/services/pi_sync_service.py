@@ -1,3 +1,5 @@
+import time
+
 from PyQt6.QtCore import QObject, pyqtSignal
 
 from app.client.pi_client import PiClient
@@ -10,30 +12,90 @@ DEFAULT_POMODORO_TIME = 600
 
 
 class PiSyncService(QObject):
+    """
+    Mirrors the productivity state on every configured display
+
+    Each update is handed to every device's client at once, requests are asynchronous and every client has its own
+    network manager, timeout, retries and health, so a slow or dead display never holds up the others. An unhealthy
+    display whose last command is still being retried isn't sent every new update (each would restart its backoff
+    and tie up a request until the timeout), the latest one is held and sent once the device answers or the pending
+    command is given up, its timer adjusted for the time it was held
+    """
     application_state_changed = pyqtSignal(bool)
 
-    def __init__(self, pi_client: PiClient):
+    def __init__(self, pi_clients: list[PiClient]):
         super().__init__()
-        self.pi_client = pi_client
-        logger.debug("[INIT] PiSyncService initialization complete")
+        self.pi_clients = pi_clients
+        self.held_updates = 0
+        self._held: dict[PiClient, tuple[ProductivityState, int | None, float]] = {}  # client -> latest update, held at
+
+        for pi_client in pi_clients:
+            pi_client.response_received.connect(lambda *_, client=pi_client: self._release_held_update(client))
+            pi_client.request_error.connect(lambda *_, client=pi_client: self._release_held_update(client))
+        logger.debug(f"[INIT] PiSyncService initialization complete ({len(pi_clients)} devices)")
 
     def enable(self):
-        pass
+        # catch every display up with the last state a previous run couldn't deliver
+        for pi_client in self.pi_clients:
+            pi_client.replay_outbox()
 
     def disable(self):
-        # self.pi_client.pause_all_timers()
-        self.pi_client.wait_for_completion()
+        self._wait_for_devices()
+        for pi_client in self.pi_clients:
+            if pi_client.outbox:
+                # whatever is still undelivered must be on disk before the process exits
+                pi_client.outbox.flush()
+            health = pi_client.health
+            logger.info(
+                f"[API] Pi display '{pi_client.name}' (healthy: {health.healthy}, ok: {health.successes}, failed: {health.failures}, "
+                f"latency mean: {health.mean_latency_ms:.0f}ms, max: {health.max_latency_ms:.0f}ms, "
+                f"superseded: {pi_client.superseded_requests}, expired: {pi_client.expired_commands})"
+            )
+        if self.held_updates:
+            logger.info(f"[API] {self.held_updates} updates held back from unhealthy Pi displays")
 
     def update_pi_state(self, state: ProductivityState, time: int | None):
+        for pi_client in self.pi_clients:
+            if not pi_client.health.healthy and pi_client.has_outstanding(PiClient.STATE_CHANNEL):
+                self._held[pi_client] = (state, time, self._now())
+                self.held_updates += 1
+                continue
+            self._send(pi_client, state, time)
+        logger.debug(f"[API] {state} update sent to {len(self.pi_clients)} Pi displays")
+
+    def _release_held_update(self, pi_client: PiClient):
+        held = self._held.pop(pi_client, None)
+        if held is None:
+            return
+
+        state, time, held_at = held
+        if time is not None:
+            # the display starts its timer from the value it is sent, account for how long the update waited
+            elapsed = int(self._now() - held_at)
+            time = max(0, time - elapsed) if state == ProductivityState.POMODORO else time + elapsed
+        logger.debug(f"[API] Sending held {state} update to Pi display '{pi_client.name}'")
+        self._send(pi_client, state, time)
+
+    @staticmethod
+    def _send(pi_client: PiClient, state: ProductivityState, time: int | None):
         if state == ProductivityState.POMODORO:
-            self.pi_client.start_pomodoro_timer(time)
-            logger.debug('[API] PI client successfully delivered start pomodoro post request')
+            pi_client.start_pomodoro_timer(time)
         elif state == ProductivityState.PRODUCTIVE:
-            self.pi_client.start_productive_timer(time)
-            logger.debug('[API] PI client successfully delivered start productive time post request')
+            pi_client.start_productive_timer(time)
         elif state == ProductivityState.NON_PRODUCTIVE:
-            self.pi_client.start_non_productive_timer(time)
-            logger.debug('[API] PI client successfully delivered start non_productive time post request')
+            pi_client.start_non_productive_timer(time)
         else:
-            self.pi_client.pause_all_timers()
-            logger.debug('[API] PI client successfully delivered pause all timers post request')
+            pi_client.pause_all_timers()
+
+    @staticmethod
+    def _now() -> float:
+        return time.monotonic()
+
+    def _wait_for_devices(self, timeout_ms=3000):
+        """Waits for every display on exit within one shared deadline, each wait runs the event loop for all of them"""
+        deadline = self._now() + timeout_ms / 1000
+        for pi_client in self.pi_clients:
+            remaining_ms = int((deadline - self._now()) * 1000)
+            if remaining_ms <= 0:
+                return
+            pi_client.wait_for_completion(remaining_ms)
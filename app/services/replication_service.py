@@ -0,0 +1,138 @@
+import datetime
+import threading
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from app.db.database import Database
+from app.utils.log import get_main_app_logger
+
+logger = get_main_app_logger(__name__)
+
+
+class ReplicationService(QThread):
+    """
+    Pushes batches from the local store's replication_outbox to the central database
+
+    Every flush, session and reconciliation writes its outbox batch in the same local transaction, so nothing is
+    lost while offline. This thread sends the oldest batches first, deletes them locally only after the remote
+    transaction committed, and backs off exponentially while the remote is unreachable. Batch ids are recorded
+    remotely, so a batch re-sent after a dropped acknowledgement is not counted twice
+    """
+    lag_changed = pyqtSignal(int, float)  # batches waiting, age of the oldest one in seconds
+
+    def __init__(self, local_db: Database, remote_url: str, interval: float = 30.0, batch_size: int = 50, max_backoff: float = 600.0):
+        super().__init__()
+        self.local_db = local_db
+        self.remote_url = remote_url
+        self.interval = interval
+        self.batch_size = batch_size
+        self.max_backoff = max_backoff
+
+        self.running = False
+        self.replicated = 0
+        self.pending = 0
+        self.lag_seconds = 0.0
+        self._remote_db: Database | None = None
+        self._connected = False
+        self._wake_event = threading.Event()
+
+        logger.debug("[INIT] ReplicationService initialization complete")
+
+    def bootstrap(self):
+        """Seeds an empty local store from the central database, e.g. on a new machine"""
+        if not self.local_db.is_empty():
+            return
+
+        try:
+            snapshot = self._remote().export_snapshot()
+        except Exception as e:
+            logger.warning(f"[REPLICATION] Local store is empty and the remote database is unreachable, starting fresh: {e}")
+            return
+
+        self.local_db.import_snapshot(snapshot)
+        logger.info(
+            f"[REPLICATION] Local store bootstrapped from remote ({len(snapshot['applications'])} applications, "
+            f"{len(snapshot['workdays'])} workdays, {len(snapshot['classifications'])} classifications)"
+        )
+
+    def start(self, *args, **kwargs):
+        self.running = True
+        self._wake_event.clear()
+        super().start(*args, **kwargs)
+
+    def stop(self):
+        self.running = False
+        self._wake_event.set()
+        if not self.wait(5000):
+            logger.warning("[REPLICATION] Replication thread didn't stop gracefully")
+        logger.info(f"[REPLICATION] Stopped, {self.replicated} batches replicated, {self.pending} still queued locally")
+
+    def wake(self):
+        """Replicate now instead of at the next interval, e.g. after a flush, the backoff wins while the remote is down"""
+        if self._connected:
+            self._wake_event.set()
+
+    def run(self):
+        delay = self.interval
+        while self.running:
+            try:
+                self.replicate_pending()
+                if not self._connected:
+                    logger.info("[REPLICATION] Connected to the remote database")
+                self._connected = True
+                delay = self.interval
+            except Exception as e:
+                if self._connected or delay == self.interval:
+                    logger.warning(f"[REPLICATION] Remote database unavailable, batches stay queued locally: {e}")
+                self._connected = False
+                self._remote_db = None
+                delay = min(delay * 2, self.max_backoff)
+
+            self._update_lag()
+            if self._wake_event.wait(delay):
+                self._wake_event.clear()
+
+        # one last attempt so a clean shutdown leaves as little as possible behind
+        if self._connected:
+            try:
+                self.replicate_pending()
+            except Exception as e:
+                logger.warning(f"[REPLICATION] Final replication attempt failed: {e}")
+            self._update_lag()
+
+    def replicate_pending(self):
+        while True:
+            batches = self.local_db.get_replication_batches(self.batch_size)
+            if not batches:
+                return
+
+            remote = self._remote()
+            applied = []
+            try:
+                for batch in batches:
+                    if not remote.apply_replication_batch(batch):
+                        logger.debug(f"[REPLICATION] Batch {batch.batch_id} was already applied remotely")
+                    applied.append(batch.id)
+            finally:
+                if applied:
+                    self.local_db.delete_replication_batches(applied)
+                    self.replicated += len(applied)
+
+            logger.debug(f"[REPLICATION] Replicated {len(applied)} batches")
+            if len(batches) < self.batch_size or not self.running:
+                return
+
+    def _remote(self) -> Database:
+        if self._remote_db is None:
+            self._remote_db = Database(self.remote_url)
+        return self._remote_db
+
+    def _update_lag(self):
+        pending, oldest = self.local_db.get_replication_lag()
+        lag_seconds = (datetime.datetime.now() - oldest).total_seconds() if oldest else 0.0
+        if pending != self.pending or pending:
+            if pending:
+                logger.info(f"[REPLICATION] {pending} batches waiting, oldest is {lag_seconds:.0f}s old")
+            self.lag_changed.emit(pending, lag_seconds)
+        self.pending = pending
+        self.lag_seconds = lag_seconds
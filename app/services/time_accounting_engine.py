@@ -0,0 +1,95 @@
+import time
+from typing import Callable
+
+from app.domain.models import Application
+from app.services.data_flush_service import DataFlushService
+from app.services.workday.workday_service import WorkdayService
+from app.utils.log import get_main_app_logger
+
+logger = get_main_app_logger(__name__)
+
+
+class TimeAccountingEngine:
+    """
+    Derives tracked time from monotonic switch timestamps instead of counting timer ticks
+
+    The engine remembers when it last settled and credits the whole seconds elapsed since then to the current
+    application (its elapsed time, the workday totals and the flush service) whenever settle() is called, the
+    fractional remainder stays for the next settle. How often that happens (UI refresh, switches, flushes) only
+    changes how fresh the totals are, not their value, so a delayed or skipped timer can't drift them.
+    Switches are backdated to when they were first observed: time already credited to the previous
+    application after that moment is moved to the new one
+    """
+
+    def __init__(self, workday_service: WorkdayService, data_flush_service: DataFlushService, clock: Callable[[], float] = time.monotonic):
+        self.workday_service = workday_service
+        self.data_flush_service = data_flush_service
+        self.clock = clock
+
+        self.application: Application | None = None
+        self.running = False
+        self._settled_at = 0.0
+        self._segment_started_at = 0.0
+
+    def resume(self):
+        if self.running:
+            return
+        self.running = True
+        self._settled_at = self._segment_started_at = self.clock()
+
+    def pause(self, paused_at: float | None = None) -> int:
+        """Stops crediting as of paused_at (monotonic, defaults to now), returns the seconds withdrawn again"""
+        self.settle()
+        withdrawn = 0
+        if self.running and self.application and paused_at is not None:
+            # e.g. the user went idle before it was detected, that time was never worked
+            withdrawn = int(self._settled_at - max(paused_at, self._segment_started_at))
+            if withdrawn > 0:
+                self._credit(self.application, -withdrawn)
+        self.running = False
+        return max(withdrawn, 0)
+
+    def switch(self, application: Application, switched_at: float | None = None) -> int:
+        """Makes application current as of switched_at (monotonic, defaults to now), returns the seconds moved to it"""
+        now = self.clock()
+        switched_at = min(now, switched_at if switched_at is not None else now)
+        moved = 0
+
+        if self.running and self.application:
+            self.settle()
+            # the old application was credited past the switch, hand that time over
+            moved = int(self._settled_at - max(switched_at, self._segment_started_at))
+            if moved > 0:
+                self._credit(self.application, -moved)
+                self._credit(application, moved)
+        elif self.running:
+            # nothing was tracked yet, the new application owns the time since it was observed
+            self._settled_at = max(self._settled_at, switched_at)
+
+        self.application = application
+        self._segment_started_at = max(switched_at, self._segment_started_at)
+        return max(moved, 0)
+
+    def rebind(self, application: Application):
+        """Swaps the current application for an updated copy of it, e.g. after reclassification"""
+        self.settle()
+        if self.application:
+            application.elapsed_time = self.application.elapsed_time
+        self.application = application
+
+    def settle(self) -> int:
+        """Credits the whole seconds elapsed since the last settle, returns them"""
+        if not self.running or not self.application:
+            return 0
+
+        seconds = int(self.clock() - self._settled_at)
+        if seconds <= 0:
+            return 0
+        self._settled_at += seconds
+        self._credit(self.application, seconds)
+        return seconds
+
+    def _credit(self, application: Application, seconds: int):
+        application.elapsed_time += seconds
+        self.workday_service.increment_workday_time(seconds, application.is_productive)
+        self.data_flush_service.credit(application, seconds)
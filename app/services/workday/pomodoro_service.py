@@ -1,4 +1,7 @@
-from PyQt6.QtCore import QObject, pyqtSignal
+import math
+import time
+
+from PyQt6.QtCore import QObject, pyqtSignal, QTimer
 
 from app.utils.log import get_main_app_logger
 
@@ -13,21 +16,33 @@ class PomodoroService(QObject):
     def __init__(self):
         super().__init__()
         self.pomodoro_active = False
-        self.pomodoro_time = 0
+        self._deadline = 0.0  # monotonic
+
+        # completion fires at the deadline itself, the UI refresh only reads the remaining time
+        self.completion_timer = QTimer()
+        self.completion_timer.setSingleShot(True)
+        self.completion_timer.timeout.connect(self._handle_deadline)
         logger.debug("[INIT] PomodoroService initialization complete")
 
+    @property
+    def pomodoro_time(self) -> int:
+        """Seconds left in the active pomodoro, 0 when none is running"""
+        if not self.pomodoro_active:
+            return 0
+        return max(0, math.ceil(self._deadline - time.monotonic()))
+
     def start_pomodoro(self):
         self.pomodoro_active = True
-        self.pomodoro_time = DEFAULT_POMODORO_TIME
+        self._deadline = time.monotonic() + DEFAULT_POMODORO_TIME
+        self.completion_timer.start(DEFAULT_POMODORO_TIME * 1000)
 
     def complete_pomodoro(self):
         self.pomodoro_active = False
-        self.pomodoro_time = 0
-
-    def decrement_pomodoro_time(self):
-        if self.pomodoro_time == 0:
-            self.pomodoro_completed.emit()
-            return -1
-
-        self.pomodoro_time -= 1
-        return self.pomodoro_time
\ No newline at end of file
+        self.completion_timer.stop()
+
+    def _handle_deadline(self):
+        if self.pomodoro_time > 0:
+            # timers may fire a little early, wait out the rest
+            self.completion_timer.start(int((self._deadline - time.monotonic()) * 1000) + 1)
+            return
+        self.pomodoro_completed.emit()
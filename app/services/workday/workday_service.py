@@ -40,12 +40,14 @@ class WorkdayService(QObject):
         return self.workday
 
     def increment_workday_time(self, elapsed_time: int, is_productive: bool) -> int:
+        # credits go to the workday being tracked, crediting never triggers the rollover (it runs during it)
+        workday = self._workday or self.workday
         if is_productive:
-            self.workday.productive_time_seconds += elapsed_time
-            return self.workday.productive_time_seconds
+            workday.productive_time_seconds += elapsed_time
+            return workday.productive_time_seconds
         else:
-            self.workday.non_productive_time_seconds += elapsed_time
-            return self.workday.non_productive_time_seconds
+            workday.non_productive_time_seconds += elapsed_time
+            return workday.non_productive_time_seconds
 
     def get_productive_time(self):
         return self.workday.productive_time_seconds
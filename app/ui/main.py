@@ -1,4 +1,4 @@
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QTabWidget)
 
 from app.domain.analytics import TimeFrame
@@ -10,6 +10,8 @@ logger = get_main_app_logger(__name__)
 
 
 class MainWindow(QMainWindow):
+    visibility_changed = pyqtSignal(bool)
+
     def __init__(self):
         super().__init__()
         self.initUI()
@@ -106,6 +108,11 @@ class MainWindow(QMainWindow):
         self.tabs.tabBar().setCursor(Qt.CursorShape.PointingHandCursor)
         self.home_tab.request_initial_data.emit()
         self.analytics_tab.analytics_report_requested.emit(TimeFrame.TODAY)
+        self.visibility_changed.emit(True)
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.visibility_changed.emit(False)
 
     def handle_graceful_exit(self):
         self.home_tab.stop_app_clicked.emit()
@@ -1,6 +1,6 @@
-from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtCore import Qt, pyqtSignal, QDate
 from PyQt6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QFrame, QLabel, QTabWidget, QComboBox, QSizePolicy, QScrollArea
+    QWidget, QVBoxLayout, QHBoxLayout, QFrame, QLabel, QTabWidget, QComboBox, QSizePolicy, QScrollArea, QDateEdit
 )
 
 from app.domain.analytics import AnalyticsReport, TimeFrame
@@ -10,6 +10,7 @@ from app.ui.components import PieChart, AppCard
 
 class AnalyticsView(QWidget):
     analytics_report_requested = pyqtSignal(object)
+    custom_range_requested = pyqtSignal(object, object)  # start date, end date (inclusive)
     shutdown_detected = pyqtSignal()
 
     def __init__(self):
@@ -36,6 +37,8 @@ class AnalyticsView(QWidget):
     def closeEvent(self, event):
         # Disconnect before destruction
         self.dropdown.currentIndexChanged.disconnect(self._on_dropdown_index_changed)
+        self.start_date_edit.dateChanged.disconnect(self._on_custom_range_changed)
+        self.end_date_edit.dateChanged.disconnect(self._on_custom_range_changed)
         super().closeEvent(event)
 
     def update_with_analytics_report(self, analytics_report: AnalyticsReport):
@@ -60,7 +63,7 @@ class AnalyticsView(QWidget):
 
         # Dropdown menu (styled QComboBox)
         self.dropdown = QComboBox()
-        self.dropdown.addItems(["Today       ▼", "This Week      ▼", "This Month     ▼", "All Time     ▼"])
+        self.dropdown.addItems(["Today       ▼", "This Week      ▼", "This Month     ▼", "All Time     ▼", "Custom Range     ▼"])
         self.dropdown.setCurrentIndex(0)
         self.dropdown.setStyleSheet("""
             QComboBox {
@@ -85,6 +88,27 @@ class AnalyticsView(QWidget):
         self.dropdown.currentIndexChanged.connect(self._on_dropdown_index_changed)
         time_analysis_layout.addWidget(self.dropdown, alignment=Qt.AlignmentFlag.AlignCenter)
 
+        # Custom range pickers, only shown for "Custom Range"
+        self.custom_range_frame = QFrame()
+        custom_range_layout = QHBoxLayout(self.custom_range_frame)
+        custom_range_layout.setContentsMargins(0, 0, 0, 0)
+        custom_range_layout.setSpacing(8)
+
+        today = QDate.currentDate()
+        self.start_date_edit = self._create_date_edit(today.addDays(-6))
+        self.end_date_edit = self._create_date_edit(today)
+
+        range_separator = QLabel("to")
+        range_separator.setStyleSheet("color: #bfc7d5; font-size: 14px;")
+        custom_range_layout.addWidget(self.start_date_edit)
+        custom_range_layout.addWidget(range_separator)
+        custom_range_layout.addWidget(self.end_date_edit)
+
+        self.start_date_edit.dateChanged.connect(self._on_custom_range_changed)
+        self.end_date_edit.dateChanged.connect(self._on_custom_range_changed)
+        self.custom_range_frame.setVisible(False)
+        time_analysis_layout.addWidget(self.custom_range_frame, alignment=Qt.AlignmentFlag.AlignCenter)
+
         # Pie chart placeholder
         self.pie_chart = PieChart(productive_percent=65)
         time_analysis_layout.addWidget(self.pie_chart, alignment=Qt.AlignmentFlag.AlignCenter)
@@ -172,6 +196,23 @@ class AnalyticsView(QWidget):
 
         return time_analysis_frame
 
+    def _create_date_edit(self, date: QDate):
+        date_edit = QDateEdit(date)
+        date_edit.setCalendarPopup(True)
+        date_edit.setDisplayFormat("MMM d, yyyy")
+        date_edit.setMaximumDate(QDate.currentDate())
+        date_edit.setStyleSheet("""
+            QDateEdit {
+                background-color: #23263a;
+                color: #bfc7d5;
+                border: 1.5px solid #35395a;
+                border-radius: 8px;
+                padding: 4px 8px;
+                font-size: 14px;
+            }
+        """)
+        return date_edit
+
     def _create_breakdown_section(self):
         breakdown_frame = QFrame()
         breakdown_frame.setObjectName('breakdownFrame')
@@ -335,14 +376,27 @@ class AnalyticsView(QWidget):
         return main_widget
 
     def _on_dropdown_index_changed(self, index):
+        self.custom_range_frame.setVisible(index == 4)
         if index == 0:
             self.analytics_report_requested.emit(TimeFrame.TODAY)
         elif index == 1:
             self.analytics_report_requested.emit(TimeFrame.WEEK)
         elif index == 2:
             self.analytics_report_requested.emit(TimeFrame.MONTH)
-        else:
+        elif index == 3:
             self.analytics_report_requested.emit(TimeFrame.ALL)
+        else:
+            self._on_custom_range_changed()
+
+    def _on_custom_range_changed(self):
+        if self.dropdown.currentIndex() != 4:
+            return
+
+        start_date = self.start_date_edit.date().toPyDate()
+        end_date = self.end_date_edit.date().toPyDate()
+        if start_date > end_date:
+            start_date, end_date = end_date, start_date
+        self.custom_range_requested.emit(start_date, end_date)
 
     def _update_time_analysis_section(self, analytics_report):
         overall_time = max(1, analytics_report.overall_time)
@@ -12,6 +12,8 @@ from PyQt6.QtWidgets import (
 from app.domain.models import ApplicationView
 from app.ui.components import AppCard, CircularProgressBar
 
+REPLICATION_LAG_WARNING_SECONDS = 120
+
 
 class HomeView(QWidget):
     # Signal definitions
@@ -69,6 +71,19 @@ class HomeView(QWidget):
         self.start_button.setCursor(Qt.CursorShape.PointingHandCursor)
         self.request_updated_daily_report.emit() if not is_tracking else None
 
+    def update_sync_status(self, message: str):
+        self.sync_status_text.setText(message)
+        self.sync_status_text.setVisible(bool(message))
+
+    def update_replication_status(self, pending: int, lag_seconds: float):
+        # a batch or two waiting for the next round is normal, only a backlog is worth showing
+        if pending and lag_seconds >= REPLICATION_LAG_WARNING_SECONDS:
+            hours, minutes = divmod(int(lag_seconds) // 60, 60)
+            self.replication_status_text.setText(f"{pending} changes not synced yet (oldest {hours}:{minutes:02d} old)")
+            self.replication_status_text.setVisible(True)
+        else:
+            self.replication_status_text.setVisible(False)
+
     def showEvent(self, event):
         super().showEvent(event)
         self.start_button.setCursor(Qt.CursorShape.PointingHandCursor)
@@ -199,6 +214,18 @@ class HomeView(QWidget):
         status_layout.addStretch()
 
         layout.addWidget(status_frame)
+
+        self.sync_status_text = QLabel("")
+        self.sync_status_text.setStyleSheet("color: #fbbf24; font-size: 13px;")
+        self.sync_status_text.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.sync_status_text.setVisible(False)
+        layout.addWidget(self.sync_status_text)
+
+        self.replication_status_text = QLabel("")
+        self.replication_status_text.setStyleSheet("color: #9ca3af; font-size: 13px;")
+        self.replication_status_text.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.replication_status_text.setVisible(False)
+        layout.addWidget(self.replication_status_text)
         layout.addStretch()
 
         return frame
@@ -36,3 +36,15 @@ def get_logs_directory():
     # Ensure directory exists
     logs_dir.mkdir(parents=True, exist_ok=True)
     return str(logs_dir)
+
+
+def get_data_directory():
+    if hasattr(sys, '_MEIPASS'):
+        # PyInstaller - use proper macOS location
+        data_dir = Path.home() / "Library" / "Application Support" / "FlowState"
+    else:
+        root_dir = Path(__file__).parent.parent.parent
+        data_dir = root_dir / "data"
+
+    data_dir.mkdir(parents=True, exist_ok=True)
+    return str(data_dir)
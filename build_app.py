@@ -21,11 +21,12 @@ def build_app():
         print("❌ Set FLOWSTATE_DATABASE_URL and FLOWSTATE_AI_API_KEY before building")
         return
 
-    # Write actual values to config
-    config = {
-        'database_url': db_url,
-        'ai_api_key': api_key
-    }
+    # Write actual values to config, keeping the remaining settings
+    with open('resources/config/config.yaml') as f:
+        config = yaml.safe_load(f) or {}
+
+    config['database_url'] = db_url
+    config['ai_api_key'] = api_key
 
     with open('resources/config/config.yaml', 'w') as f:
         yaml.dump(config, f)
@@ -35,7 +36,6 @@ def build_app():
         'pyinstaller',
         '--onedir',
         '--optimize', '2',
-        '--exclude-module', 'numpy',
         '--exclude-module', 'matplotlib',
         '--exclude-module', 'contourpy',
         '--exclude-module', 'fonttools',
@@ -0,0 +1,13 @@
+import os
+
+import pytest
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt6.QtCore import QCoreApplication
+
+
+@pytest.fixture(scope='session')
+def qapp():
+    """Qt objects with signals and timers need an application instance, never exec()'d"""
+    return QCoreApplication.instance() or QCoreApplication([])
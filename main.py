@@ -1,4 +1,5 @@
 import atexit
+import datetime
 import os
 import signal
 import sys
@@ -6,21 +7,39 @@ import sys
 import yaml
 from PyQt6.QtWidgets import QApplication
 
-from app.client.claude_client import ClaudeClient
+from app.client.circuit_breaker import CircuitBreaker
+from app.client.claude_client import AsyncClaudeClient
+from app.client.command_outbox import CommandOutbox
 from app.client.pi_client import PiClient
 from app.controller.analytics_controller import AnalyticsController
 from app.controller.flow_state_controller import FlowStateController
+from app.db.application_catalog import ApplicationCatalog
 from app.db.database import Database
+from app.db.flush_journal import FlushJournal
+from app.db.storage_backend import default_database_url
+from app.services.analytics_index import AnalyticsIndex
 from app.services.analytics_service import AnalyticsService
+from app.services.app_tracking.activity_source import ActivitySource, FileActivitySource
+from app.services.app_tracking.app_monitor_service import AppMonitorService
 from app.services.app_tracking.app_service import AppService
+from app.services.app_tracking.classification_cache import ClassificationCache
+from app.services.app_tracking.classification_service import ClassificationService
+from app.services.app_tracking.idle_monitor import IdleMonitor, HIDIdleProbe
+from app.services.app_tracking.poll_scheduler import AdaptivePollScheduler
+from app.services.app_tracking.reclassification_service import ReclassificationService
+from app.services.app_tracking.rule_classifier import RuleClassifier
+from app.services.app_tracking.switch_debouncer import SwitchDebouncer
+from app.services.app_tracking.title_classifier import TitleClassifier
 from app.services.data_flush_service import DataFlushService
+from app.services.database_writer import DatabaseWriter
 from app.services.flow_state_coordinator import FlowStateCoordinator
 from app.services.pi_sync_service import PiSyncService
+from app.services.replication_service import ReplicationService
 from app.services.workday.pomodoro_service import PomodoroService
 from app.services.workday.workday_service import WorkdayService
 from app.ui.main import MainWindow
 from app.utils.log import setup_logging, get_main_app_logger
-from app.utils.resolve_path import get_config_path
+from app.utils.resolve_path import get_config_path, get_data_directory
 
 setup_logging()
 logger = get_main_app_logger(__name__)
@@ -50,6 +69,66 @@ def get_config():
         return None
 
 
+def create_activity_source(config) -> ActivitySource:
+    source_config = config.get('activity_source') or {}
+    source_type = source_config.get('type', 'poll')
+
+    poll_config = source_config.get('poll') or {}
+    scheduler = AdaptivePollScheduler(
+        min_interval=poll_config.get('min_interval', 1.0),
+        max_interval=poll_config.get('max_interval', 10.0),
+        backoff=poll_config.get('backoff', 1.5),
+        fast_window=poll_config.get('fast_window', 10.0)
+    )
+
+    if source_type == 'file':
+        return FileActivitySource(
+            source_config['path'],
+            default_interval=source_config.get('interval', 2.0),
+            loop=source_config.get('loop', False)
+        )
+    return AppMonitorService(scheduler=scheduler)
+
+
+def create_title_classifier(config) -> TitleClassifier | None:
+    model_config = config.get('title_classifier') or {}
+    if not model_config.get('enabled', True):
+        return None
+
+    return TitleClassifier(
+        confidence_threshold=model_config.get('confidence_threshold', 0.9),
+        min_samples=model_config.get('min_samples', 50),
+        shadow=model_config.get('shadow', False)
+    )
+
+
+def create_pi_clients(config) -> list[PiClient]:
+    outbox = CommandOutbox(os.path.join(get_data_directory(), 'pi_outbox.json'))
+    devices = config.get('devices') or [{'name': 'desk', 'url': 'http://192.168.1.28:5050'}]
+    return [
+        PiClient(
+            device['url'],
+            outbox=outbox,
+            name=device.get('name'),
+            timeout=device.get('timeout_ms', 3000),
+            command_ttl=device.get('command_ttl_seconds', 3600)
+        )
+        for device in devices
+    ]
+
+
+def create_idle_monitor(config) -> IdleMonitor | None:
+    idle_config = config.get('idle') or {}
+    if not idle_config.get('enabled', True):
+        return None
+
+    return IdleMonitor(
+        HIDIdleProbe(),
+        threshold=idle_config.get('threshold_seconds', 300),
+        resume_interval=idle_config.get('resume_interval', 1.0)
+    )
+
+
 def create_app():
     global app, window, flow_state_controller, analytics_controller
 
@@ -58,32 +137,145 @@ def create_app():
     window = MainWindow()
 
     config = get_config()
-    db_url = config['database_url']
     ai_api_key = config['ai_api_key']
 
-    db = Database(db_url)
+    db_config = config.get('database') or {}
+    replication_config = config.get('replication') or {}
+    remote_url = config.get('database_url')
+    if not remote_url or remote_url.startswith('$'):
+        remote_url = None
+
+    replication_service = None
+    if remote_url and replication_config.get('enabled', True):
+        # local-first: tracking writes land in the embedded store and are replicated to database_url in the background
+        db = Database(
+            replication_config.get('local_database_url') or default_database_url(),
+            echo=db_config.get('echo', False),
+            slow_query_threshold_ms=db_config.get('slow_query_ms', 100),
+            replicate=True
+        )
+        replication_service = ReplicationService(
+            db,
+            remote_url,
+            interval=replication_config.get('interval', 30.0),
+            batch_size=replication_config.get('batch_size', 50)
+        )
+        replication_service.bootstrap()
+    else:
+        db = Database(
+            remote_url or default_database_url(),
+            echo=db_config.get('echo', False),
+            slow_query_threshold_ms=db_config.get('slow_query_ms', 100)
+        )
+    atexit.register(db.profiler.log_summary)
+    catalog = ApplicationCatalog(db)
+    catalog.load()
+
+    ai_config = config.get('ai_client') or {}
+    ai_client = AsyncClaudeClient(
+        ai_api_key,
+        timeout=ai_config.get('timeout', 10.0),
+        max_in_flight=ai_config.get('max_in_flight', 4),
+        breaker=CircuitBreaker(
+            'claude',
+            failure_threshold=ai_config.get('breaker_failure_threshold', 3),
+            reset_timeout=ai_config.get('breaker_reset_timeout', 30.0)
+        )
+    )
+
+    cache_config = config.get('classification_cache') or {}
+    classification_cache = ClassificationCache(
+        db,
+        max_size=cache_config.get('max_size', 2048),
+        ttl=datetime.timedelta(days=cache_config.get('ttl_days', 30))
+    )
+    batch_config = config.get('classification_batch') or {}
+    classification_service = ClassificationService(
+        ai_client,
+        classification_cache,
+        rules=RuleClassifier.from_file(get_config_path('classification_rules.yaml')),
+        batch_size=batch_config.get('max_size', 20),
+        batch_wait=batch_config.get('max_wait_ms', 500) / 1000,
+        title_classifier=create_title_classifier(config),
+        batch_fallback_timeout=batch_config.get('fallback_timeout', 10.0)
+    )
+    classification_service.train_title_classifier()
 
-    pi_client = PiClient("http://192.168.1.28:5050")
-    ai_client = ClaudeClient(ai_api_key)
+    reclassification_config = config.get('reclassification') or {}
+    flush_config = config.get('flush') or {}
+    database_writer = DatabaseWriter(
+        db,
+        max_pending=flush_config.get('max_pending_batches', 16),
+        max_attempts=flush_config.get('max_write_attempts', 5)
+    )
+    database_writer.start()
+    reclassification_service = ReclassificationService(
+        db,
+        catalog,
+        classification_service,
+        database_writer,
+        retry_interval=reclassification_config.get('retry_interval', 300.0)
+    )
 
     workday_service = WorkdayService(db)
-    app_service = AppService(db, ai_client)
+    tracking_config = config.get('tracking') or {}
+    app_service = AppService(
+        catalog,
+        classification_service,
+        create_activity_source(config),
+        SwitchDebouncer(tracking_config.get('switch_dwell_ms', 1500)),
+        lookup_concurrency=tracking_config.get('lookup_concurrency', 4),
+        reclassification_service=reclassification_service
+    )
     pomodoro_service = PomodoroService()
-    data_flush_service = DataFlushService(db)
-    pi_sync_service = PiSyncService(pi_client)
+    journal = None
+    if flush_config.get('journal', True):
+        journal = FlushJournal(
+            os.path.join(get_data_directory(), 'flush_journal.log'),
+            sync_interval=flush_config.get('journal_sync_seconds', 5.0)
+        )
+        atexit.register(journal.close)
+    data_flush_service = DataFlushService(
+        db,
+        journal,
+        flush_interval=flush_config.get('interval_seconds', 300),
+        writer=database_writer
+    )
+    data_flush_service.recover()
+    # loaded before any write reaches the writer, from then on it is kept current by the writer's signals
+    analytics_index = AnalyticsIndex()
+    analytics_index.load(db.get_workday_application_history())
+    pi_sync_service = PiSyncService(create_pi_clients(config))
+    pi_sync_service.enable()
 
     flow_state_coordinator = FlowStateCoordinator(
         workday_service=workday_service,
         app_service=app_service,
         pomodoro_service=pomodoro_service,
         data_flush_service=data_flush_service,
-        pi_sync_service=pi_sync_service
+        pi_sync_service=pi_sync_service,
+        refresh_interval_ms=tracking_config.get('ui_refresh_ms', 1000),
+        idle_monitor=create_idle_monitor(config)
     )
     flow_state_controller = FlowStateController(window.home_tab, flow_state_coordinator)
+    # nobody sees the timers while the window is hidden, refresh them rarely
+    refresh_interval_ms = tracking_config.get('ui_refresh_ms', 1000)
+    hidden_refresh_interval_ms = tracking_config.get('hidden_ui_refresh_ms', 30000)
+    window.visibility_changed.connect(
+        lambda visible: flow_state_coordinator.set_refresh_interval(refresh_interval_ms if visible else hidden_refresh_interval_ms)
+    )
 
-    analytics_service = AnalyticsService(db)
+    analytics_service = AnalyticsService(db, analytics_index, database_writer, data_flush_service)
     analytics_controller = AnalyticsController(window.analytics_tab, analytics_service)
 
+    app.aboutToQuit.connect(database_writer.stop)
+    if replication_service:
+        # committed flushes go out right away instead of waiting for the next interval
+        database_writer.flush_completed.connect(lambda journal_sequence, merged: replication_service.wake())
+        replication_service.lag_changed.connect(window.home_tab.update_replication_status)
+        replication_service.start()
+        app.aboutToQuit.connect(replication_service.stop)
+
 
 def signal_handler(signum, frame):
     logger.info(f"[SYSTEM] Signal {signum} detected, initiating graceful exit")
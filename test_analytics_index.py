@@ -0,0 +1,77 @@
+import datetime
+
+import pytest
+
+from app.domain.models import Application
+from app.services.analytics_index import AnalyticsIndex
+from test_database_ranges import RANGES, expected_totals, seeded  # noqa: F401, seeded is a fixture
+
+DAY_1, DAY_2, DAY_3 = datetime.date(2024, 5, 1), datetime.date(2024, 5, 2), datetime.date(2024, 5, 3)
+
+CODE = Application(id=1, name='code', is_productive=True)
+DOCS = Application(id=2, name='docs.python.org', is_productive=False)  # provisional
+YOUTUBE = Application(id=3, name='youtube.com', is_productive=False)
+
+
+def load(history) -> AnalyticsIndex:
+    index = AnalyticsIndex()
+    index.load(history)
+    return index
+
+
+def by_name(breakdown) -> dict[str, int]:
+    return {application.name: seconds for application, seconds in breakdown}
+
+
+def test_range_is_difference_of_prefix_rows():
+    index = load([(DAY_1, CODE, 100), (DAY_1, YOUTUBE, 50), (DAY_2, CODE, 30), (DAY_3, YOUTUBE, 20)])
+
+    breakdown, productive, non_productive = index.totals_between(DAY_2, DAY_3)
+
+    assert by_name(breakdown) == {'code': 30, 'youtube.com': 20}
+    assert (productive, non_productive) == (30, 20)
+
+
+def test_add_inserts_missing_days_and_applications():
+    index = load([(DAY_1, CODE, 100), (DAY_3, CODE, 10)])
+
+    index.add(DAY_2, {YOUTUBE: 40, CODE: 5})
+
+    assert by_name(index.totals_between(DAY_2, DAY_2)[0]) == {'youtube.com': 40, 'code': 5}
+    assert by_name(index.totals_between(DAY_3, DAY_3)[0]) == {'code': 10}
+    assert index.totals_between(None, DAY_3)[1:] == (115, 40)
+
+
+def test_reassign_into_existing_application_moves_every_day():
+    index = load([(DAY_1, DOCS, 60), (DAY_1, CODE, 100), (DAY_2, DOCS, 40)])
+    reconciled = Application(id=1, name='code', is_productive=True)
+
+    index.reassign(DOCS, reconciled)
+
+    assert by_name(index.totals_between(DAY_1, DAY_1)[0]) == {'code': 160}
+    assert by_name(index.totals_between(DAY_2, DAY_2)[0]) == {'code': 40}
+    assert index.totals_between(None, DAY_2)[1:] == (200, 0)
+
+
+def test_reassign_to_new_application_keeps_its_column():
+    index = load([(DAY_1, DOCS, 60), (DAY_2, YOUTUBE, 10)])
+    reconciled = Application(id=4, name='docs.python.org', is_productive=True)
+
+    index.reassign(DOCS, reconciled)
+    index.add(DAY_2, {reconciled: 15})
+
+    breakdown, productive, non_productive = index.totals_between(DAY_1, DAY_2)
+    assert by_name(breakdown) == {'docs.python.org': 75, 'youtube.com': 10}
+    assert [application.is_productive for application, _ in breakdown] == [True, False]
+    assert (productive, non_productive) == (75, 10)
+
+
+@pytest.mark.parametrize('start, end', RANGES)
+def test_index_matches_rollups(seeded, start, end):
+    db, credits = seeded
+    index = load(db.get_workday_application_history())
+
+    breakdown, productive, non_productive = index.totals_between(start, end)
+
+    assert {(app.name, app.is_productive): seconds for app, seconds in breakdown} == expected_totals(credits, start, end)
+    assert (productive, non_productive) == tuple(db.get_productivity_totals_between(start, end))
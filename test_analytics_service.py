@@ -0,0 +1,59 @@
+import datetime
+import threading
+
+import pytest
+
+from app.domain.analytics import TimeFrame
+from app.domain.models import Application, Workday
+from app.services.analytics_index import AnalyticsIndex
+from app.services.analytics_service import AnalyticsService
+from app.services.database_writer import DatabaseWriter
+
+TODAY = Workday(id=1, date=datetime.date.today(), pomodoros_left=4, workday_applications=[])
+CODE = Application(id=1, name='code', is_productive=True)
+YOUTUBE = Application(id=2, name='youtube.com', is_productive=False)
+
+
+class HeldDatabase:
+    """Keeps the writer inside save_flush until released"""
+
+    def __init__(self):
+        self.writing = threading.Event()
+        self.release = threading.Event()
+
+    def save_flush(self, workday, workday_applications, journal_sequence=None):
+        self.writing.set()
+        assert self.release.wait(5)
+
+
+@pytest.fixture
+def service(qapp):
+    index = AnalyticsIndex()
+    index.load([(TODAY.date - datetime.timedelta(days=1), CODE, 100)])
+    writer = DatabaseWriter(HeldDatabase())
+    service = AnalyticsService(writer.db, index, writer)
+    yield service
+    writer.db.release.set()
+    writer.stop(timeout=2)
+
+
+def report(service: AnalyticsService):
+    from_, to = service._date_range(TimeFrame.WEEK, None, None)
+    index_totals, uncommitted = service._read_live_totals(from_, to)
+    report = service._generate_analytics_report(TimeFrame.WEEK, None, from_, to, index_totals, uncommitted)
+    return report.productive_time, report.non_productive_time
+
+
+def test_flush_is_counted_once_while_queued_and_once_committed(service):
+    service.writer.submit_flush(TODAY, {CODE: 30, YOUTUBE: 20}, 1)
+    service.writer.start()
+    assert service.writer.db.writing.wait(1)
+
+    # being written, the index doesn't have it yet
+    assert report(service) == (130, 20)
+
+    service.writer.db.release.set()
+    assert service.writer.drain(2)
+
+    assert report(service) == (130, 20)
+    assert service.index.totals_between(TODAY.date, TODAY.date)[1:] == (30, 20)
@@ -0,0 +1,74 @@
+from concurrent.futures import Future
+
+import pytest
+
+from app.domain.models import Application
+from app.services.app_tracking.activity_source import FileActivitySource
+from app.services.app_tracking.app_service import AppService
+
+CODE = Application(id=1, name='code', is_productive=True)
+SLACK = Application(id=2, name='slack', is_productive=False)
+GITHUB = Application(id=3, name='github.com', is_productive=True)
+
+
+@pytest.fixture
+def app_service(qapp, tmp_path):
+    service = AppService(catalog=None, classification_service=None, activity_source=FileActivitySource(str(tmp_path / 'none')))
+    service.changes = []
+    service.current_application_changed.connect(lambda old, new, switched_at: service.changes.append((new, switched_at)))
+    return service
+
+
+def resolved(application: Application) -> Future:
+    future = Future()
+    future.set_result(application)
+    return future
+
+
+def test_resolutions_commit_in_switch_order(app_service):
+    app_service._handle_resolution(resolved(CODE), 1, 10.0)
+    app_service._handle_resolution(resolved(SLACK), 2, 20.0)
+
+    assert app_service.changes == [(CODE, 10.0), (SLACK, 20.0)]
+    assert app_service.current_application == SLACK
+
+
+def test_late_resolution_of_older_switch_is_dropped(app_service):
+    app_service._handle_resolution(resolved(GITHUB), 3, 30.0)
+    app_service._handle_resolution(resolved(SLACK), 2, 20.0)
+
+    assert app_service.changes == [(GITHUB, 30.0)]
+    assert app_service.current_application == GITHUB
+    assert app_service.superseded_results == 1
+
+
+def test_failed_resolution_keeps_current_application(app_service):
+    app_service._handle_resolution(resolved(CODE), 1, 10.0)
+    failed = Future()
+    failed.set_exception(RuntimeError('lookup failed'))
+
+    app_service._handle_resolution(failed, 2, 20.0)
+
+    assert app_service.current_application == CODE
+    assert len(app_service.changes) == 1
+
+
+def test_every_waiter_gets_its_own_copy(app_service):
+    app_service._handle_resolution(resolved(CODE), 1, 10.0)
+    app_service.current_application.elapsed_time = 42
+
+    assert CODE.elapsed_time == 0
+
+
+def test_in_flight_resolution_is_mapped_to_reconciled_app(app_service):
+    reconciled = Application(id=4, name='slack', is_productive=True)
+    future, _ = app_service.single_flight.join(('slack', ''))
+    future.add_done_callback(lambda f: app_service._handle_resolution(f, 1, 10.0))
+
+    app_service._handle_reclassification(SLACK, reconciled, 0)
+    app_service._settle(('slack', ''), lambda: app_service.single_flight.resolve(('slack', ''), SLACK))
+
+    assert app_service.current_application == reconciled
+    assert app_service.current_application.is_productive
+    # nothing is in flight anymore, later lookups read the reconciled catalog
+    assert app_service._reconciled == {}
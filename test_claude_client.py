@@ -0,0 +1,101 @@
+import asyncio
+import concurrent.futures
+import threading
+
+import anthropic
+import httpx
+import pytest
+
+from app.client.circuit_breaker import CircuitBreaker, CircuitState
+from app.client.claude_client import AIUnavailableError, AsyncClaudeClient
+
+
+class ScriptedClaudeClient(AsyncClaudeClient):
+    """Answers from a list of outcomes instead of the API, an exception is raised, an asyncio.Event is waited on"""
+
+    def __init__(self, breaker: CircuitBreaker):
+        self.outcomes = []
+        self.waiting = threading.Event()
+        super().__init__('test-key', timeout=2.0, breaker=breaker)
+
+    async def _create_message(self, message: str, max_tokens: int) -> str:
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, asyncio.Event):
+            self.waiting.set()
+            await outcome.wait()
+            return 'late'
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+
+
+def status_error(status_code: int) -> anthropic.APIStatusError:
+    response = httpx.Response(status_code, request=httpx.Request('POST', 'https://api.anthropic.com/v1/messages'))
+    return anthropic.APIStatusError(f'status {status_code}', response=response, body=None)
+
+
+@pytest.fixture
+def client():
+    client = ScriptedClaudeClient(CircuitBreaker('test', failure_threshold=1, reset_timeout=0))
+    yield client
+    client.close()
+
+
+def test_half_open_trial_success_closes_circuit(client):
+    client.outcomes = [status_error(503), 'True']
+
+    with pytest.raises(AIUnavailableError):
+        client.send_message('classify')
+    assert client.breaker.state == CircuitState.OPEN
+
+    assert client.send_message('classify') == 'True'
+    assert client.breaker.state == CircuitState.CLOSED
+
+
+def test_half_open_trial_failure_reopens_circuit(client):
+    client.outcomes = [status_error(500), status_error(529)]
+
+    for _ in range(2):
+        with pytest.raises(AIUnavailableError):
+            client.send_message('classify')
+
+    assert client.breaker.state == CircuitState.OPEN
+
+
+def test_cancelled_trial_releases_the_slot(client):
+    client.outcomes = [status_error(503)]
+    with pytest.raises(AIUnavailableError):
+        client.send_message('classify')
+
+    client.outcomes = [asyncio.Event(), 'False']
+    trial = client.submit_message('classify')
+    assert client.waiting.wait(1)
+    trial.cancel()
+    with pytest.raises(concurrent.futures.CancelledError):
+        trial.result(timeout=1)
+    # the loop unwinds the cancelled request a few iterations later
+    asyncio.run_coroutine_threadsafe(asyncio.sleep(0.1), client._loop).result()
+
+    assert client.breaker.state == CircuitState.HALF_OPEN
+    assert client.send_message('classify') == 'False'
+    assert client.breaker.state == CircuitState.CLOSED
+
+
+@pytest.mark.parametrize('status_code', [400, 401, 403, 404])
+def test_client_errors_do_not_open_circuit(client, status_code):
+    client.outcomes = [status_error(status_code)]
+
+    with pytest.raises(AIUnavailableError):
+        client.send_message('classify')
+
+    assert client.breaker.state == CircuitState.CLOSED
+
+
+@pytest.mark.parametrize('status_code', [408, 429, 500])
+def test_overload_errors_open_circuit(client, status_code):
+    client.outcomes = [status_error(status_code)]
+
+    with pytest.raises(AIUnavailableError):
+        client.send_message('classify')
+
+    assert client.breaker.state == CircuitState.OPEN
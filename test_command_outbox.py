@@ -0,0 +1,69 @@
+import json
+import time
+
+import pytest
+
+from app.client.command_outbox import CommandOutbox
+from app.client.pi_client import PiClient
+
+DEVICE = 'http://127.0.0.1:9'
+
+
+def command(command_id: str, expires_in: float = 3600, endpoint: str = '/flow-state', payload: dict = None) -> dict:
+    return {
+        'id': command_id,
+        'method': 'POST',
+        'endpoint': endpoint,
+        'payload': payload or {'state': 'productive'},
+        'operation_type': 'set_state',
+        'expires_at': time.time() + expires_in,
+    }
+
+
+@pytest.fixture
+def client(qapp, tmp_path):
+    client = PiClient(DEVICE, outbox=CommandOutbox(str(tmp_path / 'outbox.json')))
+    yield client
+    for reply in list(client.pending_replies):
+        reply.abort()
+
+
+def test_latest_command_per_channel_wins_and_stale_removal_is_ignored(tmp_path):
+    outbox = CommandOutbox(str(tmp_path / 'outbox.json'))
+    outbox.put(DEVICE, 'flow_state', command('first'))
+    outbox.put(DEVICE, 'flow_state', command('second'))
+
+    # the first command's acknowledgement arrives after it was replaced
+    outbox.remove(DEVICE, 'flow_state', 'first')
+
+    assert outbox.pending(DEVICE)['flow_state']['id'] == 'second'
+
+
+def test_flushed_outbox_is_reloaded(tmp_path):
+    path = tmp_path / 'outbox.json'
+    outbox = CommandOutbox(str(path))
+    outbox.put(DEVICE, 'flow_state', command('pending'))
+    outbox.flush()
+
+    assert json.loads(path.read_text())[DEVICE]['flow_state']['id'] == 'pending'
+    assert CommandOutbox(str(path)).pending(DEVICE)['flow_state']['id'] == 'pending'
+
+
+def test_replay_resends_live_commands_and_drops_expired_ones(client):
+    client.outbox.put(DEVICE, 'flow_state', command('live'))
+    client.outbox.put(DEVICE, 'pomodoro', command('expired', expires_in=-1))
+
+    client.replay_outbox()
+
+    assert client.has_outstanding('flow_state')
+    assert not client.has_outstanding('pomodoro')
+    assert client.expired_commands == 1
+    # kept until the device acknowledges it
+    assert list(client.outbox.pending(DEVICE)) == ['flow_state']
+
+
+def test_pomodoro_command_expires_with_its_timer(client):
+    client.post('/flow-state/pomodoro', {'time': 60}, operation_type='start_pomodoro', channel=PiClient.STATE_CHANNEL)
+
+    expires_at = client.outbox.pending(DEVICE)[PiClient.STATE_CHANNEL]['expires_at']
+    assert time.time() < expires_at <= time.time() + 60
@@ -0,0 +1,80 @@
+import datetime
+import random
+
+import pytest
+
+from app.db.database import Database
+
+APPLICATIONS = [('code', True), ('terminal', True), ('youtube.com', False), ('reddit.com', False)]
+FIRST_DAY = datetime.date(2024, 1, 1)
+LAST_DAY = datetime.date(2024, 4, 30)
+
+
+def days(start: datetime.date, end: datetime.date):
+    return [start + datetime.timedelta(days=i) for i in range((end - start).days + 1)]
+
+
+@pytest.fixture(scope='module')
+def seeded():
+    """In-memory store with tracked time on most days from January to April, and the credits it was built from"""
+    rng = random.Random(42)
+    credits = [
+        (date, name, is_productive, rng.randint(1, 3600))
+        for date in days(FIRST_DAY, LAST_DAY) if rng.random() < 0.8
+        for name, is_productive in APPLICATIONS if rng.random() < 0.7
+    ]
+
+    db = Database('sqlite://')
+    db.apply_journal_credits(credits, journal_sequence=len(credits))
+    return db, credits
+
+
+def expected_totals(credits, start, end):
+    totals = {}
+    for date, name, is_productive, seconds in credits:
+        if (start is None or date >= start) and date <= end:
+            totals[(name, is_productive)] = totals.get((name, is_productive), 0) + seconds
+    return totals
+
+
+RANGES = [
+    pytest.param(datetime.date(2024, 2, 10), datetime.date(2024, 2, 20), id='within-one-month'),
+    pytest.param(datetime.date(2024, 2, 1), datetime.date(2024, 2, 29), id='one-full-month'),
+    pytest.param(datetime.date(2024, 1, 15), datetime.date(2024, 3, 10), id='partial-edges'),
+    pytest.param(datetime.date(2024, 1, 1), datetime.date(2024, 3, 31), id='full-months'),
+    pytest.param(datetime.date(2024, 1, 31), datetime.date(2024, 2, 1), id='month-boundary'),
+    pytest.param(datetime.date(2024, 1, 15), datetime.date(2024, 2, 10), id='partial-head-and-tail'),
+    pytest.param(datetime.date(2024, 3, 2), datetime.date(2024, 4, 30), id='partial-start-full-end'),
+    pytest.param(datetime.date(2024, 2, 1), datetime.date(2024, 4, 29), id='full-start-partial-end'),
+    pytest.param(None, datetime.date(2024, 3, 15), id='all-time-partial-end'),
+    pytest.param(None, LAST_DAY, id='all-time'),
+    pytest.param(datetime.date(2024, 4, 12), datetime.date(2024, 4, 12), id='single-day'),
+]
+
+
+@pytest.mark.parametrize('start, end', RANGES)
+def test_application_totals_match_raw_rows(seeded, start, end):
+    db, credits = seeded
+
+    totals = {(name, is_productive): total for name, is_productive, total in db.get_application_totals_between(start, end)}
+
+    assert totals == expected_totals(credits, start, end)
+
+
+@pytest.mark.parametrize('start, end', RANGES)
+def test_productivity_totals_match_raw_rows(seeded, start, end):
+    db, credits = seeded
+    expected = expected_totals(credits, start, end)
+
+    productive, non_productive = db.get_productivity_totals_between(start, end)
+
+    assert productive == sum(seconds for (_, is_productive), seconds in expected.items() if is_productive)
+    assert non_productive == sum(seconds for (_, is_productive), seconds in expected.items() if not is_productive)
+
+
+def test_range_without_tracked_time_is_empty(seeded):
+    db, _ = seeded
+    end = FIRST_DAY - datetime.timedelta(days=1)
+
+    assert db.get_application_totals_between(end - datetime.timedelta(days=40), end) == []
+    assert tuple(db.get_productivity_totals_between(end - datetime.timedelta(days=40), end)) == (0, 0)
@@ -0,0 +1,109 @@
+import datetime
+import threading
+
+import pytest
+from PyQt6.QtCore import Qt
+from sqlalchemy.exc import OperationalError
+
+from app.domain.models import Application, Workday
+from app.services.database_writer import DatabaseWriter
+
+TODAY = Workday(id=1, date=datetime.date.today(), pomodoros_left=4, workday_applications=[])
+
+CODE = Application(id=1, name='code', is_productive=True)
+BROKEN = Application(id=2, name='broken', is_productive=True)
+PROVISIONAL = Application(id=3, name='docs.python.org', is_productive=False)
+RECONCILED = Application(id=4, name='docs.python.org', is_productive=True)
+
+
+class ScriptedDatabase:
+    """Records committed flushes, raises the queued errors first and always fails writes touching BROKEN"""
+
+    def __init__(self):
+        self.errors = []
+        self.saved = []
+
+    def save_flush(self, workday, workday_applications, journal_sequence=None):
+        if any(wa.application_id == BROKEN.id for wa in workday_applications):
+            raise ValueError('constraint failed')
+        if self.errors:
+            raise self.errors.pop(0)
+        self.saved.append(({wa.application_id: wa.time_seconds for wa in workday_applications}, journal_sequence))
+
+    def reconcile_application(self, application, is_productive):
+        return RECONCILED, 0
+
+
+@pytest.fixture
+def db():
+    return ScriptedDatabase()
+
+
+@pytest.fixture
+def writer(qapp, db):
+    writer = DatabaseWriter(db, max_attempts=2, initial_backoff=0.01, max_backoff=0.02)
+    writer.failures = []
+    writer.failed = threading.Event()
+    writer.reconciled = []
+    # delivered on the writer thread, no event loop needed
+    writer.flush_failed.connect(lambda error: (writer.failures.append(error), writer.failed.set()), Qt.ConnectionType.DirectConnection)
+    writer.application_reconciled.connect(lambda *args: writer.reconciled.append(args), Qt.ConnectionType.DirectConnection)
+    yield writer
+    writer.stop(timeout=2)
+
+
+def test_unavailable_database_is_retried_and_failed_batch_not_merged_into(writer, db):
+    db.errors = [OperationalError('insert', {}, Exception('database is locked'))] * 3
+    writer.start()
+    writer.submit_flush(TODAY, {CODE: 10}, 1)
+
+    assert writer.failed.wait(1)
+    writer.submit_flush(TODAY, {CODE: 5}, 2)
+    writer.submit_flush(TODAY, {CODE: 7}, 3)
+
+    assert writer.drain(2)
+    # retried past max_attempts, the database was unavailable rather than the batch broken
+    assert len(writer.failures) == 3
+    assert db.saved == [({CODE.id: 10}, 1), ({CODE.id: 12}, 3)]
+
+
+def test_broken_batch_is_split_and_the_broken_write_dropped(writer, db):
+    writer.start()
+    writer.submit_flush(TODAY, {CODE: 10, BROKEN: 20}, 1)
+
+    assert writer.drain(2)
+    assert db.saved == [({CODE.id: 10}, None)]
+    assert writer.dead_lettered == 1
+    assert len(writer.failures) == 2 + 1  # both parts failed once before giving up, then the drop itself
+
+    writer.submit_flush(TODAY, {CODE: 5}, 2)
+    assert writer.drain(2)
+    assert db.saved[-1] == ({CODE.id: 5}, 2)
+
+
+def test_queued_batches_are_repointed_by_reconciliation(writer, db):
+    writer.submit_reconcile(PROVISIONAL, True)
+    writer.submit_flush(TODAY, {PROVISIONAL: 30, CODE: 10}, 1)
+    writer.start()
+
+    assert writer.drain(2)
+    assert db.saved == [({RECONCILED.id: 30, CODE.id: 10}, 1)]
+    # queued behind the reconciliation, so moved along with the committed rows
+    assert writer.reconciled == [(PROVISIONAL, RECONCILED, 30)]
+
+
+def test_flushes_submitted_after_reconciliation_are_repointed_on_submission(writer, db):
+    writer.start()
+    writer.submit_reconcile(PROVISIONAL, True)
+    assert writer.drain(2)
+
+    # credited to the provisional app before application_reconciled reached the caller
+    writer.submit_flush(TODAY, {PROVISIONAL: 15}, 1)
+    assert writer.drain(2)
+
+    assert db.saved == [({RECONCILED.id: 15}, 1)]
+    assert writer.release_reassignment(PROVISIONAL) == 15
+    assert writer.release_reassignment(PROVISIONAL) == 0
+    writer.submit_flush(TODAY, {PROVISIONAL: 5}, 2)
+    assert writer.drain(2)
+    assert db.saved[-1] == ({PROVISIONAL.id: 5}, 2)
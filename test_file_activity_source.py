@@ -0,0 +1,75 @@
+import threading
+
+from PyQt6.QtCore import Qt
+
+from app.services.app_tracking.activity_source import FileActivitySource
+
+RECORDS = """\
+# replayed by the file activity source
+APP:code:
+0 WEB:github.com:pulls
+
+0.01 WEB:youtube.com:some video
+0 WEB:youtube.com:some video
+0 APP:code:
+"""
+
+
+def test_records_are_parsed_with_optional_delays(tmp_path):
+    path = tmp_path / 'activity.txt'
+    path.write_text(RECORDS)
+
+    records = FileActivitySource(str(path), default_interval=2.0)._load_records()
+
+    assert records == [
+        (2.0, 'APP:code:'),
+        (0.0, 'WEB:github.com:pulls'),
+        (0.01, 'WEB:youtube.com:some video'),
+        (0.0, 'WEB:youtube.com:some video'),
+        (0.0, 'APP:code:'),
+    ]
+
+
+def test_replay_publishes_each_change_once(qapp, tmp_path):
+    path = tmp_path / 'activity.txt'
+    path.write_text(RECORDS)
+    source = FileActivitySource(str(path), default_interval=0)
+    responses = []
+    done = threading.Event()
+
+    def collect(script_response):
+        responses.append(script_response)
+        if len(responses) == 4:
+            done.set()
+
+    # delivered on the source's thread, no event loop needed
+    source.new_script_response.connect(collect, Qt.ConnectionType.DirectConnection)
+    source.start()
+    try:
+        assert done.wait(5)
+    finally:
+        source.stop()
+
+    assert [(response.app_type, response.app_name, response.tag) for response in responses] == [
+        ('APP', 'code', ''),
+        ('WEB', 'github.com', 'pulls'),
+        ('WEB', 'youtube.com', 'some video'),
+        ('APP', 'code', ''),
+    ]
+
+
+def test_invalid_record_is_skipped(qapp, tmp_path):
+    path = tmp_path / 'activity.txt'
+    path.write_text("0 not-a-record\n0 APP:code:\n")
+    source = FileActivitySource(str(path), default_interval=0)
+    responses = []
+    done = threading.Event()
+    source.new_script_response.connect(lambda response: (responses.append(response), done.set()), Qt.ConnectionType.DirectConnection)
+
+    source.start()
+    try:
+        assert done.wait(5)
+    finally:
+        source.stop()
+
+    assert [response.app_name for response in responses] == ['code']
@@ -0,0 +1,65 @@
+import datetime
+
+from app.db.flush_journal import FlushJournal
+
+DAY = datetime.date(2024, 5, 1)
+
+
+def journal_with_credits(path, count: int) -> FlushJournal:
+    journal = FlushJournal(str(path), sync_interval=0)
+    for i in range(count):
+        journal.append(DAY, f'app-{i}', i % 2 == 0, 10 + i)
+    return journal
+
+
+def test_partial_checkpoint_keeps_only_later_credits(tmp_path):
+    path = tmp_path / 'journal.log'
+    journal = journal_with_credits(path, 5)
+
+    journal.checkpoint(3)
+
+    assert [credit.sequence for credit in journal.read()] == [4, 5]
+    assert len(path.read_text().splitlines()) == 2
+    # appends go to the compacted file
+    assert journal.append(DAY, 'app-5', True, 1) == 6
+    assert [credit.sequence for credit in journal.read(after=4)] == [5, 6]
+    journal.close()
+
+
+def test_full_checkpoint_truncates_and_sequence_keeps_counting(tmp_path):
+    path = tmp_path / 'journal.log'
+    journal = journal_with_credits(path, 3)
+
+    journal.checkpoint(3)
+
+    assert path.read_text() == ''
+    assert journal.append(DAY, 'app', True, 1) == 4
+    journal.close()
+
+
+def test_reopened_journal_resumes_sequence_and_replays_after_checkpoint(tmp_path):
+    path = tmp_path / 'journal.log'
+    journal_with_credits(path, 4).close()
+
+    journal = FlushJournal(str(path))
+    credits = journal.read(after=2)
+
+    assert journal.sequence == 4
+    assert [(credit.sequence, credit.app_name, credit.is_productive, credit.seconds) for credit in credits] == [
+        (3, 'app-2', True, 12),
+        (4, 'app-3', False, 13),
+    ]
+    journal.close()
+
+
+def test_torn_last_record_is_ignored(tmp_path):
+    path = tmp_path / 'journal.log'
+    journal_with_credits(path, 2).close()
+    with open(path, 'a', encoding='utf8') as f:
+        f.write('{"seq": 3, "date": "2024-05-0')
+
+    journal = FlushJournal(str(path))
+
+    assert [credit.sequence for credit in journal.read()] == [1, 2]
+    assert journal.sequence == 2
+    journal.close()
@@ -0,0 +1,72 @@
+import pytest
+
+from app.domain.models import ScriptResponse
+from app.services.app_tracking.switch_debouncer import SwitchDebouncer
+
+CODE = ScriptResponse(app_type='APP', app_name='code')
+SLACK = ScriptResponse(app_type='APP', app_name='slack')
+GITHUB = ScriptResponse(app_type='WEB', app_name='github.com')
+
+
+@pytest.fixture
+def debouncer(qapp):
+    debouncer = SwitchDebouncer(dwell_ms=1500)
+    debouncer.committed_switches = []
+    debouncer.script_response_committed.connect(lambda response, switched_at: debouncer.committed_switches.append((response, switched_at)))
+    yield debouncer
+    debouncer.dwell_timer.stop()
+
+
+def fire_dwell_timer(debouncer: SwitchDebouncer):
+    assert debouncer.dwell_timer.isActive()
+    debouncer.dwell_timer.stop()
+    debouncer._commit_candidate()
+
+
+def test_first_response_commits_immediately(debouncer):
+    debouncer.submit(CODE)
+
+    assert [response for response, _ in debouncer.committed_switches] == [CODE]
+    assert not debouncer.dwell_timer.isActive()
+
+
+def test_switch_commits_after_dwell_backdated_to_first_observation(debouncer):
+    debouncer.submit(CODE)
+    debouncer.submit(SLACK)
+    observed_at = debouncer.candidate_since
+
+    assert len(debouncer.committed_switches) == 1
+    fire_dwell_timer(debouncer)
+
+    assert debouncer.committed_switches[-1] == (SLACK, observed_at)
+
+
+def test_transient_switch_is_dropped(debouncer):
+    debouncer.submit(CODE)
+    debouncer.submit(SLACK)
+    debouncer.submit(GITHUB)
+    fire_dwell_timer(debouncer)
+
+    assert [response for response, _ in debouncer.committed_switches] == [CODE, GITHUB]
+    assert debouncer.stats.dropped == 1
+
+
+def test_flapping_back_commits_nothing(debouncer):
+    debouncer.submit(CODE)
+    debouncer.submit(SLACK)
+    debouncer.submit(CODE)
+
+    assert not debouncer.dwell_timer.isActive()
+    assert [response for response, _ in debouncer.committed_switches] == [CODE]
+    assert debouncer.stats.dropped == 1
+
+
+def test_zero_dwell_commits_every_switch(qapp):
+    debouncer = SwitchDebouncer(dwell_ms=0)
+    committed = []
+    debouncer.script_response_committed.connect(lambda response, _: committed.append(response))
+
+    for response in (CODE, SLACK, GITHUB):
+        debouncer.submit(response)
+
+    assert committed == [CODE, SLACK, GITHUB]